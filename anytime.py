@@ -0,0 +1,290 @@
+'''
+Anytime planning with ARA* (Anytime Repairing A*).
+
+ARA* finds a first path quickly with a strongly weighted A* search (heuristic
+weight epsilon), then runs further searches with smaller weights, each giving a
+path at least as cheap, until epsilon reaches 1 and the path is optimal. The
+searches are not started over: g values, parent links and the open list carry
+over from one to the next. Cells whose g value improved after they were
+expanded are kept on an "inconsistent" list. The next search resumes from
+those cells and the open ones, so it only re-expands what the cheaper routes
+changed.
+
+Every solution reports a suboptimality bound: its cost is at most bound times
+the optimal cost. The bound is the smaller of epsilon and the cost divided by
+the lowest g + h of any open or inconsistent cell. It is often well below
+epsilon, and it is 1 once the path is proven optimal.
+
+run() works to a time budget. It checks the clock every few expansions and
+returns the best solution found so far once the budget is spent. The search
+state stays as it was, so the next run() continues the same search.
+
+Usage:
+    planner = ARAStar(pathfinding, start, goal, epsilon=3.0)
+    solution = planner.run(budget_ms=20)   # best Solution so far, or None
+    solution.path, solution.cost, solution.bound
+    solution = planner.run(budget_ms=20)   # keeps improving it
+'''
+import time
+from itertools import chain
+
+from pathfinding import SQRT2, HeapQueue, SearchStats, SearchTree
+
+# Expansions between two looks at the clock
+CLOCK_EVERY = 64
+
+# Smallest g improvement that counts. Diagonal steps summed in a different order give
+# g values a few units in the last place apart, which would make expanded cells look
+# inconsistent and loosen the bound for nothing.
+TOLERANCE = 1e-9
+
+
+class Solution:
+    """
+    A path found by ARAStar
+
+    path:       the Path (its cost is the cost below)
+    cost:       cost of the path
+    bound:      cost is at most bound times the optimal cost
+    epsilon:    heuristic weight of the search after which it was reported
+    elapsed_ms: time spent in run() calls up to finding it
+    expansions: cells expanded up to finding it, over all searches
+    """
+    def __init__(self, path, bound, epsilon, elapsed_ms, expansions):
+        self.path = path
+        self.cost = path.cost
+        self.bound = bound
+        self.epsilon = epsilon
+        self.elapsed_ms = elapsed_ms
+        self.expansions = expansions
+
+    def __repr__(self):
+        return (f"Solution(cost={self.cost!r}, bound={self.bound:.3f}, epsilon={self.epsilon}, "
+                f"elapsed_ms={self.elapsed_ms:.2f}, expansions={self.expansions})")
+
+
+class ARAStar:
+    """
+    ARA* over a PathfindingAlgorithms grid (terrain costs, current movement model)
+
+    epsilon is the first search's heuristic weight. Each later search lowers it by
+    decrement, or straight to the bound already proven if that is lower. stats
+    counts over all searches: its path_cost and suboptimality are the best
+    solution's cost and bound. solutions lists every solution found, best last.
+
+    The planner listens to PathfindingAlgorithms like DStarLite. Any grid change,
+    or a change of movement model, starts the search over on the next run().
+    """
+    def __init__(self, pathfinding, start, goal, epsilon=3.0, decrement=0.5):
+        if epsilon < 1:
+            raise ValueError(f"epsilon must be at least 1, got {epsilon}")
+        self.pathfinding = pathfinding
+        self.start = start
+        self.goal = goal
+        self.initial_epsilon = epsilon
+        self.decrement = decrement
+        pathfinding.add_listener(self)
+        self.reset()
+
+    def reset(self):
+        """Discards all search state and starts over with the initial epsilon"""
+        pathfinding = self.pathfinding
+        self.cells = pathfinding.cells
+        self.moves = pathfinding.moves
+        self.movement = (pathfinding.connectivity, pathfinding.corner_cutting)
+        self.start_index = pathfinding.index_of(self.start)
+        self.goal_index = pathfinding.index_of(self.goal)
+        self.heuristic = pathfinding.make_heuristic(self.goal_index)
+        self.tie_sign = pathfinding.tie_sign()
+
+        self.epsilon = self.initial_epsilon
+        self.parents = pathfinding.new_parents()
+        self.g = {}
+        # The current search's open cells (each with one live frontier entry) and expanded cells
+        self.open = set()
+        self.closed = set()
+        # Expanded cells whose g value dropped since: reopened by the next search
+        self.inconsistent = set()
+        self.frontier = HeapQueue()
+
+        self.stats = SearchStats("ara_star")
+        self.solutions = []
+        # An endpoint outside the grid has no path, like a disconnected pair
+        self.done = self.goal_index is None or pathfinding.disconnected(self.start_index, self.goal_index)
+        self.needs_reset = False
+        if not self.done:
+            self.g[self.start_index] = 0
+            self.open.add(self.start_index)
+            self.frontier.push(self.start_index, self.epsilon * self.heuristic(self.start_index))
+            self.stats.pushes = self.stats.max_frontier = 1
+
+    def close(self):
+        """Stops listening for grid changes"""
+        self.pathfinding.remove_listener(self)
+
+    # --- Grid listener interface (see PathfindingAlgorithms.add_listener) ---
+
+    def update_cells(self, changed_cells):
+        """Costs changed under the search: start over on the next run()"""
+        self.needs_reset = True
+
+    def grid_replaced(self):
+        """The whole grid was swapped out (e.g. resized): start over on the next run()"""
+        self.needs_reset = True
+
+    # --- Planning ---
+
+    def run(self, budget_ms=None):
+        """
+        Searches until the path is optimal, the goal proves unreachable or budget_ms
+        milliseconds have passed (None: no limit). Returns the best Solution so far,
+        or None if no path has been found yet.
+        """
+        started_ns = time.perf_counter_ns()
+        deadline_ns = None if budget_ms is None else started_ns + int(budget_ms * 1e6)
+        pathfinding = self.pathfinding
+        if self.needs_reset or self.movement != (pathfinding.connectivity, pathfinding.corner_cutting):
+            self.reset()
+
+        while not self.done:
+            if deadline_ns is not None and time.perf_counter_ns() > deadline_ns:
+                break
+            finished = self.improve_path(deadline_ns, started_ns)
+            if not finished:
+                break
+            self.publish(started_ns)
+            if not self.done:
+                self.next_search()
+
+        self.stats.elapsed_ns += time.perf_counter_ns() - started_ns
+        return self.solutions[-1] if self.solutions else None
+
+    def improve_path(self, deadline_ns, started_ns):
+        """
+        Expands cells in g + epsilon * h order until the goal's g is no larger than
+        the lowest priority left. Returns False if the deadline passed first.
+        """
+        cells = self.cells
+        moves = self.moves
+        corner_cutting = self.pathfinding.corner_cutting
+        diagonal_allowed = self.pathfinding.diagonal_allowed
+        heuristic = self.heuristic
+        epsilon = self.epsilon
+        tie_sign = self.tie_sign
+        goal_index = self.goal_index
+        g = self.g
+        parents = self.parents
+        frontier = self.frontier
+        open_cells = self.open
+        closed = self.closed
+        inconsistent = self.inconsistent
+        stats = self.stats
+        countdown = CLOCK_EVERY
+
+        while frontier:
+            # Outdated entries only lower the peeked priority, which errs towards searching on
+            goal_g = g.get(goal_index)
+            if goal_g is not None and goal_g <= frontier.peek_priority():
+                break
+            priority, current = frontier.pop()
+            if current not in open_cells:
+                stats.stale_pops += 1
+                continue
+            open_cells.discard(current)
+            closed.add(current)
+            stats.expansions += 1
+
+            current_g = g[current]
+            for offset, multiplier, side_a, side_b in moves:
+                neighbor = current + offset
+                step_cost = cells[neighbor]
+                if not step_cost:
+                    continue
+                if side_a and not diagonal_allowed(cells[current + side_a], cells[current + side_b], corner_cutting):
+                    continue
+                new_g = current_g + step_cost * multiplier
+                old_g = g.get(neighbor)
+                if old_g is None or new_g < old_g - TOLERANCE:
+                    g[neighbor] = new_g
+                    parents[neighbor] = current
+                    if neighbor in closed:
+                        inconsistent.add(neighbor)
+                    else:
+                        open_cells.add(neighbor)
+                        frontier.push(neighbor, new_g + epsilon * heuristic(neighbor), tie_sign * new_g)
+                        stats.pushes += 1
+
+            if len(frontier) > stats.max_frontier:
+                stats.max_frontier = len(frontier)
+            countdown -= 1
+            if not countdown:
+                countdown = CLOCK_EVERY
+                if deadline_ns is not None and time.perf_counter_ns() > deadline_ns:
+                    return False
+        return True
+
+    def publish(self, started_ns):
+        """Records the path the finished search found, with its bound"""
+        goal_g = self.g.get(self.goal_index)
+        if goal_g is None:
+            # The search ran out of cells: the goal cannot be reached
+            self.done = True
+            return
+
+        path = SearchTree(self.parents, self.pathfinding.stride, self.start_index, self.goal_index, self.stats).trace(
+            self.goal_index, None)
+        path.cost = self.path_cost(path)
+        best = self.solutions[-1] if self.solutions else None
+        # The traced path can cost less than the goal's g, so an earlier path may still be the
+        # cheaper one; either way the path costs at most epsilon times the optimum
+        if best is not None and best.cost <= path.cost:
+            path = best.path
+        bound = self.epsilon
+
+        g = self.g
+        heuristic = self.heuristic
+        # Every cheaper path runs through an open or inconsistent cell, so their lowest g + h bounds the optimum
+        lower = min((g[index] + heuristic(index) for index in chain(self.open, self.inconsistent)), default=path.cost)
+        # A search with epsilon 1 ends with an optimal path
+        if self.epsilon <= 1 or path.cost == 0 or lower >= path.cost:
+            bound = 1.0
+        else:
+            bound = min(bound, path.cost / lower)
+        if bound <= 1:
+            self.done = True
+
+        if best is None or path is not best.path or bound < best.bound:
+            elapsed_ns = self.stats.elapsed_ns + time.perf_counter_ns() - started_ns
+            self.solutions.append(Solution(path, bound, self.epsilon, elapsed_ns / 1e6, self.stats.expansions))
+            self.stats.path_cost = path.cost
+            self.stats.suboptimality = bound
+
+    def path_cost(self, path):
+        """Cost of a path's cells along the parent links (at most the goal's g value)"""
+        cells = self.cells
+        to_index = self.pathfinding.to_index
+        cost = 0
+        previous = None
+        for position in path:
+            if previous is not None:
+                step_cost = cells[to_index(position)]
+                # A diagonal step changes both row and column
+                cost += step_cost * SQRT2 if position[0] != previous[0] and position[1] != previous[1] else step_cost
+            previous = position
+        return cost
+
+    def next_search(self):
+        """Lowers epsilon and queues the open and inconsistent cells for the next search"""
+        self.epsilon = max(1.0, min(self.epsilon - self.decrement, self.solutions[-1].bound))
+        open_cells = self.open | self.inconsistent
+        self.open = open_cells
+        self.inconsistent = set()
+        self.closed = set()
+        g = self.g
+        heuristic = self.heuristic
+        epsilon = self.epsilon
+        tie_sign = self.tie_sign
+        frontier = HeapQueue()
+        for index in open_cells:
+            frontier.push(index, g[index] + epsilon * heuristic(index), tie_sign * g[index])
+        self.frontier = frontier
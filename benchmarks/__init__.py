@@ -0,0 +1,7 @@
+'''
+Benchmark scripts for the pathfinding algorithms.
+
+Run from the repository root, e.g.:
+
+    python -m benchmarks.flat_grid
+'''
@@ -0,0 +1,126 @@
+'''
+Headless benchmark runner.
+
+Runs any subset of the PathfindingAlgorithms searches on generated or loaded
+maps and reports one record per (map, algorithm, query) as JSON or CSV.
+Tkinter is never imported, so this works on machines without a display.
+
+Examples:
+    python -m benchmarks --maps random,maze --sizes 256,1024
+    python -m benchmarks --map-file warehouse.txt --algorithms a_star,bfs --format csv -o results.csv
+    python -m benchmarks --map-file arena.map --algorithms a_star
+'''
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+
+from pathfinding import SEARCHES, PathfindingAlgorithms
+from map_files import READERS, cells_to_grid, load_map
+from benchmarks.maps import GENERATORS, load_text_map
+from benchmarks.measure import measure
+
+FIELDS = (
+    "map", "width", "height", "algorithm", "query", "start", "goal",
+    "wall_ms", "expanded", "pushes", "stale_pops", "max_frontier", "peak_memory_kb", "path_length", "path_cost", "suboptimality",
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--maps", default="random", help=f"comma-separated generators: {', '.join(GENERATORS)}")
+    parser.add_argument("--map-file", action="append", default=[], help="map to load: text, or .map/.pgm/.png/.grid (repeatable)")
+    parser.add_argument("--sizes", default="256", help="comma-separated side lengths for generated maps")
+    parser.add_argument("--algorithms", default=",".join(SEARCHES), help="comma-separated subset of: " + ", ".join(SEARCHES))
+    parser.add_argument("--queries", type=int, default=3, help="random (start, goal) pairs per map")
+    parser.add_argument("--connectivity", type=int, choices=(4, 8), default=4, help="movement model for a_star/dijkstra")
+    parser.add_argument("--corner-cutting", action="store_true", help="allow diagonal steps past one blocked corner")
+    parser.add_argument("--epsilon", type=float, default=2.0, help="heuristic weight for weighted_a_star (at least 1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-memory", action="store_true", help="do not rerun searches under tracemalloc")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("-o", "--output", help="write results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    args.maps = [name for name in args.maps.split(",") if name]
+    args.sizes = [int(size) for size in args.sizes.split(",") if size]
+    args.algorithms = [name for name in args.algorithms.split(",") if name]
+    for name in args.maps:
+        if name not in GENERATORS:
+            parser.error(f"unknown map generator: {name}")
+    for name in args.algorithms:
+        if name not in SEARCHES:
+            parser.error(f"unknown algorithm: {name}")
+    return args
+
+
+def iter_maps(args):
+    """Yields (name, grid) for every generated and loaded map"""
+    for name in args.maps:
+        for size in args.sizes:
+            yield name, GENERATORS[name](size, size, args.seed)
+    for path in args.map_file:
+        if os.path.splitext(path)[1].lower() in READERS:
+            yield os.path.basename(path), cells_to_grid(*load_map(path))
+        else:
+            yield os.path.basename(path), load_text_map(path)
+
+
+def make_queries(grid, count, seed):
+    """Random (start, goal) pairs of open cells; the first one is the farthest-apart corner pair"""
+    rng = random.Random(seed)
+    height, width = len(grid), len(grid[0])
+    open_cells = [(i, j) for i in range(height) for j in range(width) if grid[i][j] != "X"]
+    if not open_cells:
+        return []
+    queries = [(open_cells[0], open_cells[-1])]
+    while len(queries) < count:
+        queries.append((rng.choice(open_cells), rng.choice(open_cells)))
+    return queries[:count]
+
+
+def run(args):
+    records = []
+    for name, grid in iter_maps(args):
+        height, width = len(grid), len(grid[0])
+        planner = PathfindingAlgorithms(grid, height, width)
+        planner.set_movement(args.connectivity, args.corner_cutting)
+        planner.epsilon = args.epsilon
+        for query, (start, goal) in enumerate(make_queries(grid, args.queries, args.seed)):
+            for algorithm in args.algorithms:
+                result = measure(planner, algorithm, start, goal, memory=not args.skip_memory)
+                records.append({
+                    "map": name, "width": width, "height": height,
+                    "algorithm": algorithm, "query": query,
+                    "start": list(start), "goal": list(goal),
+                    **result,
+                })
+                print(f"{name} {width}x{height} q{query} {algorithm}: {result['wall_ms']:.1f} ms", file=sys.stderr)
+    return records
+
+
+def write(records, output_format, file):
+    if output_format == "json":
+        json.dump(records, file, indent=2)
+        file.write("\n")
+    else:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow({**record, "start": " ".join(map(str, record["start"])), "goal": " ".join(map(str, record["goal"]))})
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    records = run(args)
+    if args.output:
+        with open(args.output, "w", newline="") as file:
+            write(records, args.format, file)
+    else:
+        write(records, args.format, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+'''
+Bounded-suboptimal and anytime search: path cost against time to a solution.
+
+For a corner-to-corner query on each map, first compares a_star with
+weighted_a_star at several epsilons: time, cells expanded, path cost relative
+to the optimum, and the reported bound. Then runs ARA* from epsilon 3 to the
+optimum and lists every solution it reports, with the time since the start,
+and finally the best solution an ARA* run holds when its budget runs out:
+
+    python -m benchmarks.anytime [size] [budget ms]
+
+Defaults are 1024 and a 20 ms budget.
+'''
+import sys
+
+from anytime import ARAStar
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import open_map, random_map, rooms_map, terrain_map
+
+EPSILONS = (1.5, 2.0, 3.0, 5.0)
+
+
+def run(size, budget_ms):
+    maps = {
+        "open": open_map(size, size),
+        "random 20%": random_map(size, size, density=0.2, seed=1),
+        "rooms": rooms_map(size, size, seed=1),
+        "terrain": terrain_map(size, size, seed=1),
+    }
+    for name, grid in maps.items():
+        height, width = len(grid), len(grid[0])
+        pathfinding = PathfindingAlgorithms(grid, height, width)
+        open_cells = [(i, j) for i in range(height) for j in range(width) if grid[i][j] != "X"]
+        start, goal = open_cells[0], open_cells[-1]
+
+        optimal = pathfinding.a_star(start, goal).stats
+        print(f"{width}x{height} {name}, {start} -> {goal}, optimal cost {optimal.path_cost}")
+        print(f"  {'search':<22}{'ms':>9}{'expanded':>11}{'cost/opt':>10}{'bound':>7}")
+        print(f"  {'a_star':<22}{optimal.elapsed_ns / 1e6:>9.1f}{optimal.expansions:>11,}{1:>10.3f}{1:>7.2f}")
+        for epsilon in EPSILONS:
+            pathfinding.epsilon = epsilon
+            stats = pathfinding.weighted_a_star(start, goal).stats
+            print(f"  {'weighted_a_star ' + str(epsilon):<22}{stats.elapsed_ns / 1e6:>9.1f}{stats.expansions:>11,}"
+                  f"{stats.path_cost / optimal.path_cost:>10.3f}{stats.suboptimality:>7.2f}")
+
+        planner = ARAStar(pathfinding, start, goal, epsilon=3.0)
+        planner.run()
+        for k, solution in enumerate(planner.solutions):
+            label = f"ara_star #{k + 1} (eps {solution.epsilon:.2f})"
+            print(f"  {label:<22}{solution.elapsed_ms:>9.1f}{solution.expansions:>11,}"
+                  f"{solution.cost / optimal.path_cost:>10.3f}{solution.bound:>7.2f}")
+        planner.close()
+
+        planner = ARAStar(pathfinding, start, goal, epsilon=3.0)
+        solution = planner.run(budget_ms)
+        label = f"ara_star {budget_ms:g} ms budget"
+        if solution is None:
+            print(f"  {label:<22}{'no path yet':>37}")
+        else:
+            print(f"  {label:<22}{planner.stats.elapsed_ns / 1e6:>9.1f}{planner.stats.expansions:>11,}"
+                  f"{solution.cost / optimal.path_cost:>10.3f}{solution.bound:>7.2f}")
+        planner.close()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1024, float(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -0,0 +1,54 @@
+'''
+Throughput of solve_many against one query at a time.
+
+Queries are drawn from a handful of shared starts (depots), as a fleet planner
+would issue them:
+
+    python -m benchmarks.batch_queries [size]
+'''
+import random
+import sys
+import time
+
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import random_map
+
+
+def make_pairs(grid, count, starts=8, seed=0):
+    rng = random.Random(seed)
+    open_cells = [(i, j) for i, row in enumerate(grid) for j, cell in enumerate(row) if cell != "X"]
+    depots = rng.sample(open_cells, starts)
+    return [(rng.choice(depots), rng.choice(open_cells)) for _ in range(count)]
+
+
+def one_at_a_time(pathfinding, pairs, algorithm):
+    search = getattr(pathfinding, algorithm)
+    for start, goal in pairs:
+        search(start, goal).path()
+
+
+def run(size, counts=(10, 100, 1000)):
+    grid = random_map(size, size, density=0.2, seed=1)
+    pathfinding = PathfindingAlgorithms(grid, size, size)
+
+    print(f"{size}x{size}, 8 shared starts")
+    print(f"  {'algorithm':<10}{'pairs':>7}{'single q/s':>14}{'solve_many q/s':>17}")
+    for algorithm in ("bfs", "dijkstra", "a_star"):
+        for count in counts:
+            pairs = make_pairs(grid, count)
+
+            # The one-at-a-time loop is capped, its per-query cost does not depend on the batch size
+            sample = pairs[:min(count, 20)]
+            single_start = time.perf_counter()
+            one_at_a_time(pathfinding, sample, algorithm)
+            single_rate = len(sample) / (time.perf_counter() - single_start)
+
+            batch_start = time.perf_counter()
+            pathfinding.solve_many(pairs, algorithm)
+            batch_rate = count / (time.perf_counter() - batch_start)
+
+            print(f"  {algorithm:<10}{count:>7}{single_rate:>14,.1f}{batch_rate:>17,.1f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 256)
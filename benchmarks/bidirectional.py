@@ -0,0 +1,53 @@
+'''
+Unidirectional against bidirectional BFS, Dijkstra and A* on long queries
+across the middle of each map:
+
+    python -m benchmarks.bidirectional [size ...]
+'''
+import sys
+
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import maze_map, open_map, random_map, rooms_map
+from benchmarks.measure import measure
+
+PAIRS = (
+    ("bfs", "bidirectional_bfs"),
+    ("dijkstra", "bidirectional_dijkstra"),
+    ("a_star", "bidirectional_a_star"),
+)
+
+
+def nearest_open(grid, position):
+    """The open cell closest to position along its row (maze corridors sit on even columns)"""
+    i, j = position
+    for distance in range(len(grid[i])):
+        for col in (j - distance, j + distance):
+            if 0 <= col < len(grid[i]) and grid[i][col] != "X":
+                return (i, col)
+    return position
+
+
+def run(size):
+    maps = {
+        "maze": maze_map(size, size, seed=1),
+        "rooms": rooms_map(size, size, seed=1),
+        "random 20%": random_map(size, size, density=0.2, seed=1),
+        "open": open_map(size, size),
+    }
+    for name, grid in maps.items():
+        # Far apart across the middle of the map, so neither search starts against a border
+        start = nearest_open(grid, (size // 2 & ~1, size // 8))
+        goal = nearest_open(grid, (size // 2 & ~1, size - 1 - size // 8))
+        pathfinding = PathfindingAlgorithms(grid, size, size)
+        print(f"{size}x{size} {name}")
+        for forward, bidirectional in PAIRS:
+            one = measure(pathfinding, forward, start, goal, memory=False)
+            both = measure(pathfinding, bidirectional, start, goal, memory=False)
+            print(f"  {forward:<9}{one['wall_ms']:>9.1f} ms {one['expanded']:>9,} expanded | "
+                  f"bidirectional {both['wall_ms']:>9.1f} ms {both['expanded']:>9,} expanded "
+                  f"(length {one['path_length']} / {both['path_length']})")
+
+
+if __name__ == "__main__":
+    for size in [int(arg) for arg in sys.argv[1:]] or [255, 511]:
+        run(size)
@@ -0,0 +1,62 @@
+'''
+Component labelling (connectivity.py): build time, incremental updates while
+obstacles are toggled, and the cost of a query whose goal is walled off, with
+and without the index attached:
+
+    python -m benchmarks.connectivity [size ...]
+'''
+import random
+import sys
+import time
+
+from pathfinding import PathfindingAlgorithms
+from connectivity import ComponentIndex
+from benchmarks.maps import maze_map, random_map
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def run(size, toggles=200):
+    rng = random.Random(0)
+    maps = {
+        "random 30%": random_map(size, size, density=0.3, seed=1),
+        "maze": maze_map(size, size, seed=1),
+    }
+    for name, grid in maps.items():
+        # Wall off the bottom-right corner so queries into it are unreachable
+        goal = (size - 2, size - 2)
+        for i, j in ((size - 3, size - 3), (size - 3, size - 2), (size - 3, size - 1),
+                     (size - 2, size - 3), (size - 1, size - 3)):
+            grid[i][j] = "X"
+        grid[goal[0]][goal[1]] = "O"
+        start = next((i, j) for i in range(size) for j in range(size) if grid[i][j] != "X")
+
+        pathfinding = PathfindingAlgorithms(grid, size, size)
+        components, build_ms = timed(ComponentIndex, pathfinding)
+        print(f"{size}x{size} {name}: labelled {components.component_count():,} components in {build_ms:.0f} ms")
+
+        slowest = total = 0
+        for _ in range(toggles):
+            i, j = rng.randrange(size - 3), rng.randrange(size - 3)
+            grid[i][j] = "O" if grid[i][j] == "X" else "X"
+            _, update_ms = timed(pathfinding.update_cell, (i, j))
+            total += update_ms
+            slowest = max(slowest, update_ms)
+        print(f"  {toggles} toggles: mean {total / toggles:.3f} ms, slowest {slowest:.1f} ms")
+
+        for algorithm in ("bfs", "a_star"):
+            pathfinding.use_components(None)
+            _, without_ms = timed(getattr(pathfinding, algorithm), start, goal)
+            pathfinding.use_components(components)
+            _, with_ms = timed(getattr(pathfinding, algorithm), start, goal)
+            print(f"  unreachable {algorithm:<7} without index {without_ms:>9.1f} ms, with index {with_ms:.3f} ms")
+        components.close()
+
+
+if __name__ == "__main__":
+    for size in [int(arg) for arg in sys.argv[1:]] or [512, 1024]:
+        run(size)
@@ -0,0 +1,160 @@
+'''
+Node expansions per second for the four search methods on large random maps,
+against the searches they replaced.
+
+TupleGridSearches below is the original implementation: (row, col) tuples,
+dict-based bookkeeping and a bounds and obstacle check on the nested grid for
+every neighbour. Each search runs once on both and the last column gives the
+speed-up in wall time. Expansions are counted through the visualize_callback,
+which is called once per popped node (the original dijkstra and a_star also
+report their outdated heap entries, so their counts can be higher).
+
+    python -m benchmarks.flat_grid [size ...]
+
+Defaults are 1000 and 4000. All four methods run at every size; the original
+searches only run up to BASELINE_LIMIT, as their dicts of tuples need several
+GiB at 4000x4000.
+'''
+import heapq
+import sys
+import time
+from collections import deque
+
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import random_map
+
+ALGORITHMS = ("bfs", "dijkstra", "a_star", "dfs")
+
+# Largest side length the tuple-based searches are timed at
+BASELINE_LIMIT = 2000
+
+
+class TupleGridSearches:
+    """The searches as they were before the flat grid (4-connected, unit costs)"""
+    def __init__(self, grid, grid_height, grid_width):
+        self.grid = grid
+        self.grid_height = grid_height
+        self.grid_width = grid_width
+        self.directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+    def is_valid_position(self, position):
+        i, j = position
+        return 0 <= i < self.grid_height and 0 <= j < self.grid_width and self.grid[i][j] != "X"
+
+    def a_star(self, start, goal, visualize_callback=None):
+        def heuristic(a, b):
+            return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+        priority_queue = [(0, start)]
+        came_from = {}
+        g_score = {start: 0}
+        while priority_queue:
+            _, current = heapq.heappop(priority_queue)
+            if visualize_callback:
+                visualize_callback(current, current == goal)
+            if current == goal:
+                break
+            for dy, dx in self.directions:
+                neighbor = (current[0] + dy, current[1] + dx)
+                if self.is_valid_position(neighbor):
+                    temp_g_score = g_score[current] + 1
+                    if neighbor not in g_score or temp_g_score < g_score[neighbor]:
+                        g_score[neighbor] = temp_g_score
+                        heapq.heappush(priority_queue, (temp_g_score + heuristic(neighbor, goal), neighbor))
+                        came_from[neighbor] = current
+        return came_from
+
+    def bfs(self, start, goal, visualize_callback=None):
+        queue = deque([start])
+        came_from = {start: None}
+        while queue:
+            current = queue.popleft()
+            if visualize_callback:
+                visualize_callback(current, current == goal)
+            if current == goal:
+                break
+            for dy, dx in self.directions:
+                neighbor = (current[0] + dy, current[1] + dx)
+                if self.is_valid_position(neighbor) and neighbor not in came_from:
+                    came_from[neighbor] = current
+                    queue.append(neighbor)
+        return came_from
+
+    def dijkstra(self, start, goal, visualize_callback=None):
+        priority_queue = [(0, start)]
+        came_from = {}
+        cost_so_far = {start: 0}
+        while priority_queue:
+            _, current = heapq.heappop(priority_queue)
+            if visualize_callback:
+                visualize_callback(current, current == goal)
+            if current == goal:
+                break
+            for dy, dx in self.directions:
+                neighbor = (current[0] + dy, current[1] + dx)
+                if self.is_valid_position(neighbor):
+                    new_cost = cost_so_far[current] + 1
+                    if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                        cost_so_far[neighbor] = new_cost
+                        heapq.heappush(priority_queue, (new_cost, neighbor))
+                        came_from[neighbor] = current
+        return came_from
+
+    def dfs(self, start, goal, visualize_callback=None):
+        stack = [start]
+        came_from = {}
+        visited = set()
+        while stack:
+            current = stack.pop()
+            if visualize_callback:
+                visualize_callback(current, current == goal)
+            if current == goal:
+                break
+            if current in visited:
+                continue
+            visited.add(current)
+            for dy, dx in self.directions:
+                neighbor = (current[0] + dy, current[1] + dx)
+                if self.is_valid_position(neighbor) and neighbor not in visited:
+                    came_from[neighbor] = current
+                    stack.append(neighbor)
+        return came_from
+
+
+def timed(search):
+    """Runs search(count) and returns (expansions, seconds)"""
+    expansions = 0
+
+    def count(node, is_goal):
+        nonlocal expansions
+        expansions += 1
+
+    search_start = time.perf_counter()
+    search(count)
+    return expansions, time.perf_counter() - search_start
+
+
+def run(size, algorithms=ALGORITHMS, baseline=True):
+    grid = random_map(size, size, density=0.2, seed=1)
+
+    build_start = time.perf_counter()
+    pathfinding = PathfindingAlgorithms(grid, size, size)
+    build_time = time.perf_counter() - build_start
+    print(f"{size}x{size}: grid set up in {build_time * 1000:.1f} ms")
+    reference = TupleGridSearches(grid, size, size) if baseline else None
+
+    # A goal outside the grid is never reached, which forces a full sweep of the reachable region
+    start, goal = (0, 0), (-5, -5)
+    print(f"  {'':<10}{'flat expanded':>14}{'/s':>12}{'s':>8}{'tuple expanded':>16}{'/s':>12}{'s':>8}{'speed-up':>10}")
+    for name in algorithms:
+        expansions, elapsed = timed(lambda count: getattr(pathfinding, name)(start, goal, count))
+        line = f"  {name:<10}{expansions:>14,}{expansions / elapsed:>12,.0f}{elapsed:>8.2f}"
+        if reference is not None:
+            old_expansions, old_elapsed = timed(lambda count: getattr(reference, name)(start, goal, count))
+            line += f"{old_expansions:>16,}{old_expansions / old_elapsed:>12,.0f}{old_elapsed:>8.2f}{old_elapsed / elapsed:>9.1f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    for size in [int(arg) for arg in sys.argv[1:]] or [1000, 4000]:
+        run(size, baseline=size <= BASELINE_LIMIT)
@@ -0,0 +1,68 @@
+'''
+One flow field against one A* search per agent, for agents sharing a goal.
+
+For each map, times:
+- the field computed with the hybrid wavefront;
+- the same field with bitset ticks disabled (a plain per-cell bucket loop);
+- reading every agent's path off the field;
+- one a_star call per agent.
+
+    python -m benchmarks.flow_field [size] [agents]
+
+Defaults are 1024 and 100 agents.
+'''
+import random
+import sys
+import time
+
+import flow_field
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import maze_map, open_map, random_map, rooms_map
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def scalar_field(pathfinding, goal):
+    """The field with bitset ticks switched off, for comparison"""
+    saved = flow_field.BITSET_ABOVE
+    flow_field.BITSET_ABOVE = 1 << 60
+    try:
+        return flow_field.FlowField(pathfinding, goal)
+    finally:
+        flow_field.BITSET_ABOVE = saved
+
+
+def run(size, agents):
+    maps = {
+        "open": open_map(size, size),
+        "random 20%": random_map(size, size, density=0.2, seed=1),
+        "rooms": rooms_map(size, size, seed=1),
+        "maze": maze_map(size | 1, size | 1, seed=1),
+    }
+    print(f"{size}x{size}, {agents} agents sharing one goal (times in ms)")
+    print(f"{'map':<11} {'field':>8} {'scalar':>8} {'lookups':>8} {'a_star x' + str(agents):>11}")
+    for name, grid in maps.items():
+        height, width = len(grid), len(grid[0])
+        pathfinding = PathfindingAlgorithms(grid, height, width)
+        open_cells = [(i, j) for i in range(height) for j in range(width) if grid[i][j] != "X"]
+        rng = random.Random(0)
+        goal = open_cells[len(open_cells) // 2]
+        starts = [rng.choice(open_cells) for _ in range(agents)]
+
+        field, field_ms = timed(flow_field.FlowField, pathfinding, goal)
+        scalar, scalar_ms = timed(scalar_field, pathfinding, goal)
+        assert field.distance == scalar.distance
+        paths, lookup_ms = timed(lambda: [field.path(start) for start in starts])
+        trees, a_star_ms = timed(lambda: [pathfinding.a_star(start, goal).path() for start in starts])
+        for path, tree_path in zip(paths, trees):
+            assert (path is None) == (tree_path is None) and (path is None or path.cost == tree_path.cost)
+        print(f"{name:<11} {field_ms:>8.0f} {scalar_ms:>8.0f} {lookup_ms:>8.1f} {a_star_ms:>11.0f}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(args[0] if args else 1024, args[1] if len(args) > 1 else 100)
@@ -0,0 +1,108 @@
+'''
+Editor interactions with whole-grid scans against GridModel's bookkeeping.
+
+For each size, times (in microseconds per interaction):
+- moving the start: scanning for the old "S", or GridModel.set_start;
+- finding start and goal before a search: two check_grid scans and a full
+  scan, or reading GridModel.start/goal;
+- clearing a 2 * size cell path: rewriting every cell, or GridModel.clear_path.
+
+    python -m benchmarks.grid_model [sizes ...]
+
+Defaults are 100, 500 and 2000 (MAX_GRID_SIZE).
+'''
+import sys
+import time
+
+from grid_model import GridModel
+from benchmarks.maps import random_map
+
+REPEATS = 5
+
+
+def timed_us(function, setup=None):
+    total = 0
+    for _ in range(REPEATS):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        total += time.perf_counter() - start
+    return total * 1e6 / REPEATS
+
+
+def scan_move_start(grid, position):
+    for row in grid:
+        for j, value in enumerate(row):
+            if value == "S":
+                row[j] = "O"
+    grid[position[0]][position[1]] = "S"
+
+
+def scan_find_endpoints(grid):
+    if not any("S" in row for row in grid) or not any("G" in row for row in grid):
+        return None, None
+    start = goal = None
+    for i, row in enumerate(grid):
+        for j, value in enumerate(row):
+            if value == "S":
+                start = (i, j)
+            elif value == "G":
+                goal = (i, j)
+    return start, goal
+
+
+def scan_clear_path(grid):
+    for row in grid:
+        for j, value in enumerate(row):
+            if value == "P":
+                row[j] = "O"
+
+
+def path_cells(size):
+    # An L-shaped path along the top row and down the right column
+    return [(0, j) for j in range(size)] + [(i, size - 1) for i in range(1, size)]
+
+
+def run(sizes):
+    print(f"{'size':>6} {'interaction':<16} {'scan us':>10} {'model us':>10}")
+    for size in sizes:
+        grid = [list(row) for row in random_map(size, size, density=0.2, seed=1)]
+        grid[size // 2][0] = "S"
+        grid[size - 1][size // 2] = "G"
+        model = GridModel(grid, size, size)
+        renderer_log = model.subscribe()
+        planner_log = model.subscribe(costs_only=True)
+        targets = [(size // 2, 0), (size // 2, 1)]
+
+        def model_move_start():
+            for target in targets:
+                model.set_start(target)
+            model.changes(renderer_log)
+            model.changes(planner_log)
+
+        def scan_move():
+            for target in targets:
+                scan_move_start(grid, target)
+
+        def mark_path():
+            model.mark_path(path_cells(size))
+            model.changes(renderer_log)
+            model.changes(planner_log)
+
+        def model_clear():
+            model.clear_path()
+            model.changes(renderer_log)
+            model.changes(planner_log)
+
+        rows = [
+            ("move start", timed_us(scan_move) / len(targets), timed_us(model_move_start) / len(targets)),
+            ("find endpoints", timed_us(lambda: scan_find_endpoints(grid)), timed_us(lambda: (model.start, model.goal))),
+            ("clear path", timed_us(lambda: scan_clear_path(grid), mark_path), timed_us(model_clear, mark_path)),
+        ]
+        for name, scan_us, model_us in rows:
+            print(f"{size:>6} {name:<16} {scan_us:>10.0f} {model_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [100, 500, 2000])
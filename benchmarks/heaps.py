@@ -0,0 +1,54 @@
+'''
+Frontier queues and A* tie-breaking: pushes, expansions, stale pops and time.
+
+Every combination of queue_type (bucket, indexed, heap), tie_break (for a_star)
+and movement model is run corner to corner on each map:
+
+    python -m benchmarks.heaps [size]
+
+"heap" is the heapq frontier with lazy deletion: its stale pops are the
+outdated duplicates skipped on the way. "indexed" (IndexedHeap) and "bucket"
+(BucketQueue, 4-connected only) update entries in place and never have any.
+'''
+import sys
+import time
+
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import open_map, random_map, rooms_map, terrain_map
+
+
+def run(size):
+    maps = {
+        "open": open_map(size, size),
+        "random 20%": random_map(size, size, density=0.2, seed=1),
+        "rooms": rooms_map(size, size, seed=1),
+        "terrain": terrain_map(size, size, seed=1),
+    }
+    for name, grid in maps.items():
+        height, width = len(grid), len(grid[0])
+        pathfinding = PathfindingAlgorithms(grid, height, width)
+        open_cells = [(i, j) for i in range(height) for j in range(width) if grid[i][j] != "X"]
+        start, goal = open_cells[0], open_cells[-1]
+
+        print(f"{width}x{height} {name}, {start} -> {goal}")
+        print(f"  {'search':<9}{'moves':>6} {'queue':<8}{'ties':<10}{'expanded':>10}{'pushes':>10}{'stale':>8}{'ms':>9}")
+        for connectivity in (4, 8):
+            pathfinding.set_movement(connectivity)
+            for algorithm, tie_breaks in (("a_star", ("larger_g", "none")), ("dijkstra", ("-",))):
+                for queue_type in ("bucket", "indexed", "heap"):
+                    if queue_type == "bucket" and connectivity == 8:
+                        continue
+                    for tie_break in tie_breaks:
+                        pathfinding.queue_type = queue_type
+                        pathfinding.tie_break = "larger_g" if tie_break == "-" else tie_break
+                        started = time.perf_counter()
+                        stats = getattr(pathfinding, algorithm)(start, goal).stats
+                        elapsed_ms = (time.perf_counter() - started) * 1000
+                        print(f"  {algorithm:<9}{connectivity:>6} {queue_type:<8}{tie_break:<10}"
+                              f"{stats.expansions:>10,}{stats.pushes:>10,}{stats.stale_pops:>8,}{elapsed_ms:>9.1f}")
+        pathfinding.queue_type = "bucket"
+        pathfinding.tie_break = "larger_g"
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 512)
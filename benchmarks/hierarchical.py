@@ -0,0 +1,76 @@
+'''
+HPA* (hierarchical.py) against flat A*: abstraction build time, query time
+split into connecting start/goal, the abstract search and refinement, path
+suboptimality, and the cost of repairing the abstraction after a few edits:
+
+    python -m benchmarks.hierarchical [size] [cluster_size]
+'''
+import random
+import sys
+import time
+
+from pathfinding import PathfindingAlgorithms
+from hierarchical import HierarchicalPlanner
+from benchmarks.maps import random_map, rooms_map
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def run(size, cluster_size, queries=20):
+    maps = {
+        "random 20%": random_map(size, size, density=0.2, seed=1),
+        "rooms": rooms_map(size, size, seed=1),
+    }
+    rng = random.Random(0)
+
+    for name, grid in maps.items():
+        pathfinding = PathfindingAlgorithms(grid, size, size)
+        planner = HierarchicalPlanner(pathfinding, cluster_size)
+        _, build_ms = timed(planner.refresh)
+        node_count = sum(len(nodes) for nodes in planner.edges.values())
+        print(f"{size}x{size} {name}, {cluster_size}x{cluster_size} clusters: "
+              f"built {len(planner.edges)} clusters / {node_count} nodes in {build_ms:.0f} ms")
+
+        open_cells = [(i, j) for i, row in enumerate(grid) for j, cell in enumerate(row) if cell != "X"]
+        totals = {"flat": 0, "connect": 0, "abstract": 0, "refine": 0}
+        ratios = []
+        for _ in range(queries):
+            start, goal = rng.choice(open_cells), rng.choice(open_cells)
+            flat, flat_ms = timed(pathfinding.a_star, start, goal)
+            nodes, query_ms = timed(planner.abstract_path, start, goal)
+            if nodes is None or flat.stats.path_cost is None:
+                continue
+            path, refine_ms = timed(planner.refine, nodes)
+
+            abstract_ms = planner.stats.elapsed_ns / 1e6
+            totals["flat"] += flat_ms
+            totals["connect"] += query_ms - abstract_ms
+            totals["abstract"] += abstract_ms
+            totals["refine"] += refine_ms
+            if flat.stats.path_cost:
+                ratios.append(path.cost / flat.stats.path_cost)
+
+        count = len(ratios)
+        print(f"  mean per query: flat A* {totals['flat'] / count:.2f} ms | HPA* connect {totals['connect'] / count:.2f} ms, "
+              f"abstract {totals['abstract'] / count:.3f} ms, refine {totals['refine'] / count:.2f} ms")
+        print(f"  suboptimality over {count} queries: mean {sum(ratios) / count - 1:.2%}, worst {max(ratios) - 1:.2%}")
+
+        # Repair after toggling a few obstacles, against rebuilding from scratch
+        changed = [rng.choice(open_cells) for _ in range(5)]
+        for i, j in changed:
+            grid[i][j] = "X"
+        pathfinding.update_cells(changed)
+        dirty = len(planner.dirty_clusters)
+        _, repair_ms = timed(planner.refresh)
+        print(f"  5 obstacle edits: rebuilt {dirty} clusters in {repair_ms:.1f} ms (full build {build_ms:.0f} ms)")
+        planner.close()
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    cluster_size = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    run(size, cluster_size)
@@ -0,0 +1,64 @@
+'''
+D* Lite repair time against a full A* rerun after obstacle changes.
+
+Each round toggles 1, 10 or 100 cells, chosen on and around the current path so
+that the changes actually invalidate it:
+
+    python -m benchmarks.incremental [size]
+'''
+import random
+import sys
+import time
+
+from pathfinding import PathfindingAlgorithms
+from incremental import DStarLite
+from benchmarks.maps import random_map
+
+
+def run(size, rounds=5):
+    grid = random_map(size, size, density=0.2, seed=1)
+    pathfinding = PathfindingAlgorithms(grid, size, size)
+    start, goal = (0, 0), (size - 1, size - 1)
+
+    planner = DStarLite(pathfinding, start, goal)
+    initial_start = time.perf_counter()
+    path = planner.plan()
+    print(f"{size}x{size}: initial D* Lite plan {(time.perf_counter() - initial_start) * 1000:.1f} ms")
+
+    rng = random.Random(0)
+    print(f"  {'cells':>6}{'D* Lite repair':>18}{'A* rerun':>12}")
+    for changed in (1, 10, 100):
+        repair_time = 0
+        a_star_time = 0
+        for _ in range(rounds):
+            cells = set()
+            while len(cells) < changed:
+                i, j = rng.choice(path[1:-1])
+                cell = (min(max(i + rng.randint(-2, 2), 0), size - 1), min(max(j + rng.randint(-2, 2), 0), size - 1))
+                if cell not in (start, goal):
+                    cells.add(cell)
+            for i, j in cells:
+                grid[i][j] = "O" if grid[i][j] == "X" else "X"
+
+            repair_start = time.perf_counter()
+            pathfinding.update_cells(cells)
+            path = planner.plan()
+            repair_time += time.perf_counter() - repair_start
+
+            a_star_start = time.perf_counter()
+            pathfinding.a_star(start, goal)
+            a_star_time += time.perf_counter() - a_star_start
+
+            if path is None:
+                # Walled off: undo the change so the next round still has a path to disturb
+                for i, j in cells:
+                    grid[i][j] = "O" if grid[i][j] == "X" else "X"
+                pathfinding.update_cells(cells)
+                path = planner.plan()
+
+        print(f"  {changed:>6}{repair_time / rounds * 1000:>15.1f} ms{a_star_time / rounds * 1000:>9.1f} ms")
+    planner.close()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 256)
@@ -0,0 +1,31 @@
+'''
+Heap pushes and wall time of Jump Point Search against A* on open maps:
+
+    python -m benchmarks.jump_point [size ...]
+'''
+import sys
+
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import open_map, random_map
+from benchmarks.measure import measure
+
+
+def run(size):
+    maps = {
+        "open": open_map(size, size),
+        "5% obstacles": random_map(size, size, density=0.05, seed=1),
+    }
+    start, goal = (0, 0), (size - 1, size - 1)
+
+    for name, grid in maps.items():
+        planner = PathfindingAlgorithms(grid, size, size)
+        print(f"{size}x{size} {name}")
+        for algorithm in ("a_star", "jump_point_search"):
+            result = measure(planner, algorithm, start, goal, memory=False)
+            print(f"  {algorithm:<18} length {result['path_length']:>6} "
+                  f"heap pushes {result['pushes']:>9,} {result['wall_ms']:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    for size in [int(arg) for arg in sys.argv[1:]] or [256, 1024]:
+        run(size)
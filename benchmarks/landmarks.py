@@ -0,0 +1,53 @@
+'''
+A* with the Manhattan heuristic against A* with the landmark (ALT) heuristic.
+
+Reports index build time, cached load time, and expansions/time per query:
+
+    python -m benchmarks.landmarks [size]
+'''
+import random
+import sys
+import tempfile
+import time
+
+from pathfinding import PathfindingAlgorithms
+from landmarks import preprocess
+from benchmarks.maps import maze_map, random_map
+
+
+def run(size, queries=20):
+    maps = {
+        "random 30%": random_map(size, size, density=0.3, seed=1),
+        "maze": maze_map(size | 1, size | 1, seed=1),
+    }
+    cache_dir = tempfile.mkdtemp(prefix="landmarks-")
+
+    for name, grid in maps.items():
+        height, width = len(grid), len(grid[0])
+        pathfinding = PathfindingAlgorithms(grid, height, width)
+
+        build_start = time.perf_counter()
+        preprocess(pathfinding, cache_dir).close()
+        build_time = time.perf_counter() - build_start
+        load_start = time.perf_counter()
+        index = preprocess(pathfinding, cache_dir)
+        load_time = time.perf_counter() - load_start
+        print(f"{width}x{height} {name}: build {build_time:.2f} s, cached load {load_time * 1000:.1f} ms")
+
+        rng = random.Random(0)
+        open_cells = [(i, j) for i in range(height) for j in range(width) if grid[i][j] != "X"]
+        pairs = [(rng.choice(open_cells), rng.choice(open_cells)) for _ in range(queries)]
+
+        for label, landmarks in (("manhattan", None), ("landmarks", index)):
+            if landmarks is not None:
+                pathfinding.use_landmarks(landmarks)
+            expansions = 0
+            search_start = time.perf_counter()
+            for start, goal in pairs:
+                expansions += pathfinding.a_star(start, goal).stats.expansions
+            elapsed = time.perf_counter() - search_start
+            print(f"  {label:<10}{expansions / queries:>12,.0f} expansions/query {elapsed / queries * 1000:>9.1f} ms/query")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 512)
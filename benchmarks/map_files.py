@@ -0,0 +1,78 @@
+'''
+Map import/export speed for every map_files format, against building the
+planner from a list-of-lists grid as the GUI does.
+
+Each format is written and read back at one size, then a very large map is
+opened from the native format (memory-mapped) and queried straight away:
+
+    python -m benchmarks.map_files [size] [large size]
+
+Defaults are 2048 and 10000 (the large map file is about 100 MB).
+'''
+import os
+import sys
+import tempfile
+import time
+
+import map_files
+from pathfinding import BLOCKED, OPEN, PathfindingAlgorithms
+
+
+def random_cells(size, density=0.2):
+    """Random flat cell array with about `density` obstacles, built from os.urandom without a per-cell loop"""
+    limit = int(256 * density)
+    table = bytes(BLOCKED if value < limit else OPEN for value in range(256))
+    rows = [os.urandom(size).translate(table) for _ in range(size)]
+    cells = map_files.pad_rows(rows, size)
+    # Keep the corners open for the queries
+    stride = size + 2
+    cells[stride + 1] = cells[size * stride + size] = OPEN
+    return cells
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run(size, large_size):
+    directory = tempfile.mkdtemp(prefix="map-files-")
+    cells = random_cells(size)
+    grid = map_files.cells_to_grid(cells, size, size)
+
+    _, grid_ms = timed(PathfindingAlgorithms, grid, size, size)
+    print(f"{size}x{size} random 20%: list-of-lists grid -> planner {grid_ms:8.1f} ms")
+    print(f"  {'format':<6} {'write ms':>9} {'read ms':>9} {'planner ms':>11} {'file MB':>9}")
+    for extension in map_files.READERS:
+        path = os.path.join(directory, "map" + extension)
+        _, write_ms = timed(map_files.save_map, path, cells, size, size)
+        (loaded, _, _), read_ms = timed(map_files.load_map, path)
+        planner, planner_ms = timed(map_files.load_planner, path)
+        expected = cells if extension == ".grid" else bytes(OPEN if cost else BLOCKED for cost in range(256))
+        if extension != ".grid":
+            expected = cells.translate(expected)
+        assert bytes(loaded) == bytes(expected), extension
+        print(f"  {extension:<6} {write_ms:>9.1f} {read_ms:>9.1f} {planner_ms:>11.1f} {os.path.getsize(path) / 2**20:>9.1f}")
+        del planner
+    del grid, cells
+
+    path = os.path.join(directory, "large.grid")
+    large_cells = random_cells(large_size)
+    map_files.write_native(path, large_cells, large_size, large_size)
+    del large_cells
+
+    native, open_ms = timed(map_files.open_native, path)
+    planner = native.planner()
+    goal = (min(large_size - 1, 200), min(large_size - 1, 200))
+    tree, query_ms = timed(planner.a_star, (0, 0), goal)
+    path_length = tree.path().length if tree.path() else None
+    print(f"{large_size}x{large_size} native .grid ({os.path.getsize(path) / 2**20:.0f} MB): "
+          f"open {open_ms:.2f} ms, first a_star to {goal} {query_ms:.1f} ms (path length {path_length})")
+    del planner, tree
+    native.close()
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]]
+    run(sizes[0] if sizes else 2048, sizes[1] if len(sizes) > 1 else 10000)
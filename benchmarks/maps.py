@@ -0,0 +1,128 @@
+'''
+Map generators used by the benchmarks.
+
+Every generator returns a grid in the same format VisualGridEnv uses:
+a list of rows, each a list of "O" (open) / "X" (obstacle) strings.
+'''
+import random
+
+
+def open_map(width, height):
+    """Returns a grid with no obstacles"""
+    return [["O" for _ in range(width)] for _ in range(height)]
+
+
+def random_map(width, height, density=0.2, seed=0):
+    """
+    Returns a grid where each cell is an obstacle with probability `density`.
+    The top-left and bottom-right corners are always kept open.
+    """
+    rng = random.Random(seed)
+    grid = [["X" if rng.random() < density else "O" for _ in range(width)] for _ in range(height)]
+    grid[0][0] = "O"
+    grid[height - 1][width - 1] = "O"
+    return grid
+
+
+def maze_map(width, height, seed=0):
+    """
+    Returns a perfect maze (one path between any two open cells) carved by a
+    randomised depth-first search. Corridors are one cell wide; the top-left
+    corner is always open and so is the bottom-right when both sizes are odd.
+    """
+    rng = random.Random(seed)
+    grid = [["X" for _ in range(width)] for _ in range(height)]
+    grid[0][0] = "O"
+    stack = [(0, 0)]
+    while stack:
+        i, j = stack[-1]
+        candidates = [
+            (i + di, j + dj) for di, dj in ((-2, 0), (0, 2), (2, 0), (0, -2))
+            if 0 <= i + di < height and 0 <= j + dj < width and grid[i + di][j + dj] == "X"
+        ]
+        if not candidates:
+            stack.pop()
+            continue
+        ni, nj = rng.choice(candidates)
+        grid[(i + ni) // 2][(j + nj) // 2] = "O"
+        grid[ni][nj] = "O"
+        stack.append((ni, nj))
+    return grid
+
+
+def rooms_map(width, height, room_size=16, seed=0):
+    """
+    Returns a grid split into rooms of roughly room_size cells by one-cell walls,
+    with a random door in every wall segment between two neighbouring rooms.
+    """
+    rng = random.Random(seed)
+    grid = open_map(width, height)
+    wall_rows = range(room_size, height, room_size + 1)
+    wall_cols = range(room_size, width, room_size + 1)
+
+    for i in wall_rows:
+        for j in range(width):
+            grid[i][j] = "X"
+    for j in wall_cols:
+        for i in range(height):
+            grid[i][j] = "X"
+
+    # One door per wall segment, placed between the crossing walls
+    row_edges = [-1, *wall_rows, height]
+    col_edges = [-1, *wall_cols, width]
+    for i in wall_rows:
+        for left, right in zip(col_edges, col_edges[1:]):
+            if right - left > 1:
+                grid[i][rng.randrange(left + 1, right)] = "O"
+    for j in wall_cols:
+        for top, bottom in zip(row_edges, row_edges[1:]):
+            if bottom - top > 1:
+                grid[rng.randrange(top + 1, bottom)][j] = "O"
+    return grid
+
+
+def load_text_map(path):
+    """
+    Loads a grid from a plain text file, one row per line.
+    "X", "#", "@" and "T" are obstacles, the digits "1"-"9" are terrain costs and
+    every other character is open space.
+    """
+    with open(path) as file:
+        lines = [line.rstrip("\n") for line in file if line.strip()]
+    width = max(len(line) for line in lines)
+    return [
+        ["X" if cell in "X#@T" else cell if cell in "123456789" else "O" for cell in line.ljust(width, ".")]
+        for line in lines
+    ]
+
+
+GENERATORS = {
+    "open": lambda width, height, seed: open_map(width, height),
+    "random": lambda width, height, seed: random_map(width, height, seed=seed),
+    "maze": lambda width, height, seed: maze_map(width, height, seed=seed),
+    "rooms": lambda width, height, seed: rooms_map(width, height, seed=seed),
+    "terrain": lambda width, height, seed: terrain_map(width, height, seed=seed),
+}
+
+
+def terrain_map(width, height, max_cost=9, density=0.1, seed=0):
+    """
+    Returns a grid of terrain costs: patches of "1"-"9" cells (cost grows towards
+    the patch centres) over open ground, plus random obstacles with probability `density`.
+    The top-left and bottom-right corners are always kept open.
+    """
+    rng = random.Random(seed)
+    costs = [[1] * width for _ in range(height)]
+    for _ in range(max(1, width * height // 400)):
+        ci, cj = rng.randrange(height), rng.randrange(width)
+        radius = rng.randint(3, 12)
+        for i in range(max(0, ci - radius), min(height, ci + radius + 1)):
+            for j in range(max(0, cj - radius), min(width, cj + radius + 1)):
+                distance = abs(i - ci) + abs(j - cj)
+                if distance <= radius:
+                    costs[i][j] = max(costs[i][j], max_cost - (max_cost - 1) * distance // (radius + 1))
+
+    grid = [["X" if rng.random() < density else ("O" if cost == 1 else str(cost)) for cost in row] for row in costs]
+    grid[0][0] = "O"
+    grid[height - 1][width - 1] = "O"
+    return grid
@@ -0,0 +1,43 @@
+'''
+Shared measurement helpers for the benchmarks.
+'''
+import tracemalloc
+
+
+def path_length(came_from, start, goal):
+    """Number of steps on the path in came_from, 0 if start == goal, None if the goal was not reached"""
+    path = came_from.path(goal)
+    return None if path is None else path.length
+
+
+def measure(planner, algorithm, start, goal, memory=True):
+    """
+    Runs one search and returns its SearchStats counters plus peak memory and path length.
+
+    Peak memory is measured in a second run under tracemalloc, which would otherwise
+    distort the timing. Pass memory=False to skip it.
+    """
+    search = getattr(planner, algorithm)
+    came_from = search(start, goal)
+    stats = came_from.stats
+
+    peak_memory = None
+    if memory:
+        tracemalloc.start()
+        try:
+            search(start, goal)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "wall_ms": stats.elapsed_ns / 1e6,
+        "expanded": stats.expansions,
+        "pushes": stats.pushes,
+        "stale_pops": stats.stale_pops,
+        "max_frontier": stats.max_frontier,
+        "peak_memory_kb": None if peak_memory is None else peak_memory / 1024,
+        "path_length": path_length(came_from, start, goal),
+        "path_cost": stats.path_cost,
+        "suboptimality": stats.suboptimality,
+    }
@@ -0,0 +1,45 @@
+'''
+Path quality and runtime of each movement mode: 4-connected A*, 8-connected A*
+with and without corner cutting, and any-angle Theta*.
+
+Path cost is the geometric length of the path; the last column compares it to
+the straight-line distance between start and goal:
+
+    python -m benchmarks.movement [size]
+'''
+import math
+import sys
+
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import open_map, random_map, rooms_map
+
+MODES = (
+    ("4-connected", 4, False, "a_star"),
+    ("8-connected", 8, False, "a_star"),
+    ("8 + corner cutting", 8, True, "a_star"),
+    ("any-angle (Theta*)", 8, False, "theta_star"),
+)
+
+
+def run(size):
+    maps = {
+        "open": open_map(size, size),
+        "random 10%": random_map(size, size, density=0.1, seed=1),
+        "rooms": rooms_map(size, size, seed=1),
+    }
+    start, goal = (0, 0), (size - 1, size // 3)
+    straight_line = math.hypot(goal[0] - start[0], goal[1] - start[1])
+
+    for name, grid in maps.items():
+        grid[goal[0]][goal[1]] = "O"
+        pathfinding = PathfindingAlgorithms(grid, size, size)
+        print(f"{size}x{size} {name}")
+        for label, connectivity, corner_cutting, algorithm in MODES:
+            pathfinding.set_movement(connectivity, corner_cutting)
+            stats = getattr(pathfinding, algorithm)(start, goal).stats
+            print(f"  {label:<20}{stats.elapsed_ns / 1e6:>9.1f} ms {stats.expansions:>8,} expanded "
+                  f"cost {stats.path_cost:>8.1f} ({stats.path_cost / straight_line - 1:>6.1%} over straight line)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 256)
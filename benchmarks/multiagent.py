@@ -0,0 +1,73 @@
+'''
+Multi-agent planning time as the number of agents grows.
+
+Cooperative A* and CBS solve the same random instances (distinct starts and
+distinct goals) on a random obstacle map. Reports the success rate, the
+median solve time and the mean sum of costs over the instances both solved:
+
+    python -m benchmarks.multiagent [size] [agent counts ...]
+
+CBS gives up after MAX_NODES (1000) constraint tree nodes, which
+counts as a failure. The per-goal distance maps both planners use for their
+heuristic are built before timing.
+'''
+import random
+import statistics
+import sys
+
+from pathfinding import PathfindingAlgorithms
+from multiagent import MultiAgentPlanner
+from connectivity import ComponentIndex
+from benchmarks.maps import random_map
+
+INSTANCES = 10
+MAX_NODES = 1000
+
+
+def run(size, agent_counts):
+    grid = random_map(size, size, density=0.15, seed=1)
+    pathfinding = PathfindingAlgorithms(grid, size, size)
+    pathfinding.use_components(ComponentIndex(pathfinding))
+    planner = MultiAgentPlanner(pathfinding)
+    open_cells = [(i, j) for i in range(size) for j in range(size) if grid[i][j] != "X"]
+    rng = random.Random(0)
+
+    print(f"{size}x{size} random 15%, {INSTANCES} instances per agent count, CBS limit {MAX_NODES} nodes")
+    print(f"{'agents':>6} | {'CA* solved':>10} {'median ms':>10} | {'CBS solved':>10} {'median ms':>10} {'nodes':>7} | {'CA* cost':>9} {'CBS cost':>9}")
+    for count in agent_counts:
+        results = {"cooperative": [], "cbs": []}
+        nodes = []
+        for _ in range(INSTANCES):
+            # Only agents whose goal is reachable, so failures come from the other agents
+            while True:
+                starts = rng.sample(open_cells, count)
+                goals = rng.sample(open_cells, count)
+                if all(pathfinding.is_solvable(start, goal) for start, goal in zip(starts, goals)):
+                    break
+            agents = list(zip(starts, goals))
+            # Distance maps are shared by both planners, so they are built before timing either
+            for goal in goals:
+                planner.distances(pathfinding.to_index(goal))
+
+            paths = planner.cooperative(agents)
+            results["cooperative"].append((None not in paths, planner.stats.elapsed_ns / 1e6, planner.stats.path_cost))
+            paths = planner.cbs(agents, max_nodes=MAX_NODES)
+            results["cbs"].append((None not in paths, planner.stats.elapsed_ns / 1e6, planner.stats.path_cost))
+            nodes.append(planner.cbs_nodes)
+
+        both = [(a[2], b[2]) for a, b in zip(results["cooperative"], results["cbs"]) if a[0] and b[0]]
+        row = [f"{count:>6}"]
+        for name in ("cooperative", "cbs"):
+            solved = sum(ok for ok, _, _ in results[name])
+            median = statistics.median(ms for _, ms, _ in results[name])
+            row.append(f"{solved:>4}/{INSTANCES:<5} {median:>10.1f}")
+            if name == "cbs":
+                row[-1] += f" {statistics.median(nodes):>7.0f}"
+        costs = f"{statistics.mean(a for a, _ in both):>9.1f} {statistics.mean(b for _, b in both):>9.1f}" if both else f"{'-':>9} {'-':>9}"
+        print(" | ".join(row + [costs]))
+    planner.close()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(args[0] if args else 32, args[1:] or [2, 4, 8, 16, 32, 64])
@@ -0,0 +1,40 @@
+'''
+Queries per second of ParallelPlanner at 1, 2, 4 and 8 workers.
+
+    python -m benchmarks.parallel_scaling [size] [pairs]
+'''
+import os
+import sys
+import time
+
+from pathfinding import PathfindingAlgorithms
+from parallel_planner import ParallelPlanner
+from benchmarks.batch_queries import make_pairs
+from benchmarks.maps import random_map
+
+
+def run(size, count, worker_counts=(1, 2, 4, 8)):
+    grid = random_map(size, size, density=0.2, seed=1)
+    pathfinding = PathfindingAlgorithms(grid, size, size)
+    # Distinct starts, so every query is an independent search
+    pairs = make_pairs(grid, count, starts=count)
+
+    print(f"{size}x{size}, {count} a_star queries, {os.cpu_count()} CPUs")
+    serial_start = time.perf_counter()
+    expected = pathfinding.solve_many(pairs, "a_star")
+    print(f"  {'serial':<10}{count / (time.perf_counter() - serial_start):>12,.1f} q/s")
+
+    for workers in worker_counts:
+        with ParallelPlanner(pathfinding, workers=workers) as planner:
+            planner.solve_many(pairs[:workers], "a_star")  # warm up the pool
+            parallel_start = time.perf_counter()
+            paths = planner.solve_many(pairs, "a_star")
+            rate = count / (time.perf_counter() - parallel_start)
+        assert paths == expected, "parallel results differ from serial"
+        print(f"  {f'{workers} workers':<10}{rate:>12,.1f} q/s")
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    run(size, count)
@@ -0,0 +1,65 @@
+'''
+Repeated queries through PathfindingAlgorithms.search and its result cache.
+
+A stream of queries is drawn from a small pool of (start, goal) pairs, as when
+operators rerun the same searches. The stream runs once with the cache and
+once without it, and every few queries an obstacle is toggled, which bumps the
+grid version:
+
+    python -m benchmarks.result_cache [size] [queries] [edit every]
+
+Defaults are 256, 1000 queries and an edit every 100 queries. Reports total
+time, hits, misses and evictions, and the cache's peak memory. The pool's 40
+pairs and three algorithms make 120 distinct keys per grid version.
+'''
+import random
+import sys
+import time
+
+from pathfinding import PathfindingAlgorithms, ResultCache
+from benchmarks.maps import random_map
+
+POOL = 40
+
+
+def run(size, queries, edit_every):
+    grid = random_map(size, size, density=0.2, seed=1)
+    open_cells = [(i, j) for i in range(size) for j in range(size) if grid[i][j] != "X"]
+    rng = random.Random(0)
+    pool = [(rng.choice(open_cells), rng.choice(open_cells)) for _ in range(POOL)]
+    stream = [(rng.choice(("a_star", "bfs", "dijkstra")), *rng.choice(pool)) for _ in range(queries)]
+    edits = [rng.choice(open_cells) for _ in range(queries // edit_every + 1)]
+
+    print(f"{size}x{size} random 20%, {queries} queries over {POOL} pairs, one edit every {edit_every}")
+    print(f"{'cache':<22} {'total ms':>9} {'hits':>6} {'misses':>7} {'evictions':>10} {'peak MB':>8}")
+    caches = {
+        "none": None,
+        "default (32, 64 MB)": ResultCache(),
+        "128 entries, 64 MB": ResultCache(128),
+        "128 entries, 8 MB": ResultCache(128, 8 << 20),
+    }
+    for label, cache in caches.items():
+        pathfinding = PathfindingAlgorithms([row[:] for row in grid], size, size)
+        pathfinding.result_cache = cache
+        peak = 0
+        started = time.perf_counter()
+        for k, (algorithm, start, goal) in enumerate(stream):
+            if k and k % edit_every == 0:
+                # Toggle a cell that is never a query endpoint
+                i, j = edits[k // edit_every]
+                if (i, j) not in {cell for pair in pool for cell in pair}:
+                    pathfinding.grid[i][j] = "O" if pathfinding.grid[i][j] == "X" else "X"
+                    pathfinding.update_cell((i, j))
+            pathfinding.search(algorithm, start, goal).path()
+            if cache is not None and cache.bytes > peak:
+                peak = cache.bytes
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if cache is None:
+            print(f"{label:<22} {elapsed_ms:>9.0f} {'-':>6} {'-':>7} {'-':>10} {'-':>8}")
+        else:
+            print(f"{label:<22} {elapsed_ms:>9.0f} {cache.hits:>6} {cache.misses:>7} {cache.evictions:>10} {peak / (1 << 20):>8.1f}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(args[0] if args else 256, args[1] if len(args) > 1 else 1000, args[2] if len(args) > 2 else 100)
@@ -0,0 +1,54 @@
+'''
+Memory held by a search result: the flat SearchTree parent array against the
+dict of (row, col) tuples the searches used to return.
+
+BFS to the far corner of an open map explores every cell, so both figures are
+per explored node:
+
+    python -m benchmarks.search_tree [size ...]
+
+At 2048x2048 the dict alone takes about 1 GiB.
+'''
+import sys
+import time
+import tracemalloc
+
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import open_map
+
+
+def traced(build):
+    """Returns (result, bytes still allocated by build) under tracemalloc"""
+    tracemalloc.start()
+    try:
+        result = build()
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, allocated
+
+
+def run(size):
+    pathfinding = PathfindingAlgorithms(open_map(size, size), size, size)
+    start, goal = (0, 0), (size - 1, size - 1)
+
+    tree = pathfinding.bfs(start, goal)
+    tree_bytes = sys.getsizeof(tree.parents)
+    explored = len(tree)
+    path_start = time.perf_counter()
+    path = tree.path()
+    path_ms = (time.perf_counter() - path_start) * 1000
+
+    # The old return value, rebuilt from the tree
+    came_from, dict_bytes = traced(lambda: dict(tree.items()))
+    del came_from
+
+    print(f"{size}x{size} open, bfs, {explored:,} explored, path of {path.length:,} steps in {path_ms:.1f} ms")
+    print(f"  dict of tuples {dict_bytes / explored:>8.1f} B/node {dict_bytes / 2**20:>9.1f} MiB")
+    print(f"  SearchTree     {tree_bytes / explored:>8.1f} B/node {tree_bytes / 2**20:>9.1f} MiB")
+    print(f"  ratio          {dict_bytes / tree_bytes:>8.1f}x")
+
+
+if __name__ == "__main__":
+    for size in [int(arg) for arg in sys.argv[1:]] or [512, 1024]:
+        run(size)
@@ -0,0 +1,158 @@
+'''
+Load generator for planning_service: request latency and throughput.
+
+Starts the service on a Unix socket in a child process (so the clients do not
+share its interpreter), then keeps a number of client connections busy. Each
+client sends a plan request, waits for the reply and sends the next one. Three
+runs use the same map:
+- "distinct": every request is a new (start, goal) pair, so every one is searched.
+- "hot pairs": requests are drawn from a few pairs, as when many agents ask for
+  the same routes; in-flight duplicates are coalesced and repeats hit the cache.
+- "hot + swap": as "hot pairs", while another connection loads a second map
+  halfway through, to show the swap does not stall requests.
+
+    python -m benchmarks.service_load [size] [requests] [clients] [workers]
+
+Defaults are 256, 600 requests per run, 16 clients and 2 worker threads.
+Reports requests/sec and p50/p99 latency, with the server's counts for each
+run: requests dispatched to its pool, requests coalesced onto one already in
+flight, and dispatched requests the result cache answered.
+'''
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from map_files import save_map
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import random_map, rooms_map
+
+HOT_PAIRS = 20
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def exchange(reader, writer, request):
+    writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def client(socket_path, requests, latencies):
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    while requests:
+        request = requests.pop()
+        started = time.perf_counter()
+        reply = await exchange(reader, writer, request)
+        latencies.append(time.perf_counter() - started)
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+    writer.close()
+    await writer.wait_closed()
+
+
+async def swap_halfway(socket_path, requests, total, map_path):
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    while len(requests) > total // 2:
+        await asyncio.sleep(0.001)
+    started = time.perf_counter()
+    reply = await exchange(reader, writer, {"id": "swap", "op": "load_map", "path": map_path})
+    writer.close()
+    await writer.wait_closed()
+    if "error" in reply:
+        raise RuntimeError(reply["error"])
+    return (time.perf_counter() - started) * 1000
+
+
+async def status(socket_path):
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    reply = await exchange(reader, writer, {"op": "status"})
+    writer.close()
+    await writer.wait_closed()
+    return reply
+
+
+async def load(socket_path, requests, clients, swap_to=None):
+    """Runs the requests over clients connections; returns (seconds, latencies, counter deltas, swap ms)"""
+    before = await status(socket_path)
+    latencies = []
+    total = len(requests)
+    started = time.perf_counter()
+    jobs = [client(socket_path, requests, latencies) for _ in range(clients)]
+    if swap_to is not None:
+        jobs.append(swap_halfway(socket_path, requests, total, swap_to))
+    results = await asyncio.gather(*jobs)
+    elapsed = time.perf_counter() - started
+    after = await status(socket_path)
+    deltas = {name: after[name] - before[name] for name in ("dispatched", "coalesced")}
+    # The cache belongs to the map, so after a swap only the new map's hits are counted
+    deltas["cache_hits"] = after["cache_hits"] - (before["cache_hits"] if after["map"] == before["map"] else 0)
+    return elapsed, latencies, deltas, results[-1] if swap_to is not None else None
+
+
+def write_map(path, grid):
+    height, width = len(grid), len(grid[0])
+    save_map(path, PathfindingAlgorithms(grid, height, width).cells, height, width)
+    return [(i, j) for i in range(height) for j in range(width) if grid[i][j] != "X"]
+
+
+def run(size, count, clients, workers):
+    directory = tempfile.mkdtemp(prefix="planning_service_")
+    first_map = os.path.join(directory, "random.grid")
+    second_map = os.path.join(directory, "rooms.grid")
+    socket_path = os.path.join(directory, "planner.sock")
+    open_cells = write_map(first_map, random_map(size, size, density=0.2, seed=1))
+    swap_cells = set(write_map(second_map, rooms_map(size, size, seed=1)))
+    # Endpoints open on both maps, so requests stay valid across the swap
+    shared_cells = [cell for cell in open_cells if cell in swap_cells]
+
+    rng = random.Random(0)
+    hot = [(rng.choice(shared_cells), rng.choice(shared_cells)) for _ in range(HOT_PAIRS)]
+
+    def requests(pairs):
+        return [{"id": k, "op": "plan", "algorithm": "a_star", "start": start, "goal": goal}
+                for k, (start, goal) in enumerate(pairs)]
+
+    runs = {
+        "distinct": lambda: requests([(rng.choice(shared_cells), rng.choice(shared_cells)) for _ in range(count)]),
+        "hot pairs": lambda: requests([rng.choice(hot) for _ in range(count)]),
+        "hot + swap": lambda: requests([rng.choice(hot) for _ in range(count)]),
+    }
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "planning_service", first_map, "--socket", socket_path, "--workers", str(workers)],
+        cwd=REPOSITORY, stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        # The server prints one line once it is listening
+        server.stdout.readline()
+        print(f"{size}x{size} random 20%, a_star, {count} requests per run, {clients} clients, {workers} worker threads")
+        print(f"{'run':<11} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'dispatched':>10} {'coalesced':>10} {'cache hits':>11}")
+        for name, make_requests in runs.items():
+            swap_to = second_map if name == "hot + swap" else None
+            elapsed, latencies, deltas, swap_ms = asyncio.run(load(socket_path, make_requests(), clients, swap_to))
+            latencies.sort()
+            print(f"{name:<11} {len(latencies) / elapsed:>8.0f} {percentile(latencies, 0.5) * 1000:>8.1f} "
+                  f"{percentile(latencies, 0.99) * 1000:>8.1f} {deltas['dispatched']:>10} {deltas['coalesced']:>10} "
+                  f"{deltas['cache_hits']:>11}")
+            if swap_ms is not None:
+                print(f"{'':<11} (load_map of the second map replied after {swap_ms:.0f} ms)")
+    finally:
+        server.terminate()
+        server.wait()
+        for name in os.listdir(directory):
+            os.unlink(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(args[0] if args else 256, args[1] if len(args) > 1 else 600,
+        args[2] if len(args) > 2 else 16, args[3] if len(args) > 3 else 2)
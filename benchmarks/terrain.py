@@ -0,0 +1,30 @@
+'''
+Dijkstra and A* on weighted terrain maps with the lazy-deletion heap against
+the bucket (Dial's) queue:
+
+    python -m benchmarks.terrain [size ...]
+'''
+import sys
+
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import terrain_map
+from benchmarks.measure import measure
+
+
+def run(size):
+    grid = terrain_map(size, size, seed=1)
+    pathfinding = PathfindingAlgorithms(grid, size, size)
+    start, goal = (0, 0), (size - 1, size - 1)
+
+    print(f"{size}x{size} terrain (costs 1-9, 10% obstacles)")
+    for algorithm in ("dijkstra", "a_star"):
+        for queue_type in ("heap", "bucket"):
+            pathfinding.queue_type = queue_type
+            result = measure(pathfinding, algorithm, start, goal, memory=False)
+            print(f"  {algorithm:<9}{queue_type:<8}{result['wall_ms']:>10.1f} ms "
+                  f"{result['pushes']:>10,} pushes {result['stale_pops']:>9,} stale pops")
+
+
+if __name__ == "__main__":
+    for size in [int(arg) for arg in sys.argv[1:]] or [512, 1024]:
+        run(size)
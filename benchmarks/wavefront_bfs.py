@@ -0,0 +1,57 @@
+'''
+bfs with the queue loop against the bitset wavefront engine (bfs_engine).
+
+For each size and map, both engines search corner to corner (the first and
+last open cells, so most of the map is explored) and must return paths of the
+same length. Times are in ms:
+
+    python -m benchmarks.wavefront_bfs [sizes ...]
+
+Defaults are 256, 1024 and 4096. The loop takes about a minute at 4096.
+'''
+import sys
+import time
+
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import maze_map, open_map, random_map, rooms_map
+
+
+def run(sizes):
+    print(f"{'size':>6} {'map':<11} {'loop':>9} {'wavefront':>10} {'speedup':>8} {'expanded':>11} {'length':>7}")
+    for size in sizes:
+        maps = {
+            "open": open_map(size, size),
+            "random 20%": random_map(size, size, density=0.2, seed=1),
+            "rooms": rooms_map(size, size, seed=1),
+            "maze": maze_map(size | 1, size | 1, seed=1),
+        }
+        for name, grid in maps.items():
+            height, width = len(grid), len(grid[0])
+            pathfinding = PathfindingAlgorithms(grid, height, width)
+            del grid
+            start = goal = None
+            for index, cost in enumerate(pathfinding.cells):
+                if cost:
+                    goal = pathfinding.to_position(index)
+                    if start is None:
+                        start = goal
+
+            times = {}
+            lengths = {}
+            for engine in ("loop", "wavefront"):
+                pathfinding.bfs_engine = engine
+                started = time.perf_counter()
+                tree = pathfinding.bfs(start, goal)
+                path = tree.path()
+                times[engine] = (time.perf_counter() - started) * 1000
+                lengths[engine] = None if path is None else path.length
+                expanded = tree.stats.expansions
+                del tree, path
+            assert lengths["loop"] == lengths["wavefront"]
+            print(f"{size:>6} {name:<11} {times['loop']:>9.0f} {times['wavefront']:>10.0f} "
+                  f"{times['loop'] / times['wavefront']:>7.1f}x {expanded:>11,} {lengths['loop']!s:>7}")
+            del pathfinding
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [256, 1024, 4096])
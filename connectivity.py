@@ -0,0 +1,219 @@
+'''
+Connected-component labels for instant "no path" answers.
+
+Every open cell gets a component label, and two cells are connected exactly
+when their labels resolve to the same root. The labels are built
+row by row: the open runs of each row are found with a regular expression
+(one C-level scan per row), and each run is joined with the runs it overlaps
+in the row above through union-find.
+
+Components are the same for every movement model: a diagonal step is only
+allowed past at least one open side cell, so it never links cells that
+orthogonal steps could not.
+
+The index listens to PathfindingAlgorithms, like DStarLite:
+- Opening a cell merges the components around it.
+- Blocking a cell runs one breadth-first search per open neighbour, advanced
+  in turn. Searches that meet are merged. A search that runs out of cells
+  first has been cut off, so its cells get a new label. The work is bounded by
+  the smaller side of a split, and it is tiny when nothing splits.
+- update_grid_reference relabels everything on the next query.
+
+Usage:
+    components = ComponentIndex(pathfinding)
+    pathfinding.use_components(components)   # searches between components return at once
+    components.connected(start, goal)
+'''
+import re
+from array import array
+from collections import deque
+
+# Maximal runs of open (non-zero cost) cells in a row of the flat cell array
+_OPEN_RUN = re.compile(rb"[^\x00]+")
+
+
+class ComponentIndex:
+    """Component labels over a PathfindingAlgorithms grid, kept up to date as cells change"""
+    def __init__(self, pathfinding):
+        self.pathfinding = pathfinding
+        pathfinding.add_listener(self)
+        self.build()
+
+    def build(self):
+        """Labels every open cell from scratch"""
+        pathfinding = self.pathfinding
+        cells = pathfinding.cells
+        stride = pathfinding.stride
+        self.cells = cells
+        self.stride = stride
+        self.offsets = pathfinding.offsets
+
+        # Union-find over labels; label 0 marks blocked cells
+        self.label_parent = [0]
+        find = self.find
+        rows = []
+        above = []
+        for row in range(1, pathfinding.grid_height + 1):
+            base = row * stride
+            runs = []
+            k = 0
+            for match in _OPEN_RUN.finditer(bytes(cells[base:base + stride])):
+                begin, end = match.span()
+                # Skip the runs above that end before this one starts; the rest overlap until one starts after it
+                while k < len(above) and above[k][1] <= begin:
+                    k += 1
+                label = 0
+                m = k
+                while m < len(above) and above[m][0] < end:
+                    root = find(above[m][2])
+                    if label == 0:
+                        label = root
+                    elif root != label:
+                        self.label_parent[root] = label
+                    m += 1
+                if label == 0:
+                    label = self.new_label()
+                runs.append((begin, end, label))
+            rows.append((base, runs))
+            above = runs
+
+        labels = array("i", bytes(4 * len(cells)))
+        for base, runs in rows:
+            for begin, end, label in runs:
+                labels[base + begin:base + end] = array("i", [find(label)]) * (end - begin)
+        self.labels = labels
+        self.needs_reset = False
+
+    def close(self):
+        """Stops listening for grid changes"""
+        self.pathfinding.remove_listener(self)
+
+    def new_label(self):
+        self.label_parent.append(len(self.label_parent))
+        return len(self.label_parent) - 1
+
+    def find(self, label):
+        """Root label of a label's component (with path halving)"""
+        parent = self.label_parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    # --- Queries ---
+
+    def connected(self, start, goal):
+        """Whether goal can be reached from start (both (row, col) positions); False if either is off the grid"""
+        start_index = self.pathfinding.index_of(start)
+        goal_index = self.pathfinding.index_of(goal)
+        if start_index is None or goal_index is None:
+            return False
+        return self.connected_indices(start_index, goal_index)
+
+    def connected_indices(self, start_index, goal_index):
+        """Whether two flat cell indices lie in the same component"""
+        if self.needs_reset:
+            self.build()
+        if start_index == goal_index:
+            return True
+        start_label = self.labels[start_index]
+        goal_label = self.labels[goal_index]
+        return start_label != 0 and goal_label != 0 and self.find(start_label) == self.find(goal_label)
+
+    def component_count(self):
+        """Number of distinct components"""
+        if self.needs_reset:
+            self.build()
+        return len({self.find(label) for label in set(self.labels)} - {0})
+
+    # --- Grid change notifications (see PathfindingAlgorithms.add_listener) ---
+
+    def update_cells(self, changed_cells):
+        if self.needs_reset:
+            return
+        cells = self.cells
+        labels = self.labels
+        to_index = self.pathfinding.to_index
+        # One cell at a time, treating labels (not cells) as the current state, so cells
+        # of the batch that are not handled yet still count as they were
+        for position in changed_cells:
+            index = to_index(position)
+            if cells[index] and not labels[index]:
+                self.cell_opened(index)
+            elif not cells[index] and labels[index]:
+                labels[index] = 0
+                self.cell_blocked(index)
+
+    def grid_replaced(self):
+        self.needs_reset = True
+
+    def cell_opened(self, index):
+        """Merges the components around a newly opened cell"""
+        labels = self.labels
+        label = 0
+        for offset in self.offsets:
+            neighbor_label = labels[index + offset]
+            if neighbor_label:
+                root = self.find(neighbor_label)
+                if label == 0:
+                    label = root
+                elif root != label:
+                    self.label_parent[root] = label
+        labels[index] = label or self.new_label()
+
+    def cell_blocked(self, index):
+        """Splits off whatever the newly blocked cell was holding together"""
+        labels = self.labels
+        offsets = self.offsets
+        seeds = [index + offset for offset in offsets if labels[index + offset]]
+        if len(seeds) < 2:
+            return
+
+        # One breadth-first search per seed; group_parent tracks searches merged after meeting
+        group_parent = list(range(len(seeds)))
+        owner = {seed: group for group, seed in enumerate(seeds)}
+        queues = [deque([seed]) for seed in seeds]
+        members = [[seed] for seed in seeds]
+        active = set(range(len(seeds)))
+
+        def find_group(group):
+            while group_parent[group] != group:
+                group = group_parent[group]
+            return group
+
+        while len(active) > 1:
+            for group in list(active):
+                if group not in active:
+                    continue
+                queue = queues[group]
+                if not queue:
+                    # Ran out of cells without meeting another search: cut off from the rest
+                    label = self.new_label()
+                    for cell in members[group]:
+                        labels[cell] = label
+                    active.discard(group)
+                    if len(active) <= 1:
+                        break
+                    continue
+
+                current = queue.popleft()
+                for offset in offsets:
+                    neighbor = current + offset
+                    if not labels[neighbor]:
+                        continue
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = group
+                        queue.append(neighbor)
+                        members[group].append(neighbor)
+                        continue
+                    other = find_group(other)
+                    if other != group:
+                        # Met another search: both sides are still one component
+                        group_parent[other] = group
+                        queue.extend(queues[other])
+                        members[group].extend(members[other])
+                        queues[other] = members[other] = None
+                        active.discard(other)
+                if len(active) <= 1:
+                    break
@@ -0,0 +1,361 @@
+'''
+Flow fields: the distance from every cell to one goal, and the next step
+towards it, from a single wavefront sweep.
+
+When many agents head for the same goal (a charging dock, an exit), one
+field answers all of them: an agent's path is read off by following the
+next-step directions, with no search.
+
+The sweep expands backwards from the goal one distance value (tick) at a
+time, like Dial's algorithm, so terrain costs are handled exactly. A step
+into a cell costs that cell's value, as in dijkstra. It runs in two modes
+and switches between them as the wavefront grows and shrinks:
+- Bitset ticks keep whole cell sets as Python ints (bit i = flat index i).
+  A tick shifts the current wave by each neighbour offset and masks out
+  visited cells, so a wide wave costs a few dozen big-integer operations
+  instead of a Python loop over its cells. Distances are stored as bit-planes:
+  plane k holds the cells whose distance has bit k set. Plane k changes only
+  when bit k of the tick does, which is about two updates per tick.
+- Scalar ticks run an ordinary bucket loop. They are cheaper while the
+  wave is only a few cells wide (corridors, mazes, the first ticks).
+At the end both results are merged into flat arrays with the same C-level
+int/bytes conversions.
+
+Movement is 4-connected.
+
+Usage:
+    fields = FlowFieldCache(pathfinding, capacity=8)
+    field = fields.field(goal)
+    field.distance_to_goal(position)   # None if the goal cannot be reached
+    field.path(start)                  # Path to the goal, or None
+'''
+import sys
+import time
+from array import array
+from collections import OrderedDict
+
+from pathfinding import Path, SearchStats
+
+# Wave width (cells per tick) per million grid cells above which bitset ticks win,
+# and below which scalar ticks win again (apart, so the sweep does not flip back and forth)
+BITSET_ABOVE = 128
+SCALAR_BELOW = 32
+# Bitset ticks between wave width checks (int.bit_count is as slow as a shift)
+WIDTH_CHECK_TICKS = 8
+
+# bytes.translate tables between one byte per cell and ASCII binary digits
+_FLAG_TO_DIGIT = bytes([0x30]) + bytes([0x31]) * 255
+_DIGIT_TO_FLAG = bytes(1 if value == 0x31 else 0 for value in range(256))
+_DIGIT_TO_MASK = bytes(0xFF if value == 0x31 else 0 for value in range(256))
+# 1 where a byte is zero (a blocked cell, or a cell not settled yet), 0 elsewhere
+_IS_ZERO = bytes([1]) + bytes(255)
+
+
+def to_bits(flags):
+    """Int with bit i set where flags[i] is non-zero"""
+    return int(bytes(flags).translate(_FLAG_TO_DIGIT)[::-1], 2)
+
+
+def from_bits(value, size, table=_DIGIT_TO_FLAG):
+    """One byte per bit of value (1 where set, or as mapped by table), for bits 0 to size - 1"""
+    return format(value, f"0{size}b")[::-1].encode("ascii").translate(table)
+
+
+def wavefront(cells, offsets, goal_index, max_cost=255, stats=None):
+    """
+    Sweeps backwards from goal_index over a flat cell array (see build_cells)
+
+    Args:
+        goal_index: flat index of the goal, or None for a goal outside the grid (nothing is reached)
+        offsets: neighbour offsets (each one's negation must be in the list too)
+        max_cost: largest cell cost in the grid (only costs up to it are looked for)
+        stats: optional SearchStats; expansions is set to the number of cells settled
+
+    Returns (distance, directions): an array("i") with each cell's cost to the goal
+    (-1 if unreachable or blocked), and a bytearray holding k + 1 where the next step
+    towards the goal is offsets[k] (0 at the goal and unreachable cells).
+    """
+    size = len(cells)
+    data = bytes(cells)
+    costs = [cost for cost in range(1, max_cost + 1) if bytes([cost]) in data]
+    # Direction code of a cell reached through offsets[j]: the step back is -offsets[j]
+    back_codes = [offsets.index(-offset) + 1 for offset in offsets]
+    direction_count = len(offsets)
+    bitset_above = max(16, BITSET_ABOVE * size >> 20)
+    scalar_below = max(4, SCALAR_BELOW * size >> 20)
+
+    # Per-cost cell sets, used when a wave holds more than one cost
+    cost_masks = []
+    for cost in costs:
+        mask = to_bits(data.translate(bytes(1 if value == cost else 0 for value in range(256))))
+        cost_masks.append((cost, mask))
+    single_cost = len(cost_masks) == 1
+
+    # Bitset state: cells not yet settled, cells settled by bitset ticks, and the planes
+    unvisited = None
+    bitset_done = 0
+    distance_planes = []
+    direction_planes = [0] * max(1, direction_count.bit_length())
+    synced_tick = 0
+    # Scalar state: settled (or blocked) flags and results, allocated on the first scalar tick
+    done = None
+    scalar_distance = None
+    scalar_directions = None
+
+    # Pending cells per tick: lists of (index << 4 | code) in scalar mode, per-direction ints in bitset mode
+    buckets = {0: [goal_index << 4]} if goal_index is not None and data[goal_index] else {}
+    pending = {}
+    bitset = False
+    tick = -1
+
+    def sync(target):
+        # Applies the bit-plane updates for the ticks between synced_tick and target (see module docstring)
+        nonlocal synced_tick
+        changed = synced_tick ^ target
+        while len(distance_planes) < changed.bit_length():
+            distance_planes.append(0)
+        bit = 0
+        while changed:
+            if changed & 1:
+                distance_planes[bit] ^= bitset_done
+            changed >>= 1
+            bit += 1
+        synced_tick = target
+
+    while buckets or pending:
+        tick += 1
+        if not bitset:
+            entries = buckets.pop(tick, None)
+            if entries is None:
+                continue
+            if len(entries) > bitset_above:
+                # Wide wave: hand everything pending over to bitset ticks
+                unvisited = to_bits(done.translate(_IS_ZERO))
+                buckets[tick] = entries
+                for bucket_tick, bucket in buckets.items():
+                    lanes = [bytearray(size) for _ in range(direction_count)]
+                    for entry in bucket:
+                        lanes[back_codes.index(entry & 15)][entry >> 4] = 1
+                    pending[bucket_tick] = [to_bits(lane) for lane in lanes]
+                buckets = {}
+                bitset = True
+                tick -= 1
+                continue
+
+            if done is None:
+                # Blocked cells count as settled, so they are never pushed
+                done = bytearray(data.translate(_IS_ZERO))
+                scalar_distance = array("i", bytes(4 * size))
+                scalar_directions = bytearray(size)
+            for entry in entries:
+                index = entry >> 4
+                if done[index]:
+                    continue
+                done[index] = 1
+                scalar_distance[index] = tick
+                scalar_directions[index] = entry & 15
+                arrival = tick + data[index]
+                bucket = buckets.get(arrival)
+                if bucket is None:
+                    bucket = buckets[arrival] = []
+                for j in range(direction_count):
+                    neighbor = index + offsets[j]
+                    if not done[neighbor]:
+                        bucket.append(neighbor << 4 | back_codes[j])
+            continue
+
+        lanes = pending.pop(tick, None)
+        if lanes is None:
+            continue
+        sync(tick)
+        wave = 0
+        for j in range(direction_count):
+            reached = lanes[j] & unvisited
+            if reached:
+                unvisited ^= reached
+                wave |= reached
+                code = back_codes[j]
+                bit = 0
+                while code:
+                    if code & 1:
+                        direction_planes[bit] |= reached
+                    code >>= 1
+                    bit += 1
+        if not wave:
+            continue
+        bitset_done |= wave
+
+        for cost, mask in cost_masks:
+            part = wave if single_cost else wave & mask
+            if not part:
+                continue
+            target = pending.get(tick + cost)
+            if target is None:
+                target = pending[tick + cost] = [0] * direction_count
+            for j in range(direction_count):
+                offset = offsets[j]
+                target[j] |= part << offset if offset > 0 else part >> -offset
+
+        if tick % WIDTH_CHECK_TICKS == 0 and wave.bit_count() < scalar_below:
+            # Narrow wave: hand everything pending over to scalar ticks
+            done = bytearray(from_bits(unvisited, size).translate(_IS_ZERO))
+            if scalar_distance is None:
+                scalar_distance = array("i", bytes(4 * size))
+                scalar_directions = bytearray(size)
+            for pending_tick, lanes in pending.items():
+                bucket = buckets[pending_tick] = []
+                for j in range(direction_count):
+                    flags = from_bits(lanes[j] & unvisited, size)
+                    code = back_codes[j]
+                    position = flags.find(1)
+                    while position >= 0:
+                        bucket.append(position << 4 | code)
+                        position = flags.find(1, position + 1)
+            pending = {}
+            bitset = False
+
+    # Close the last bit-plane intervals (see sync)
+    sync(0)
+
+    # Merge: 8-bit lanes of distance planes, one lane per byte of the int32 result
+    merged = bytearray(4 * size)
+    for byte in range((len(distance_planes) + 7) // 8):
+        lane = 0
+        for bit, plane in enumerate(distance_planes[8 * byte:8 * byte + 8]):
+            if plane:
+                lane |= int.from_bytes(from_bits(plane, size), "little") << bit
+        merged[byte::4] = lane.to_bytes(size, "little")
+
+    # Cells never settled (blocked, border, or unreachable) read -1
+    if bitset:
+        unreached = unvisited | to_bits(data.translate(_IS_ZERO))
+    elif done is not None:
+        unreached = to_bits(done.translate(_IS_ZERO)) | to_bits(data.translate(_IS_ZERO))
+    else:
+        unreached = (1 << size) - 1
+    if stats is not None:
+        stats.expansions = size - unreached.bit_count()
+    unreached_mask = int.from_bytes(from_bits(unreached, size, _DIGIT_TO_MASK), "little")
+    for byte in range(4):
+        merged[byte::4] = (int.from_bytes(merged[byte::4], "little") | unreached_mask).to_bytes(size, "little")
+
+    distance = array("i")
+    distance.frombytes(bytes(merged))
+    if sys.byteorder == "big":
+        distance.byteswap()
+    directions = 0
+    for bit, plane in enumerate(direction_planes):
+        if plane:
+            directions |= int.from_bytes(from_bits(plane, size), "little") << bit
+    if scalar_distance is not None:
+        # Scalar ticks settled the remaining cells; each cell is non-zero in at most one of the two
+        combined = int.from_bytes(distance.tobytes(), sys.byteorder) | int.from_bytes(scalar_distance.tobytes(), sys.byteorder)
+        distance = array("i")
+        distance.frombytes(combined.to_bytes(4 * size, sys.byteorder))
+        directions |= int.from_bytes(scalar_directions, "little")
+    return distance, bytearray(directions.to_bytes(size, "little"))
+
+
+class FlowField:
+    """Distances to one goal and the next step towards it, for every cell of a grid"""
+    def __init__(self, pathfinding, goal, stats=None):
+        self.pathfinding = pathfinding
+        self.goal = goal
+        self.goal_index = pathfinding.index_of(goal)
+        self.stride = pathfinding.stride
+        self.width = pathfinding.grid_width
+        self.offsets = pathfinding.offsets
+
+        started = time.perf_counter_ns()
+        self.stats = stats or SearchStats("flow_field")
+        self.distance, self.directions = wavefront(pathfinding.cells, pathfinding.offsets, self.goal_index, pathfinding.max_cost, self.stats)
+        self.stats.elapsed_ns = time.perf_counter_ns() - started
+
+    def index_of(self, position):
+        """Flat index of a (row, col), or None outside the grid"""
+        return self.pathfinding.index_of(position)
+
+    def distance_to_goal(self, position):
+        """Cost of the cheapest path from position to the goal, or None if there is none"""
+        index = self.index_of(position)
+        if index is None:
+            return None
+        distance = self.distance[index]
+        return None if distance < 0 else distance
+
+    def next_step(self, position):
+        """The (row, col) to move to from position, or None at the goal or where it cannot be reached"""
+        index = self.index_of(position)
+        if index is None:
+            return None
+        code = self.directions[index]
+        if not code:
+            return None
+        row, col = divmod(index + self.offsets[code - 1], self.stride)
+        return row - 1, col - 1
+
+    def path(self, start):
+        """Path from start to the goal by following the directions, or None if the goal cannot be reached"""
+        index = self.index_of(start)
+        if index is None:
+            return None
+        cost = self.distance[index]
+        if cost < 0:
+            return None
+        stride = self.stride
+        width = self.width
+        directions = self.directions
+        offsets = self.offsets
+        cells = array("i")
+        while True:
+            cells.append((index // stride - 1) * width + index % stride - 1)
+            code = directions[index]
+            if not code:
+                break
+            index += offsets[code - 1]
+        return Path(cells, width, cost)
+
+
+class FlowFieldCache:
+    """
+    Flow fields of the most recently used goals, evicting the least recently used
+
+    Registered as a PathfindingAlgorithms listener (like DStarLite): any grid change
+    empties the cache, since a changed cell can alter every distance.
+    """
+    def __init__(self, pathfinding, capacity=8):
+        self.pathfinding = pathfinding
+        self.capacity = capacity
+        self.fields = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        pathfinding.add_listener(self)
+
+    def close(self):
+        """Stops listening for grid changes"""
+        self.pathfinding.remove_listener(self)
+
+    def field(self, goal):
+        """The FlowField for goal, computed on first use"""
+        field = self.fields.get(goal)
+        if field is not None:
+            self.hits += 1
+            self.fields.move_to_end(goal)
+            return field
+        self.misses += 1
+        field = self.fields[goal] = FlowField(self.pathfinding, goal)
+        if len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+        return field
+
+    def path(self, start, goal):
+        """Path from start to goal read from goal's flow field, or None"""
+        return self.field(goal).path(start)
+
+    # --- Grid change notifications (see PathfindingAlgorithms.add_listener) ---
+
+    def update_cells(self, changed_cells):
+        self.fields.clear()
+
+    def grid_replaced(self):
+        self.fields.clear()
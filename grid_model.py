@@ -0,0 +1,161 @@
+'''
+Editable grid state kept up to date incrementally.
+
+GridModel wraps the editor's list-of-lists grid and tracks, as cells are set,
+where the start and goal are, how many obstacles there are and which cells
+hold path. Moving the start, finding the endpoints or clearing the path then
+costs only the cells involved, instead of a scan of the whole grid.
+
+Every edit is also written to a change log. Each consumer (the renderer, the
+planner) subscribes once, then asks for the cells changed since its last call.
+A planner subscription with costs_only=True only sees cells whose traversal
+cost changed, so moving the start or drawing a path does not invalidate
+searches. Entries every subscriber has read are dropped.
+
+Usage:
+    model = GridModel(grid, height, width)
+    planner_log = model.subscribe(costs_only=True)
+    model.set_cell(2, 3, "X")
+    cells = model.changes(planner_log)   # [(2, 3)], or None after replace()
+'''
+from pathfinding import cell_cost
+
+
+class GridModel:
+    """A grid of cell strings ("O", "X", "S", "G", "P", "1"-"9") with its start, goal, obstacles and path tracked"""
+    def __init__(self, grid, height, width):
+        # Subscriber id -> [log position read up to, costs_only, grid replaced since last read]
+        self.subscribers = {}
+        self.next_subscriber = 0
+        self.log = []
+        self.log_base = 0
+        self.replace(grid, height, width)
+
+    def replace(self, grid, height, width):
+        """Installs a whole new grid (one scan); subscribers are told through changes() returning None"""
+        self.grid = grid
+        self.height = height
+        self.width = width
+        self.start = None
+        self.goal = None
+        self.obstacle_count = 0
+        self.path_cells = set()
+        for i, row in enumerate(grid[:height]):
+            row = row[:width]
+            self.obstacle_count += row.count("X")
+            if "S" in row:
+                self.start = (i, row.index("S"))
+            if "G" in row:
+                self.goal = (i, row.index("G"))
+            if "P" in row:
+                self.path_cells.update((i, j) for j, value in enumerate(row) if value == "P")
+
+        self.log_base += len(self.log)
+        self.log = []
+        for state in self.subscribers.values():
+            state[0] = self.log_base
+            state[2] = True
+
+    # --- Edits ---
+
+    def set_cell(self, row, col, value):
+        """
+        Sets one cell. There is only one start and one goal: placing "S" or "G"
+        turns the previous one back into open ground ("O").
+        """
+        if value == "S" and self.start not in (None, (row, col)):
+            self.set_cell(*self.start, "O")
+        elif value == "G" and self.goal not in (None, (row, col)):
+            self.set_cell(*self.goal, "O")
+
+        old = self.grid[row][col]
+        if old == value:
+            return
+        position = (row, col)
+        if old == "S" and self.start == position:
+            self.start = None
+        elif old == "G" and self.goal == position:
+            self.goal = None
+        elif old == "X":
+            self.obstacle_count -= 1
+        elif old == "P":
+            self.path_cells.discard(position)
+
+        self.grid[row][col] = value
+        if value == "S":
+            self.start = position
+        elif value == "G":
+            self.goal = position
+        elif value == "X":
+            self.obstacle_count += 1
+        elif value == "P":
+            self.path_cells.add(position)
+
+        if self.subscribers:
+            self.log.append((row, col, cell_cost(old) != cell_cost(value)))
+
+    def set_start(self, position):
+        """Moves the start to position, or removes it when position is None"""
+        if position is None:
+            if self.start is not None:
+                self.set_cell(*self.start, "O")
+        else:
+            self.set_cell(*position, "S")
+
+    def set_goal(self, position):
+        """Moves the goal to position, or removes it when position is None"""
+        if position is None:
+            if self.goal is not None:
+                self.set_cell(*self.goal, "O")
+        else:
+            self.set_cell(*position, "G")
+
+    def mark_path(self, cells):
+        """Marks the open ("O") cells among cells as path; terrain, start and goal keep their value"""
+        grid = self.grid
+        for row, col in cells:
+            if grid[row][col] == "O":
+                self.set_cell(row, col, "P")
+
+    def clear_path(self):
+        """Turns every path cell back into open ground"""
+        for row, col in list(self.path_cells):
+            self.set_cell(row, col, "O")
+
+    # --- Change log ---
+
+    def subscribe(self, costs_only=False):
+        """Registers a change log reader and returns its id; it sees the changes made from now on"""
+        subscriber = self.next_subscriber
+        self.next_subscriber += 1
+        self.subscribers[subscriber] = [self.log_base + len(self.log), costs_only, False]
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        del self.subscribers[subscriber]
+        self.trim()
+
+    def changes(self, subscriber):
+        """
+        The (row, col) cells changed since this subscriber's last call, each once and in
+        the order first changed, or None if the whole grid was replaced in the meantime
+        """
+        state = self.subscribers[subscriber]
+        end = self.log_base + len(self.log)
+        if state[2]:
+            state[0] = end
+            state[2] = False
+            return None
+        entries = self.log[state[0] - self.log_base:]
+        state[0] = end
+        costs_only = state[1]
+        cells = list(dict.fromkeys((row, col) for row, col, cost_changed in entries if cost_changed or not costs_only))
+        self.trim()
+        return cells
+
+    def trim(self):
+        """Drops the log entries every subscriber has read"""
+        oldest = min((state[0] for state in self.subscribers.values()), default=self.log_base + len(self.log))
+        if oldest > self.log_base:
+            del self.log[:oldest - self.log_base]
+            self.log_base = oldest
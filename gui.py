@@ -4,9 +4,33 @@
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import simpledialog
+from tkinter import filedialog
 import heapq
-import time
-from pathfinding import PathfindingAlgorithms
+import threading
+from array import array
+from pathfinding import PathfindingAlgorithms, SearchEvents
+from incremental import DStarLite
+from connectivity import ComponentIndex
+from multiagent import MultiAgentPlanner
+from flow_field import FlowFieldCache
+from grid_model import GridModel
+import map_files
+
+# VisualGridEnv.overlay value when every cell was painted over (the flow field heatmap)
+ALL_CELLS = "all"
+
+# Largest grid side the resize dialog accepts, and the largest canvas the grid is fitted into
+MAX_GRID_SIZE = 2000
+MAX_CANVAS_SIZE = 800
+# File types offered by the Save Map / Load Map dialogs (see map_files)
+MAP_FILE_TYPES = [("All maps", "*.grid *.map *.pgm *.png"), ("Native grid", "*.grid"), ("movingai map", "*.map"),
+                  ("PGM image", "*.pgm"), ("PNG image", "*.png")]
+# (agent, start/goal marker) colours, cycled through as agents are added
+AGENT_COLORS = [("red", "#ffb3b3"), ("purple", "#e0b3ff"), ("darkorange", "#ffd9a6"), ("deeppink", "#ffc2e0"),
+                ("teal", "#a6e6e6"), ("saddlebrown", "#e6cbb3"), ("navy", "#b3b3ff"), ("olive", "#e6e6a6")]
+# Flow field heatmap: colours from near the goal (yellow) to farthest (dark red)
+HEATMAP_COLORS = [f"#ff{int(255 * (1 - level / 63)):02x}00" if level < 32 else
+                  f"#{int(255 - 155 * (level - 32) / 31):02x}{int(255 * (1 - level / 63)):02x}00" for level in range(64)]
 
 '''
 Grid-based Pathfinding Visualiser
@@ -53,8 +77,8 @@ class GridSizeDialog(simpledialog.Dialog):
             height = int(self.height_entry.get())
 
             # Ensures dimensions are within allowed range
-            if width < 1 or width > 10 or height < 1 or height > 10: 
-                messagebox.showerror("Invalid Input", "Grid dimensions must be between 1 and 10.")
+            if width < 1 or width > MAX_GRID_SIZE or height < 1 or height > MAX_GRID_SIZE: 
+                messagebox.showerror("Invalid Input", f"Grid dimensions must be between 1 and {MAX_GRID_SIZE}.")
                 return False
 
             self.result = (width, height)
@@ -63,6 +87,269 @@ class GridSizeDialog(simpledialog.Dialog):
             messagebox.showerror("Invalid Input", "Please enter valid numbers.")
             return False
 
+class GridRenderer:
+    """
+    Draws the grid as a single PhotoImage instead of one canvas rectangle per cell.
+
+    The last colour drawn for every cell is remembered, so paint() only writes to
+    the image when a cell's colour actually changes. Clicks are handled by one
+    canvas binding that maps the pixel position back to a (row, col).
+    """
+    def __init__(self, parent, grid_width, grid_height, cell_size, on_click):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.cell_size = cell_size
+        self.on_click = on_click
+
+        image_width = grid_width * cell_size
+        image_height = grid_height * cell_size
+
+        self.canvas = tk.Canvas(
+            parent,
+            width=min(image_width, MAX_CANVAS_SIZE),
+            height=min(image_height, MAX_CANVAS_SIZE),
+            scrollregion=(0, 0, image_width, image_height),
+            bg="white",
+            highlightthickness=0
+        )
+        self.canvas.grid(row=0, column=0)
+
+        # Grids larger than the canvas are scrolled rather than shrunk below one pixel per cell
+        if image_width > MAX_CANVAS_SIZE:
+            x_scroll = tk.Scrollbar(parent, orient="horizontal", command=self.canvas.xview)
+            x_scroll.grid(row=1, column=0, sticky="ew")
+            self.canvas.config(xscrollcommand=x_scroll.set)
+        if image_height > MAX_CANVAS_SIZE:
+            y_scroll = tk.Scrollbar(parent, orient="vertical", command=self.canvas.yview)
+            y_scroll.grid(row=0, column=1, sticky="ns")
+            self.canvas.config(yscrollcommand=y_scroll.set)
+
+        self.image = tk.PhotoImage(width=image_width, height=image_height)
+        self.canvas.create_image(0, 0, anchor="nw", image=self.image)
+
+        # Cell outlines are only worth drawing while cells are big enough to see them
+        if cell_size >= 8:
+            for i in range(grid_height + 1):
+                self.canvas.create_line(0, i * cell_size, image_width, i * cell_size, fill="gray")
+            for j in range(grid_width + 1):
+                self.canvas.create_line(j * cell_size, 0, j * cell_size, image_height, fill="gray")
+
+        self.colors = [[None] * grid_width for _ in range(grid_height)]
+        self.canvas.bind("<Button-1>", self.clicked)
+
+    def draw_all(self, color_rows):
+        """Draws every cell in one pass, one image write per grid row"""
+        size = self.cell_size
+        width = self.grid_width * size
+        for i, colors in enumerate(color_rows):
+            # A single pixel row is tiled down the whole height of the grid row
+            pixels = " ".join(color for color in colors for _ in range(size))
+            self.image.put("{" + pixels + "}", to=(0, i * size, width, (i + 1) * size))
+            self.colors[i] = list(colors)
+
+    def paint(self, row, col, color):
+        """Fills one cell, skipping the write when it already has that colour"""
+        if self.colors[row][col] == color:
+            return
+        self.colors[row][col] = color
+        size = self.cell_size
+        x1 = col * size
+        y1 = row * size
+        self.image.put(color, to=(x1, y1, x1 + size, y1 + size))
+
+    def clicked(self, event):
+        # Converts window coordinates to image coordinates so scrolled grids map correctly
+        col = int(self.canvas.canvasx(event.x)) // self.cell_size
+        row = int(self.canvas.canvasy(event.y)) // self.cell_size
+        if 0 <= row < self.grid_height and 0 <= col < self.grid_width:
+            self.on_click(row, col)
+
+class ExplorationPlayback:
+    """
+    Replays a finished search on the grid renderer through root.after.
+
+    The search runs first at full speed and records the cells it explored in
+    `order`, packed as row * width + col. Each frame paints the next
+    `cells_per_frame` of those cells and then the path cells, and nothing here
+    sleeps, so the Tk event loop keeps running. The position can be paused or
+    moved with seek().
+    """
+    def __init__(self, env, order, path, on_finish):
+        self.env = env
+        self.order = order
+        self.path = path
+        self.on_finish = on_finish
+        self.position = 0
+        self.total = len(order) + len(path)
+        self.paused = False
+        self.finished = False
+        self.after_id = None
+
+    def cell_at(self, step):
+        """Returns the (row, col) and play colour of a playback step"""
+        if step < len(self.order):
+            row, col = divmod(self.order[step], self.env.grid_width)
+            return row, col, "lightblue"
+        row, col = self.path[step - len(self.order)]
+        return row, col, "blue"
+
+    def base_color(self, row, col):
+        # Path cells are redrawn by the playback, so they are shown as open ground underneath
+        value = self.env.grid[row][col]
+        return self.env.cell_color("O" if value == "P" else value)
+
+    def start(self):
+        self.schedule()
+
+    def schedule(self):
+        self.after_id = None
+        if not self.paused and not self.finished:
+            self.after_id = self.env.root.after(max(1, 1000 // self.env.playback_fps.get()), self.frame)
+
+    def frame(self):
+        self.after_id = None
+        self.advance(min(self.total, self.position + self.env.playback_speed.get()))
+        if self.position >= self.total:
+            self.finish()
+        else:
+            self.schedule()
+
+    def advance(self, target):
+        """Paints every step from the current position up to target"""
+        paint = self.env.renderer.paint
+        grid = self.env.grid
+        for step in range(self.position, target):
+            row, col, color = self.cell_at(step)
+            # Start and goal keep their own colours
+            if grid[row][col] not in ["S", "G"]:
+                paint(row, col, color)
+        self.position = target
+        self.env.playback_position.set(target)
+
+    def rewind(self, target):
+        """Moves back to target, restoring what each affected cell looked like at that step"""
+        affected = {}
+        for step in range(target, self.position):
+            row, col, _ = self.cell_at(step)
+            affected[(row, col)] = self.base_color(row, col)
+        for step in range(target):
+            row, col, color = self.cell_at(step)
+            if (row, col) in affected:
+                affected[(row, col)] = color
+
+        paint = self.env.renderer.paint
+        grid = self.env.grid
+        for (row, col), color in affected.items():
+            if grid[row][col] not in ["S", "G"]:
+                paint(row, col, color)
+        self.position = target
+        self.env.playback_position.set(target)
+
+    def seek(self, target):
+        target = max(0, min(self.total, target))
+        if target > self.position:
+            self.advance(target)
+        elif target < self.position:
+            self.rewind(target)
+        if self.position >= self.total and not self.finished:
+            self.finish()
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+        if self.paused:
+            self.cancel()
+        else:
+            self.schedule()
+        return self.paused
+
+    def cancel(self):
+        if self.after_id is not None:
+            self.env.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def finish(self):
+        self.cancel()
+        self.finished = True
+        self.on_finish()
+
+class AgentPlayback:
+    """
+    Animates multi-agent paths on the grid renderer through root.after.
+
+    Each frame moves every agent one time step (agents that have arrived wait
+    at their goal). It has the same pause, seek and cancel controls as
+    ExplorationPlayback, with the position counted in time steps.
+    """
+    def __init__(self, env, paths, colors, on_finish):
+        self.env = env
+        self.paths = paths
+        self.colors = colors
+        self.on_finish = on_finish
+        self.position = 0
+        self.total = max((len(path) - 1 for path in paths), default=0)
+        self.paused = False
+        self.finished = False
+        self.after_id = None
+        # Cells currently showing an agent
+        self.drawn = set()
+
+    def start(self):
+        self.show(0)
+        self.schedule()
+
+    def schedule(self):
+        self.after_id = None
+        if not self.paused and not self.finished:
+            self.after_id = self.env.root.after(max(1, 1000 // self.env.playback_fps.get()), self.frame)
+
+    def frame(self):
+        self.after_id = None
+        self.show(min(self.total, self.position + 1))
+        if self.position >= self.total:
+            self.finish()
+        else:
+            self.schedule()
+
+    def show(self, step):
+        """Draws every agent where it is at a time step"""
+        occupied = {}
+        for path, color in zip(self.paths, self.colors):
+            occupied[path[min(step, len(path) - 1)]] = color
+
+        paint = self.env.renderer.paint
+        for row, col in self.drawn - occupied.keys():
+            paint(row, col, self.env.display_color(row, col))
+        for (row, col), color in occupied.items():
+            paint(row, col, color)
+        self.drawn = set(occupied)
+        self.position = step
+        self.env.playback_position.set(step)
+
+    def seek(self, target):
+        target = max(0, min(self.total, target))
+        if target != self.position:
+            self.show(target)
+        if self.position >= self.total and not self.finished:
+            self.finish()
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+        if self.paused:
+            self.cancel()
+        else:
+            self.schedule()
+        return self.paused
+
+    def cancel(self):
+        if self.after_id is not None:
+            self.env.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def finish(self):
+        self.cancel()
+        self.finished = True
+        self.on_finish()
+
 class VisualGridEnv:
     '''
     Main class for pathfinding visualisation environment.
@@ -80,16 +367,45 @@ class VisualGridEnv:
         self.grid_width = grid_width
         self.grid_height = grid_height
         self.cell_size = cell_size
+        # Cell size for small grids; create_grid shrinks cells to fit larger ones on screen
+        self.max_cell_size = cell_size
         
         # Create a 2D grid filled with "O" (open space)
         self.grid = [["O" for _ in range(self.grid_width)] for _ in range(self.grid_height)]
 
+        # Tracks start, goal, obstacles and path cells as the grid is edited; the renderer
+        # and the planner read its change log instead of rescanning the grid
+        self.model = GridModel(self.grid, self.grid_height, self.grid_width)
+        self.render_log = self.model.subscribe()
+        self.planner_log = self.model.subscribe(costs_only=True)
+
         # Bool for checking if the simulation is currently running (To prevent grid editing during simulation)
         self.simulation_running = False
 
         # Imports pathfinding algorithms from pathfinding.py file (Separated for cleaner/modular code)
         self.pathfinding = PathfindingAlgorithms(self.grid, self.grid_height, self.grid_width)
 
+        # Component labels, updated as cells are toggled, so disconnected start/goal pairs skip the search
+        self.components = ComponentIndex(self.pathfinding)
+        self.pathfinding.use_components(self.components)
+
+        # D* Lite planner kept between runs so obstacle edits only trigger a repair
+        self.incremental_planner = None
+
+        # Multi-agent planner; agents are [start, goal] pairs placed in "Add Agents" mode
+        self.multi_agent_planner = MultiAgentPlanner(self.pathfinding)
+        self.agents = []
+        # Cells holding an agent's start or goal, mapped to the marker colour
+        self.agent_markers = {}
+
+        # Flow fields of recent goals, dropped automatically when the grid changes
+        self.flow_fields = FlowFieldCache(self.pathfinding, capacity=4)
+
+        # Search replay, driven by root.after so searches never block the window
+        self.playback = None
+        # Cells painted over the grid by the last replay, or ALL_CELLS for the heatmap (see clear_overlay)
+        self.overlay = None
+
         # Creates main window + buttons
         self.root = tk.Tk()
         self.root.title("Grid Environment Simulator")
@@ -107,7 +423,16 @@ class VisualGridEnv:
         self.sim_btn = tk.Button(self.menu_frame, text="Run Simulation", command=self.run_simulation)
         self.sim_btn.grid(row=0, column=2, padx=5)
 
-        self.canvas_cells = []
+        self.save_btn = tk.Button(self.menu_frame, text="Save Map", command=self.save_map)
+        self.save_btn.grid(row=0, column=3, padx=5)
+
+        self.load_btn = tk.Button(self.menu_frame, text="Load Map", command=self.load_map)
+        self.load_btn.grid(row=0, column=4, padx=5)
+
+        self.playback_fps = tk.IntVar(value=30)
+        self.playback_speed = tk.IntVar(value=1)
+        self.playback_position = tk.IntVar(value=0)
+
         self.create_grid()
 
         self.root.mainloop()
@@ -118,57 +443,80 @@ class VisualGridEnv:
         for widget in self.grid_frame.winfo_children():
             widget.destroy()
 
-        self.canvas_cells = []
-
-        self.canvas = tk.Canvas(
-            self.grid_frame, 
-            width=self.grid_width * self.cell_size,
-            height=self.grid_height * self.cell_size,
-            bg="white"
-        )
-        self.canvas.pack()
+        # Agent positions and overlays belong to the previous grid
+        self.agents = []
+        self.agent_markers = {}
+        self.overlay = None
 
-        for i in range(self.grid_height):
-            row_cells = []
-            for j in range(self.grid_width):
+        # Shrinks cells so large grids still fit on screen (never below one pixel per cell)
+        self.cell_size = max(1, min(self.max_cell_size, MAX_CANVAS_SIZE // max(self.grid_width, self.grid_height)))
 
-                x1 = j * self.cell_size
-                y1 = i * self.cell_size
-                x2 = x1 + self.cell_size
-                y2 = y1 + self.cell_size
+        self.renderer = GridRenderer(self.grid_frame, self.grid_width, self.grid_height, self.cell_size, self.cell_clicked)
+        self.canvas = self.renderer.canvas
+        self.renderer.draw_all([[self.cell_color(value) for value in row] for row in self.grid])
 
-                fill_color = "white" if self.grid[i][j] == "O" else "black"
-                cell = self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill_color, outline="gray")
-                self.canvas.tag_bind(cell, "<Button-1>", lambda event, row=i, col=j: self.cell_clicked(row, col))
-                row_cells.append(cell)
-            self.canvas_cells.append(row_cells)
+    def update_grid_display(self, cells=None):
+        """
+        Sets grid colours based on what each grid holds (see cell_color)
 
-    def update_grid_display(self):
+        Only cells whose colour changed are redrawn. Passing the edited cells
+        skips checking the rest of the grid.
+        """
+        paint = self.renderer.paint
+        if cells is None:
+            markers = self.agent_markers
+            for i in range(self.grid_height):
+                row = self.grid[i]
+                for j in range(self.grid_width):
+                    paint(i, j, markers.get((i, j)) or self.cell_color(row[j]))
+        else:
+            for i, j in cells:
+                paint(i, j, self.display_color(i, j))
+
+    def apply_changes(self):
+        """Hands the cells changed in the model to the planner and redraws them"""
+        cells = self.model.changes(self.planner_log)
+        if cells is None:
+            self.pathfinding.update_grid_reference(self.grid, self.grid_height, self.grid_width)
+        elif cells:
+            self.pathfinding.update_cells(cells)
+
+        cells = self.model.changes(self.render_log)
+        if cells is None:
+            self.create_grid()
+        elif cells:
+            self.update_grid_display(cells)
+
+    def display_color(self, row, col):
+        """Colour of a cell, with agent start/goal markers drawn over the grid value"""
+        return self.agent_markers.get((row, col)) or self.cell_color(self.grid[row][col])
+
+    def cell_color(self, value):
         """ 
-        Sets grid colours based on what each grid holds
+        Returns the colour for a grid value
 
         Open space: White
         Obstacle: Black
         Start: Green
         Goal: Yellow
         Path: Blue     
+        Terrain (2-9): Light to dark brown, darker is more costly
         """
-        for i in range(self.grid_height):
-            for j in range(self.grid_width):
-                if self.grid[i][j] == "O":
-                    fill_color = "white"
-                elif self.grid[i][j] == "X":
-                    fill_color = "black"
-                elif self.grid[i][j] == "S":
-                    fill_color = "green"
-                elif self.grid[i][j] == "G":
-                    fill_color = "yellow"
-                elif self.grid[i][j] == "P":  
-                    fill_color = "blue"
-                else:
-                    fill_color = "white"
-
-                self.canvas.itemconfig(self.canvas_cells[i][j], fill=fill_color)
+        if value == "O":
+            return "white"
+        elif value == "X":
+            return "black"
+        elif value == "S":
+            return "green"
+        elif value == "G":
+            return "yellow"
+        elif value == "P":  
+            return "blue"
+        elif value.isdigit():
+            shade = (int(value) - 1) / 8
+            red, green, blue = (int(240 - 120 * shade), int(220 - 150 * shade), int(180 - 160 * shade))
+            return f"#{red:02x}{green:02x}{blue:02x}"
+        return "white"
 
     # --- User Interaction Handlers ---
 
@@ -182,30 +530,45 @@ class VisualGridEnv:
             return
         if hasattr(self, 'placement_mode'):
             mode = self.placement_mode.get()
+            model = self.model
+            value = self.grid[row][col]
 
             if mode == "obstacle":
-                if self.grid[row][col] not in ["S", "G"]:
-                    self.grid[row][col] = "X" if self.grid[row][col] == "O" else "O"
+                if value not in ["S", "G"] and (row, col) not in self.agent_markers:
+                    model.set_cell(row, col, "X" if value == "O" else "O")
 
             elif mode == "start":
-                for i in range(self.grid_height):
-                    for j in range(self.grid_width):
-                        if self.grid[i][j] == "S":
-                            self.grid[i][j] = "O"
+                model.set_start(None)
                 # Will not allow editing of squares other than current mode square and empty squares
-                if self.grid[row][col] != "X" and self.grid[row][col] != "G":
-                    self.grid[row][col] = "S"
+                if value != "X" and value != "G":
+                    model.set_start((row, col))
 
             elif mode == "goal":
-                for i in range(self.grid_height):
-                    for j in range(self.grid_width):
-                        if self.grid[i][j] == "G":
-                            self.grid[i][j] = "O"
+                model.set_goal(None)
                 # Will not allow editing of squares other than current mode square and empty squares
-                if self.grid[row][col] != "X" and self.grid[row][col] != "S":
-                    self.grid[row][col] = "G"
-
-        self.update_grid_display()
+                if value != "X" and value != "S":
+                    model.set_goal((row, col))
+
+            elif mode == "terrain":
+                # Cycles open ground through increasingly costly terrain
+                if value not in ["S", "G", "X"]:
+                    model.set_cell(row, col, {"O": "3", "3": "6", "6": "9"}.get(value, "O"))
+
+            elif mode == "agent":
+                # Clicks alternate between a new agent's start and its goal; cells hold one marker each
+                if value not in ["S", "G", "X"] and (row, col) not in self.agent_markers:
+                    if self.agents and self.agents[-1][1] is None:
+                        agent = self.agents[-1]
+                        agent[1] = (row, col)
+                    else:
+                        agent = [(row, col), None]
+                        self.agents.append(agent)
+                    self.agent_markers[(row, col)] = AGENT_COLORS[(len(self.agents) - 1) % len(AGENT_COLORS)][1]
+                    # Markers are drawn over the grid and are not part of the model
+                    self.update_grid_display([(row, col)])
+
+        # The planner and the renderer only get the cells this click changed
+        self.apply_changes()
 
     def update_placement_mode(self):
         """Updates placement mode based on radio button in run_simulation method"""
@@ -219,12 +582,32 @@ class VisualGridEnv:
         elif mode == "obstacle":
             self.canvas.config(cursor="cross black")
             self.current_mode = "toggle"  
+        elif mode == "terrain":
+            self.canvas.config(cursor="cross brown")
+            self.current_mode = "toggle"
+        elif mode == "agent":
+            self.canvas.config(cursor="cross red")
+            self.current_mode = "view"
         else:
             self.canvas.config(cursor="")
             self.current_mode = "view"
 
+    def update_movement_mode(self):
+        """Updates the planner's movement model based on radio button in run_simulation method"""
+        mode = self.movement_mode.get()
+        if mode == "8":
+            self.pathfinding.set_movement(8, corner_cutting=False)
+        elif mode == "8-cut":
+            self.pathfinding.set_movement(8, corner_cutting=True)
+        else:
+            self.pathfinding.set_movement(4)
+
     def resize_grid(self):
         """Resizes grid"""
+        # The planner's buffers and the renderer are replaced, so wait for any search or replay
+        if self.simulation_running:
+            return
+        self.stop_playback()
         try:
             dialog = GridSizeDialog(
                 self.root, 
@@ -245,18 +628,52 @@ class VisualGridEnv:
                 self.grid_height = new_height
                 self.grid = new_grid
 
-                self.pathfinding.update_grid_reference(self.grid, self.grid_height, self.grid_width)
-
-                self.create_grid()
+                # Rebuilds the planner's buffers and the renderer (see apply_changes)
+                self.model.replace(self.grid, self.grid_height, self.grid_width)
+                self.apply_changes()
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to resize grid: {str(e)}")
 
+    def save_map(self):
+        """Saves the grid as a movingai .map, PGM/PNG image or native .grid file"""
+        path = filedialog.asksaveasfilename(parent=self.root, title="Save Map", defaultextension=".grid", filetypes=MAP_FILE_TYPES)
+        if not path:
+            return
+        try:
+            map_files.save_map(path, self.pathfinding.cells, self.grid_height, self.grid_width)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save map: {str(e)}")
+
+    def load_map(self):
+        """Replaces the grid with one read from a map file (see map_files)"""
+        if self.simulation_running:
+            return
+        path = filedialog.askopenfilename(parent=self.root, title="Load Map", filetypes=MAP_FILE_TYPES)
+        if not path:
+            return
+        self.stop_playback()
+        try:
+            cells, height, width = map_files.load_map(path)
+            if height > MAX_GRID_SIZE or width > MAX_GRID_SIZE:
+                messagebox.showerror("Error", f"Map is {width}x{height}; the editor supports up to {MAX_GRID_SIZE}x{MAX_GRID_SIZE}.")
+                return
+
+            self.grid_width = width
+            self.grid_height = height
+            self.grid = map_files.cells_to_grid(cells, height, width)
+
+            self.model.replace(self.grid, self.grid_height, self.grid_width)
+            self.apply_changes()
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load map: {str(e)}")
+
     def run_simulation(self):
         # Creates New Window for Simulation Options
         sim_window = tk.Toplevel(self.root)
         sim_window.title("Simulation")
-        sim_window.geometry("400x300")  
+        sim_window.geometry("560x520")  
 
         main_window_x = self.root.winfo_x()
         main_window_width = self.root.winfo_width()
@@ -278,6 +695,10 @@ class VisualGridEnv:
                     value="goal", command=self.update_placement_mode).grid(row=0, column=2, padx=5)
         tk.Radiobutton(mode_frame, text="Set Obstacles", variable=self.placement_mode, 
                     value="obstacle", command=self.update_placement_mode).grid(row=0, column=3, padx=5)
+        tk.Radiobutton(mode_frame, text="Set Terrain", variable=self.placement_mode, 
+                    value="terrain", command=self.update_placement_mode).grid(row=1, column=0, columnspan=2)
+        tk.Radiobutton(mode_frame, text="Add Agents", variable=self.placement_mode, 
+                    value="agent", command=self.update_placement_mode).grid(row=1, column=2, columnspan=2)
 
         # Pathfinding algorithm selection buttons
         alg_frame = tk.Frame(sim_window)
@@ -287,6 +708,29 @@ class VisualGridEnv:
         tk.Button(alg_frame, text="BFS", command=self.BFS).grid(row=0, column=1, padx=5, pady=5)
         tk.Button(alg_frame, text="Dijkstra", command=self.dijkstra).grid(row=0, column=2, padx=5, pady=5)
         tk.Button(alg_frame, text="DFS", command=self.DFS).grid(row=0, column=3, padx=5, pady=5)
+        tk.Button(alg_frame, text="JPS", command=self.JPS).grid(row=0, column=4, padx=5, pady=5)
+        tk.Button(alg_frame, text="D* Lite", command=self.d_star_lite).grid(row=0, column=5, padx=5, pady=5)
+        tk.Button(alg_frame, text="Theta*", command=self.theta_star).grid(row=0, column=6, padx=5, pady=5)
+
+        # Multi-agent planners, run on the agents placed in "Add Agents" mode
+        tk.Button(alg_frame, text="Cooperative A*", command=self.cooperative_a_star).grid(row=1, column=0, columnspan=2, padx=5, pady=5)
+        tk.Button(alg_frame, text="CBS", command=self.cbs).grid(row=1, column=2, padx=5, pady=5)
+        tk.Button(alg_frame, text="Clear Agents", command=self.clear_agents).grid(row=1, column=3, columnspan=2, padx=5, pady=5)
+        tk.Button(alg_frame, text="Flow Field", command=self.show_flow_field).grid(row=1, column=5, columnspan=2, padx=5, pady=5)
+
+        # Radio buttons for the movement model used by A*/Dijkstra
+        move_frame = tk.Frame(sim_window)
+        move_frame.pack(pady=5)
+
+        self.movement_mode = tk.StringVar(value="4")
+
+        tk.Label(move_frame, text="Movement:").grid(row=0, column=0, padx=5)
+        tk.Radiobutton(move_frame, text="4-way", variable=self.movement_mode, 
+                    value="4", command=self.update_movement_mode).grid(row=0, column=1, padx=5)
+        tk.Radiobutton(move_frame, text="8-way", variable=self.movement_mode, 
+                    value="8", command=self.update_movement_mode).grid(row=0, column=2, padx=5)
+        tk.Radiobutton(move_frame, text="8-way + Corner Cutting", variable=self.movement_mode, 
+                    value="8-cut", command=self.update_movement_mode).grid(row=0, column=3, padx=5)
 
         vis_frame = tk.Frame(sim_window)
         vis_frame.pack(pady=5)
@@ -300,6 +744,20 @@ class VisualGridEnv:
         tk.Radiobutton(vis_frame, text="Show Exploration", variable=self.visualization_mode, 
                     value="exploration").grid(row=0, column=2, padx=5)
 
+        # Playback controls for the recorded search
+        play_frame = tk.Frame(sim_window)
+        play_frame.pack(pady=5)
+
+        self.pause_btn = tk.Button(play_frame, text="Pause", width=6, command=self.toggle_playback)
+        self.pause_btn.grid(row=0, column=0, rowspan=2, padx=5)
+        tk.Scale(play_frame, label="FPS", variable=self.playback_fps, from_=1, to=60, 
+                    orient="horizontal", length=120).grid(row=0, column=1, padx=5)
+        tk.Scale(play_frame, label="Cells per frame", variable=self.playback_speed, from_=1, to=1000, 
+                    orient="horizontal", length=120).grid(row=0, column=2, padx=5)
+        self.seek_scale = tk.Scale(play_frame, label="Position", variable=self.playback_position, from_=0, to=0, 
+                    orient="horizontal", length=250, command=self.seek_playback)
+        self.seek_scale.grid(row=1, column=1, columnspan=2, padx=5)
+
         tk.Label(sim_window, text="Click on grid to set positions", font=("Arial", 12)).pack(pady=10)
 
         tk.Button(sim_window, text="Clear Path", command=self.clear_path).pack(pady=5)
@@ -330,14 +788,8 @@ class VisualGridEnv:
                 y = int(y_entry.get())
 
                 if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
-
-                    for i in range(self.grid_height):
-                        for j in range(self.grid_width):
-                            if self.grid[i][j] == "S":
-                                self.grid[i][j] = "O"
-
-                    self.grid[y][x] = "S"
-                    self.update_grid_display()  
+                    self.model.set_start((y, x))
+                    self.apply_changes()
                     start_dialog.destroy()
                 else:
                     messagebox.showerror("Invalid Coordinates", 
@@ -370,14 +822,8 @@ class VisualGridEnv:
                 y = int(y_entry.get())
 
                 if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
-
-                    for i in range(self.grid_height):
-                        for j in range(self.grid_width):
-                            if self.grid[i][j] == "G":
-                                self.grid[i][j] = "O"
-
-                    self.grid[y][x] = "G"
-                    self.update_grid_display()  
+                    self.model.set_goal((y, x))
+                    self.apply_changes()
                     goal_dialog.destroy()
                 else:
                     messagebox.showerror("Invalid Coordinates", 
@@ -389,119 +835,279 @@ class VisualGridEnv:
 
     def find_start_and_goal(self):
         """Verifies and locates start+goal positions on the grid"""
-        if not self.check_grid("S") or not self.check_grid("G"):
+        start, goal = self.model.start, self.model.goal
+        if start is None or goal is None:
             messagebox.showwarning("Missing Points", "Please set both start and goal positions.")
             return None, None
-
-        start = None
-        goal = None
-        for i in range(self.grid_height):
-            for j in range(self.grid_width):
-                if self.grid[i][j] == "S":
-                    start = (i, j)
-                elif self.grid[i][j] == "G":
-                    goal = (i, j)
-
         return start, goal
 
-    def check_grid(self, check):
-        for row in self.grid:
-            if check in row:
-                return True
-        return False
-
 # --- Path Management ---
     def clear_path(self):
-        # Clears generated path (Blue path)
-        for i in range(self.grid_height):
-            for j in range(self.grid_width):
-                if self.grid[i][j] not in ["S", "G", "X"]:  
-                    self.grid[i][j] = "O"  
-        self.update_grid_display()
-
-    def reconstruct_path(self, came_from, start, goal, algorithm_name="Pathfinding"):
-        # Method for creating the generated path
-        if goal not in came_from:
-            messagebox.showinfo(algorithm_name, "No path found!")
+        # Clears generated path (Blue path) and any replay or heatmap overlay; terrain cells keep their cost
+        self.model.clear_path()
+        self.apply_changes()
+        self.clear_overlay()
+
+    def clear_overlay(self):
+        """Repaints the cells the last replay or heatmap drew over the grid"""
+        overlay = self.overlay
+        self.overlay = None
+        if overlay is ALL_CELLS:
+            self.update_grid_display()
+        elif overlay is not None:
+            self.update_grid_display(overlay)
+
+    def clear_agents(self):
+        """Removes every agent and its markers"""
+        if self.simulation_running:
             return
+        self.stop_playback()
+        markers = list(self.agent_markers)
+        self.agents = []
+        self.agent_markers = {}
+        self.update_grid_display(markers)
+        self.clear_overlay()
+
+    def run_multi_agent(self, algorithm_name, plan):
+        """
+        Runs plan(agents) in a worker thread, then animates the agents together.
 
-        path = []
-        current = goal
-        while current != start:
-            path.append(current)
-            current = came_from[current]
-
-        for i, j in reversed(path):
-            if self.grid[i][j] not in ["S", "G"]:
-                self.grid[i][j] = "P"
-                self.canvas.itemconfig(self.canvas_cells[i][j], fill="blue")
-                self.root.update()
-                time.sleep(0.1)  
+        plan returns one Path (one cell per time step) or None per agent.
+        """
+        if self.simulation_running:
+            return
+        agents = [(start, goal) for start, goal in self.agents if goal is not None]
+        if not agents:
+            messagebox.showwarning("Missing Agents", "Please add at least one agent (start and goal) in Add Agents mode.")
+            return
 
-        messagebox.showinfo(algorithm_name, "Path found!")
+        self.simulation_running = True
+        self.stop_playback()
+        self.clear_path()
+        result = {}
+
+        def work():
+            result["paths"] = plan(agents)
+
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+
+        def poll():
+            if worker.is_alive():
+                self.root.after(20, poll)
+                return
+            paths = result["paths"]
+            planned = [k for k, path in enumerate(paths) if path is not None]
+            if not planned:
+                self.simulation_running = False
+                messagebox.showinfo(algorithm_name, "No solution found!")
+                return
+            colors = [AGENT_COLORS[k % len(AGENT_COLORS)][0] for k in planned]
+            on_finish = lambda: self.agents_finished(algorithm_name, paths)
+            positions = [paths[k].positions() for k in planned]
+            self.overlay = {cell for path in positions for cell in path}
+            self.start_playback(AgentPlayback(self, positions, colors, on_finish))
+
+        poll()
+
+    def agents_finished(self, algorithm_name, paths):
         self.simulation_running = False
+        failed = sum(path is None for path in paths)
+        total = sum(path.length for path in paths if path is not None)
+        message = f"{len(paths) - failed} agents planned, sum of costs {total}."
+        if failed:
+            message += f"\n{failed} agents could not be planned."
+        messagebox.showinfo(algorithm_name, message)
+
+    def show_flow_field(self):
+        """Computes the goal's flow field in a worker thread and shows its distances as a heatmap"""
+        if self.simulation_running:
+            return
+        goal = self.model.goal
+        if goal is None:
+            messagebox.showwarning("Missing Points", "Please set a goal position.")
+            return
 
-    def visualize_exploration(self, node, is_goal=False):
-        if self.visualization_mode.get() == "exploration":
-            if self.grid[node[0]][node[1]] not in ["S", "G"]:
+        self.simulation_running = True
+        self.stop_playback()
+        self.clear_path()
+        result = {}
 
-                self.canvas.itemconfig(self.canvas_cells[node[0]][node[1]], fill="lightblue")
-                self.root.update()
-                time.sleep(0.1)  
+        def work():
+            result["field"] = self.flow_fields.field(goal)
 
-# --- Pathfinding Algorithms ---
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
 
-    def a_star(self):
+        def poll():
+            if worker.is_alive():
+                self.root.after(20, poll)
+                return
+            self.draw_heatmap(result["field"])
+            self.simulation_running = False
+
+        poll()
+
+    def draw_heatmap(self, field):
+        """
+        Paints each reachable cell by its distance to the goal; unreachable open cells are grey.
+        Start, goal, obstacles and agent markers keep their colours. Clear Path removes the overlay.
+        """
+        distance = field.distance
+        stride = field.stride
+        farthest = max(max(distance), 1)
+        top = len(HEATMAP_COLORS) - 1
+        rows = []
+        for i in range(self.grid_height):
+            base = (i + 1) * stride + 1
+            colors = []
+            for j, cell_distance in enumerate(distance[base:base + self.grid_width]):
+                value = self.grid[i][j]
+                if value in ["S", "G", "X"] or (i, j) in self.agent_markers:
+                    colors.append(self.display_color(i, j))
+                elif cell_distance < 0:
+                    colors.append("gray")
+                else:
+                    colors.append(HEATMAP_COLORS[cell_distance * top // farthest])
+            rows.append(colors)
+        self.renderer.draw_all(rows)
+        self.overlay = ALL_CELLS
+
+    def run_search(self, algorithm_name, search):
+        """
+        Runs search(start, goal, events) in a worker thread, then replays it.
+
+        search returns the path as (row, col) positions from start to goal, or None.
+        The window keeps handling events while the search runs; when it is done
+        the explored cells and path are handed to an ExplorationPlayback.
+        """
         if self.simulation_running:
             return  
         
         self.simulation_running = True
+        self.stop_playback()
         self.clear_path()
         start, goal = self.find_start_and_goal()
         if start is None or goal is None:
+            self.simulation_running = False
             return
-            
-        came_from = self.pathfinding.a_star(start, goal, self.visualize_exploration)
-        self.reconstruct_path(came_from, start, goal, "A*")
 
-    def BFS(self):
-        if self.simulation_running:
-            return  
-        
-        self.simulation_running = True
-        self.clear_path()
-        start, goal = self.find_start_and_goal()
-        if start is None or goal is None:
+        if not self.components.connected(start, goal):
+            self.simulation_running = False
+            messagebox.showinfo(algorithm_name, "No path found!")
             return
-            
-        came_from = self.pathfinding.bfs(start, goal, self.visualize_exploration)
-        self.reconstruct_path(came_from, start, goal, "BFS")
 
-    def dijkstra(self):
-        if self.simulation_running:
-            return  
-        
-        self.simulation_running = True
-        self.clear_path()
-        start, goal = self.find_start_and_goal()
-        if start is None or goal is None:
+        # Explored cells packed as row * width + col; only recorded when exploration is shown
+        order = array("i")
+        events = None
+        if self.visualization_mode.get() == "exploration":
+            width = self.grid_width
+            events = SearchEvents(lambda positions: order.extend(i * width + j for i, j in positions))
+
+        result = {}
+
+        def work():
+            # Only the path cells after start are replayed; Path unpacks them here, off the main thread
+            path = search(start, goal, events)
+            result["path"] = None if path is None else list(path)[1:]
+
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+
+        def poll():
+            if worker.is_alive():
+                self.root.after(20, poll)
+                return
+            path = result.get("path")
+            on_finish = lambda: self.playback_finished(algorithm_name, path)
+            width = self.grid_width
+            self.overlay = [divmod(cell, width) for cell in order]
+            self.start_playback(ExplorationPlayback(self, order, path or [], on_finish))
+
+        poll()
+
+    def start_playback(self, playback):
+        """Starts an ExplorationPlayback or AgentPlayback, hooking it up to the playback controls"""
+        self.playback = playback
+        self.playback_position.set(0)
+        if hasattr(self, 'seek_scale') and self.seek_scale.winfo_exists():
+            self.seek_scale.config(to=self.playback.total)
+        if hasattr(self, 'pause_btn') and self.pause_btn.winfo_exists():
+            self.pause_btn.config(text="Pause")
+        self.playback.start()
+
+    def stop_playback(self):
+        if self.playback is not None:
+            self.playback.cancel()
+            self.playback = None
+
+    def toggle_playback(self):
+        if self.playback is None or self.playback.finished:
             return
-            
-        came_from = self.pathfinding.dijkstra(start, goal, self.visualize_exploration)
-        self.reconstruct_path(came_from, start, goal, "Dijkstra")
+        paused = self.playback.toggle_pause()
+        self.pause_btn.config(text="Resume" if paused else "Pause")
 
-    def DFS(self):
-        if self.simulation_running:
-            return  
-        
-        self.simulation_running = True
-        self.clear_path()
-        start, goal = self.find_start_and_goal()
-        if start is None or goal is None:
+    def seek_playback(self, value):
+        # The scale also moves while playing, which lands on the current position and does nothing
+        if self.playback is not None:
+            self.playback.seek(int(value))
+
+    def playback_finished(self, algorithm_name, path):
+        if path is None:
+            self.simulation_running = False
+            messagebox.showinfo(algorithm_name, "No path found!")
             return
-            
-        came_from = self.pathfinding.dfs(start, goal, self.visualize_exploration)
-        self.reconstruct_path(came_from, start, goal, "DFS")
+
+        # Terrain cells are only drawn as path, so their cost survives clear_path
+        self.model.mark_path(path)
+        self.apply_changes()
+
+        self.simulation_running = False
+        messagebox.showinfo(algorithm_name, "Path found!")
+
+# --- Pathfinding Algorithms ---
+
+    def a_star(self):
+        self.run_search("A*", lambda start, goal, events: self.pathfinding.search("a_star", start, goal, events=events).path())
+
+    def BFS(self):
+        self.run_search("BFS", lambda start, goal, events: self.pathfinding.search("bfs", start, goal, events=events).path())
+
+    def dijkstra(self):
+        self.run_search("Dijkstra", lambda start, goal, events: self.pathfinding.search("dijkstra", start, goal, events=events).path())
+
+    def DFS(self):
+        self.run_search("DFS", lambda start, goal, events: self.pathfinding.search("dfs", start, goal, events=events).path())
+
+    def JPS(self):
+        self.run_search("JPS", lambda start, goal, events: self.pathfinding.search("jump_point_search", start, goal, events=events).path())
+
+    def d_star_lite(self):
+        def search(start, goal, events):
+            # Reuse the previous search unless the goal moved (a moved start is handled incrementally)
+            planner = self.incremental_planner
+            if planner is None or planner.goal != goal:
+                if planner is not None:
+                    planner.close()
+                planner = self.incremental_planner = DStarLite(self.pathfinding, start, goal)
+            elif planner.start != start:
+                planner.set_start(start)
+
+            record = None
+            if events is not None:
+                record = lambda position, is_start=False: events.hook([position])
+            return planner.plan(record)
+
+        self.run_search("D* Lite", search)
+
+    def theta_star(self):
+        self.run_search("Theta*", lambda start, goal, events: self.pathfinding.search("theta_star", start, goal, events=events).path())
+
+    def cooperative_a_star(self):
+        self.run_multi_agent("Cooperative A*", self.multi_agent_planner.cooperative)
+
+    def cbs(self):
+        self.run_multi_agent("CBS", self.multi_agent_planner.cbs)
 
 if __name__ == "__main__":
     app = VisualGridEnv()
\ No newline at end of file
@@ -0,0 +1,424 @@
+'''
+Hierarchical pathfinding (HPA*) for large maps.
+
+The grid is cut into square clusters. Wherever two neighbouring clusters share
+a run of open cells along their common border, an entrance is placed: one
+transition in the middle of a short run, or one at each end of a run of
+LONG_ENTRANCE or more cells. The transition cells are the nodes of a small
+abstract graph. Inside each cluster, every pair of nodes is joined by an edge
+whose cost is their shortest distance within that cluster.
+
+A query connects start and goal to the nodes of their clusters and runs A*
+over the abstract graph. The abstract path is then refined into grid cells by
+short searches, each confined to one cluster. Paths cross cluster borders only
+at transitions, so they can be slightly longer than a flat A* path.
+
+The planner listens to PathfindingAlgorithms the same way DStarLite does.
+update_cells marks the clusters and borders holding the changed cells as
+dirty, and only those are rebuilt before the next query. update_grid_reference
+(e.g. a resize) rebuilds everything.
+
+Usage:
+    planner = HierarchicalPlanner(pathfinding, cluster_size=32)
+    path = planner.plan(start, goal)       # pathfinding.Path with .cost, or None
+    grid[i][j] = "X"
+    pathfinding.update_cells([(i, j)])     # only the cluster around (i, j) is rebuilt
+'''
+import heapq
+import time
+from array import array
+
+from pathfinding import Path, SearchStats
+
+# Runs of open border cells at least this long get a transition at each end instead of one in the middle
+LONG_ENTRANCE = 6
+
+
+class HierarchicalPlanner:
+    """HPA* over a PathfindingAlgorithms grid (4-connected, terrain costs honoured)"""
+    def __init__(self, pathfinding, cluster_size=32):
+        self.pathfinding = pathfinding
+        self.cluster_size = cluster_size
+        # SearchStats of the last abstract search
+        self.stats = None
+        pathfinding.add_listener(self)
+        self.reset()
+
+    def reset(self):
+        """Discards the abstraction; every border and cluster is rebuilt on the next query"""
+        pathfinding = self.pathfinding
+        self.cells = pathfinding.cells
+        self.stride = pathfinding.stride
+        self.offsets = pathfinding.offsets
+        self.grid_height = pathfinding.grid_height
+        self.grid_width = pathfinding.grid_width
+        self.cluster_rows = -(-self.grid_height // self.cluster_size)
+        self.cluster_cols = -(-self.grid_width // self.cluster_size)
+
+        # Transition pairs per border: ("h", ci, cj) lies below cluster (ci, cj), ("v", ci, cj) to its right
+        self.borders = {}
+        # Abstract node -> set of the transition cells it connects to in neighbouring clusters
+        self.partners = {}
+        # Cluster -> {node: [(neighbour node, cost), ...]}: the cluster's nodes and their outgoing
+        # abstract edges, i.e. node-to-node distances inside the cluster plus the border crossings
+        self.edges = {}
+        # The same edges for every node of every cluster, for the abstract search
+        self.adjacency = {}
+
+        self.dirty_borders = set()
+        self.dirty_clusters = set()
+        for ci in range(self.cluster_rows):
+            for cj in range(self.cluster_cols):
+                self.dirty_clusters.add((ci, cj))
+                if ci + 1 < self.cluster_rows:
+                    self.dirty_borders.add(("h", ci, cj))
+                if cj + 1 < self.cluster_cols:
+                    self.dirty_borders.add(("v", ci, cj))
+        self.needs_reset = False
+
+    def close(self):
+        """Stops listening for grid changes"""
+        self.pathfinding.remove_listener(self)
+
+    # --- Grid change notifications (see PathfindingAlgorithms.add_listener) ---
+
+    def update_cells(self, changed_cells):
+        size = self.cluster_size
+        for i, j in changed_cells:
+            ci = i // size
+            cj = j // size
+            self.dirty_clusters.add((ci, cj))
+            # Cells on a cluster's edge also decide the entrances of the border they touch
+            if i % size == 0 and ci > 0:
+                self.mark_border(("h", ci - 1, cj))
+            if i % size == size - 1 and ci + 1 < self.cluster_rows:
+                self.mark_border(("h", ci, cj))
+            if j % size == 0 and cj > 0:
+                self.mark_border(("v", ci, cj - 1))
+            if j % size == size - 1 and cj + 1 < self.cluster_cols:
+                self.mark_border(("v", ci, cj))
+
+    def grid_replaced(self):
+        self.needs_reset = True
+
+    def mark_border(self, border):
+        # The transition cells of a border are nodes of the clusters on both sides
+        kind, ci, cj = border
+        self.dirty_borders.add(border)
+        self.dirty_clusters.add((ci, cj))
+        self.dirty_clusters.add((ci + 1, cj) if kind == "h" else (ci, cj + 1))
+
+    # --- Abstraction ---
+
+    def refresh(self):
+        """Rebuilds the dirty borders, then the edges of the dirty clusters"""
+        if self.needs_reset:
+            self.reset()
+        for border in self.dirty_borders:
+            self.build_border(border)
+        for cluster in self.dirty_clusters:
+            self.build_cluster(cluster)
+        self.dirty_borders = set()
+        self.dirty_clusters = set()
+
+    def build_border(self, border):
+        """Places the transitions along one border between two clusters"""
+        cells = self.cells
+        stride = self.stride
+        size = self.cluster_size
+        partners = self.partners
+
+        for a, b in self.borders.get(border, ()):
+            partners[a].discard(b)
+            partners[b].discard(a)
+
+        kind, ci, cj = border
+        if kind == "h":
+            # Last row of the upper cluster, walked left to right; its partner is the cell below
+            first = cj * size
+            count = min(size, self.grid_width - first)
+            a = ((ci + 1) * size) * stride + first + 1
+            along, across = 1, stride
+        else:
+            # Last column of the left cluster, walked top to bottom; its partner is the cell to the right
+            first = ci * size
+            count = min(size, self.grid_height - first)
+            a = (first + 1) * stride + (cj + 1) * size
+            along, across = stride, 1
+
+        transitions = []
+        run = []
+        # One step past the end closes the final run
+        for k in range(count + 1):
+            if k < count and cells[a] and cells[a + across]:
+                run.append(a)
+            elif run:
+                if len(run) >= LONG_ENTRANCE:
+                    transitions.append((run[0], run[0] + across))
+                    transitions.append((run[-1], run[-1] + across))
+                else:
+                    middle = run[len(run) // 2]
+                    transitions.append((middle, middle + across))
+                run = []
+            a += along
+
+        for a, b in transitions:
+            partners.setdefault(a, set()).add(b)
+            partners.setdefault(b, set()).add(a)
+        self.borders[border] = transitions
+
+    def cluster_nodes(self, cluster):
+        """Transition cells inside a cluster, gathered from its four borders"""
+        ci, cj = cluster
+        borders = self.borders
+        nodes = set()
+        nodes.update(b for a, b in borders.get(("h", ci - 1, cj), ()))
+        nodes.update(a for a, b in borders.get(("h", ci, cj), ()))
+        nodes.update(b for a, b in borders.get(("v", ci, cj - 1), ()))
+        nodes.update(a for a, b in borders.get(("v", ci, cj), ()))
+        return nodes
+
+    def build_cluster(self, cluster):
+        """Recomputes the abstract edges leaving the nodes of one cluster"""
+        cells = self.cells
+        partners = self.partners
+        local_cells, local_stride, to_local, _ = self.cluster_grid(cluster)
+        local_offsets = (-local_stride, 1, local_stride, -1)
+
+        nodes = sorted(self.cluster_nodes(cluster))
+        local_nodes = [to_local(node) for node in nodes]
+        edges = {node: [(partner, cells[partner]) for partner in partners[node]] for node in nodes}
+
+        # The reverse of a path enters its first cell instead of its last, so each pair
+        # of nodes needs only one search: d(b, a) = d(a, b) - cost(b) + cost(a)
+        for k, node in enumerate(nodes[:-1]):
+            distances, _ = _dijkstra(local_cells, local_offsets, local_nodes[k], local_nodes[k + 1:])
+            for other, local_other in zip(nodes[k + 1:], local_nodes[k + 1:]):
+                if local_other in distances:
+                    distance = distances[local_other]
+                    edges[node].append((other, distance))
+                    edges[other].append((node, distance - cells[other] + cells[node]))
+
+        for node in self.edges.get(cluster, ()):
+            del self.adjacency[node]
+        self.adjacency.update(edges)
+        self.edges[cluster] = edges
+
+    def cluster_of(self, index):
+        row, col = divmod(index, self.stride)
+        return ((row - 1) // self.cluster_size, (col - 1) // self.cluster_size)
+
+    def cluster_grid(self, cluster):
+        """
+        Copies a cluster's cells into a padded array of its own, so searches confined
+        to the cluster need no bounds checks (see PathfindingAlgorithms.build_cells)
+
+        Returns:
+            (cells, stride, to_local, to_global): the copy, its row length, and functions
+            converting flat indices of the whole grid to and from indices of the copy
+        """
+        cells = self.cells
+        stride = self.stride
+        size = self.cluster_size
+        ci, cj = cluster
+        top = ci * size + 1
+        left = cj * size + 1
+        height = min(size, self.grid_height - ci * size)
+        width = min(size, self.grid_width - cj * size)
+
+        local_stride = width + 2
+        local_cells = bytearray(local_stride)
+        for row in range(top, top + height):
+            begin = row * stride + left
+            local_cells += b"\x00" + bytes(cells[begin:begin + width]) + b"\x00"
+        local_cells += bytearray(local_stride)
+
+        def to_local(index):
+            row, col = divmod(index, stride)
+            return (row - top + 1) * local_stride + col - left + 1
+
+        def to_global(index):
+            row, col = divmod(index, local_stride)
+            return (row + top - 1) * stride + col + left - 1
+
+        return local_cells, local_stride, to_local, to_global
+
+    def cluster_distances(self, origin, cluster, targets, backward=False):
+        """Distances from origin to the targets it reaches without leaving the cluster (see _dijkstra)"""
+        local_cells, local_stride, to_local, _ = self.cluster_grid(cluster)
+        local_targets = {to_local(target): target for target in targets}
+        distances, _ = _dijkstra(local_cells, (-local_stride, 1, local_stride, -1),
+                                 to_local(origin), local_targets, backward)
+        return {target: distances[index] for index, target in local_targets.items() if index in distances}
+
+    def cluster_path(self, origin, target, cluster):
+        """Shortest path from origin to target inside the cluster, as flat indices after origin"""
+        local_cells, local_stride, to_local, to_global = self.cluster_grid(cluster)
+        local_origin = to_local(origin)
+        current = to_local(target)
+        _, parents = _dijkstra(local_cells, (-local_stride, 1, local_stride, -1), local_origin, (current,))
+        segment = []
+        while current != local_origin:
+            segment.append(to_global(current))
+            current = parents[current]
+        segment.reverse()
+        return segment
+
+    # --- Queries ---
+
+    def plan(self, start, goal):
+        """
+        Near-optimal path from start to goal
+
+        Returns:
+            path: pathfinding.Path from start to goal inclusive (with .cost), or None if unreachable
+        """
+        nodes = self.abstract_path(start, goal)
+        if nodes is None:
+            return None
+        return self.refine(nodes)
+
+    def abstract_path(self, start, goal):
+        """
+        Runs the abstract search, after rebuilding any dirty clusters
+
+        Returns:
+            nodes: flat indices of start, the transitions passed through, and goal; or None
+        """
+        self.refresh()
+        pathfinding = self.pathfinding
+        start_index = pathfinding.to_index(start)
+        goal_index = pathfinding.to_index(goal)
+        if not pathfinding.is_valid_position(start) or not pathfinding.is_valid_position(goal):
+            return None
+
+        # Connect start and goal to the nodes of their own clusters
+        start_cluster = self.cluster_of(start_index)
+        goal_cluster = self.cluster_of(goal_index)
+        start_nodes = self.cluster_nodes(start_cluster)
+        targets = start_nodes | {goal_index} if start_cluster == goal_cluster else start_nodes
+        targets.discard(start_index)
+        start_edges = list(self.cluster_distances(start_index, start_cluster, targets).items())
+
+        goal_nodes = self.cluster_nodes(goal_cluster)
+        goal_nodes.discard(goal_index)
+        goal_edges = self.cluster_distances(goal_index, goal_cluster, goal_nodes, backward=True)
+
+        return self.search_abstract(start_index, goal_index, start_edges, goal_edges)
+
+    def search_abstract(self, start_index, goal_index, start_edges, goal_edges):
+        """
+        A* over the abstract graph, with start_edges leaving start and goal_edges
+        (node -> distance to goal) entering goal. The SearchStats are kept in self.stats.
+        """
+        started_ns = time.perf_counter_ns()
+        cells = self.cells
+        stride = self.stride
+        adjacency = self.adjacency
+        stats = SearchStats("hpa_star", pushes=1, max_frontier=1)
+        goal_row, goal_col = divmod(goal_index, stride)
+
+        def heuristic(index):
+            row, col = divmod(index, stride)
+            return abs(row - goal_row) + abs(col - goal_col)
+
+        g_score = {start_index: 0}
+        came_from = {start_index: None}
+        closed = set()
+        heap = [(heuristic(start_index), start_index)]
+
+        while heap:
+            _, current = heapq.heappop(heap)
+            if current in closed:
+                stats.stale_pops += 1
+                continue
+            closed.add(current)
+            stats.expansions += 1
+            if current == goal_index:
+                break
+
+            if current == start_index:
+                # Crossing into a neighbouring cluster costs the cell entered
+                neighbors = start_edges + [(partner, cells[partner]) for partner in self.partners.get(current, ())]
+            else:
+                neighbors = adjacency[current]
+            if current in goal_edges:
+                neighbors = neighbors + [(goal_index, goal_edges[current])]
+
+            current_g = g_score[current]
+            for neighbor, cost in neighbors:
+                temp_g_score = current_g + cost
+                if neighbor not in g_score or temp_g_score < g_score[neighbor]:
+                    g_score[neighbor] = temp_g_score
+                    came_from[neighbor] = current
+                    heapq.heappush(heap, (temp_g_score + heuristic(neighbor), neighbor))
+                    stats.pushes += 1
+
+            if len(heap) > stats.max_frontier:
+                stats.max_frontier = len(heap)
+
+        nodes = None
+        if goal_index in closed:
+            stats.path_cost = g_score[goal_index]
+            nodes = [goal_index]
+            while nodes[-1] != start_index:
+                nodes.append(came_from[nodes[-1]])
+            nodes.reverse()
+
+        stats.elapsed_ns = time.perf_counter_ns() - started_ns
+        self.stats = stats
+        return nodes
+
+    def refine(self, nodes):
+        """Expands an abstract path into a Path of grid cells"""
+        cells = self.cells
+        stride = self.stride
+        width = self.grid_width
+
+        indices = [nodes[0]]
+        for a, b in zip(nodes, nodes[1:]):
+            if b in self.partners.get(a, ()):
+                indices.append(b)
+                continue
+            # Every other abstract edge stays inside one cluster
+            indices.extend(self.cluster_path(a, b, self.cluster_of(a)))
+
+        packed = array("i", ((index // stride - 1) * width + index % stride - 1 for index in indices))
+        return Path(packed, width, sum(cells[index] for index in indices[1:]))
+
+
+def _dijkstra(cells, offsets, origin, targets=None, backward=False):
+    """
+    Dijkstra over a padded cell-cost array, stopping once every target is settled
+    (or everything reachable is). With backward=True distances are measured towards
+    origin instead of away from it.
+
+    Returns:
+        (distances, parents): settled cells mapped to their distance, and the search tree
+    """
+    remaining = None if targets is None else set(targets) - {origin}
+    distances = {origin: 0}
+    parents = {origin: None}
+    settled = {}
+    heap = [(0, origin)]
+
+    while heap and (remaining is None or remaining):
+        distance, current = heapq.heappop(heap)
+        if current in settled:
+            continue
+        settled[current] = distance
+        if remaining is not None:
+            remaining.discard(current)
+
+        for offset in offsets:
+            neighbor = current + offset
+            step_cost = cells[neighbor]
+            if not step_cost:
+                continue
+            new_distance = distance + (cells[current] if backward else step_cost)
+            if neighbor not in distances or new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                parents[neighbor] = current
+                heapq.heappush(heap, (new_distance, neighbor))
+
+    return settled, parents
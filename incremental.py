@@ -0,0 +1,204 @@
+'''
+Incremental replanning with D* Lite.
+
+D* Lite searches backwards from the goal and keeps its g/rhs values between
+calls. When obstacles change, only cells whose distance to the goal is
+affected are reprocessed. A replan after a handful of toggled cells touches
+a small neighbourhood instead of repeating the whole search.
+
+The planner registers itself as a listener on PathfindingAlgorithms, so
+every update_cell/update_cells call is forwarded to its update_cells, and
+update_grid_reference (e.g. a resize) triggers a full re-initialisation on the
+next plan().
+
+Usage:
+    planner = DStarLite(pathfinding, start, goal)
+    path = planner.plan()
+    grid[i][j] = "X"
+    pathfinding.update_cells([(i, j)])   # planner is notified automatically
+    path = planner.plan()                # repairs only the affected region
+'''
+import heapq
+
+INFINITY = float("inf")
+
+
+class DStarLite:
+    """D* Lite over a PathfindingAlgorithms grid (4-connected, unit cost)"""
+    def __init__(self, pathfinding, start, goal):
+        self.pathfinding = pathfinding
+        self.start = start
+        self.goal = goal
+        pathfinding.add_listener(self)
+        self.reset()
+
+    def reset(self):
+        """Discards all search state and starts over from the goal"""
+        pathfinding = self.pathfinding
+        self.cells = pathfinding.cells
+        self.offsets = pathfinding.offsets
+        self.stride = pathfinding.stride
+        self.start_index = pathfinding.to_index(self.start)
+        self.goal_index = pathfinding.to_index(self.goal)
+
+        self.g = {}
+        self.rhs = {self.goal_index: 0}
+        # Key modifier: grows as the start moves so old queue keys stay valid lower bounds
+        self.km = 0
+        self.last_start_index = self.start_index
+
+        # Cells currently in the open list mapped to their live key; heap entries with another key are stale
+        self.open_keys = {}
+        self.queue = []
+        self.expansions = 0
+        self.needs_reset = False
+        self.push(self.goal_index)
+
+    def close(self):
+        """Stops listening for grid changes"""
+        self.pathfinding.remove_listener(self)
+
+    # --- Grid listener interface (see PathfindingAlgorithms.add_listener) ---
+
+    def update_cells(self, changed_cells):
+        """Repairs the search state around cells whose occupancy changed"""
+        if self.needs_reset:
+            return
+
+        self.km += self.heuristic(self.last_start_index, self.start_index)
+        self.last_start_index = self.start_index
+
+        cells = self.cells
+        for position in changed_cells:
+            index = self.pathfinding.to_index(position)
+            self.update_vertex(index)
+            for offset in self.offsets:
+                if cells[index + offset]:
+                    self.update_vertex(index + offset)
+
+    def grid_replaced(self):
+        """The whole grid was swapped out (e.g. resized): rebuild from scratch on the next plan()"""
+        self.needs_reset = True
+
+    # --- Planning ---
+
+    def set_start(self, start):
+        """Moves the agent; the existing search state stays valid"""
+        self.start = start
+        self.start_index = self.pathfinding.to_index(start)
+
+    def plan(self, visualize_callback=None):
+        """
+        Brings the search up to date and extracts the current shortest path
+
+        Args:
+            visualize_callback: Function called for each cell the repair processes
+
+        Returns:
+            path: List of (row, col) positions from start to goal, or None if unreachable
+        """
+        if self.needs_reset:
+            self.reset()
+        pathfinding = self.pathfinding
+        if not (pathfinding.is_valid_position(self.start) and pathfinding.is_valid_position(self.goal)):
+            return None
+
+        self.compute_shortest_path(visualize_callback)
+        if self.g.get(self.start_index, INFINITY) == INFINITY:
+            return None
+
+        cells = self.cells
+        g = self.g
+        current = self.start_index
+        path = [self.start]
+        # A consistent start has a strictly descending g-chain to the goal
+        while current != self.goal_index:
+            best = None
+            best_cost = INFINITY
+            for offset in self.offsets:
+                neighbor = current + offset
+                if cells[neighbor] and g.get(neighbor, INFINITY) < best_cost:
+                    best = neighbor
+                    best_cost = g[neighbor]
+            if best is None:
+                return None
+            current = best
+            path.append(pathfinding.to_position(current))
+        return path
+
+    def heuristic(self, a, b):
+        row_a, col_a = divmod(a, self.stride)
+        row_b, col_b = divmod(b, self.stride)
+        return abs(row_a - row_b) + abs(col_a - col_b)  # Manhattan distance
+
+    def calculate_key(self, index):
+        best = min(self.g.get(index, INFINITY), self.rhs.get(index, INFINITY))
+        return (best + self.heuristic(self.start_index, index) + self.km, best)
+
+    def push(self, index):
+        key = self.calculate_key(index)
+        self.open_keys[index] = key
+        heapq.heappush(self.queue, (key, index))
+
+    def update_vertex(self, index):
+        """Recomputes rhs for a cell and (re)queues it if it is inconsistent"""
+        if index != self.goal_index:
+            best = INFINITY
+            if self.cells[index]:
+                g = self.g
+                cells = self.cells
+                for offset in self.offsets:
+                    neighbor = index + offset
+                    if cells[neighbor]:
+                        cost = g.get(neighbor, INFINITY) + 1
+                        if cost < best:
+                            best = cost
+            self.rhs[index] = best
+
+        if self.g.get(index, INFINITY) != self.rhs.get(index, INFINITY):
+            self.push(index)
+        else:
+            self.open_keys.pop(index, None)
+
+    def compute_shortest_path(self, visualize_callback=None):
+        g = self.g
+        rhs = self.rhs
+        cells = self.cells
+        offsets = self.offsets
+        open_keys = self.open_keys
+        queue = self.queue
+
+        while queue:
+            key, index = queue[0]
+            if open_keys.get(index) != key:
+                heapq.heappop(queue)  # stale entry
+                continue
+
+            start_index = self.start_index
+            start_g = g.get(start_index, INFINITY)
+            if key >= self.calculate_key(start_index) and rhs.get(start_index, INFINITY) == start_g:
+                break
+
+            heapq.heappop(queue)
+            new_key = self.calculate_key(index)
+            if key < new_key:
+                open_keys[index] = new_key
+                heapq.heappush(queue, (new_key, index))
+                continue
+
+            del open_keys[index]
+            self.expansions += 1
+            if visualize_callback:
+                visualize_callback(self.pathfinding.to_position(index), index == start_index)
+
+            if g.get(index, INFINITY) > rhs.get(index, INFINITY):
+                # Overconsistent: the cell got cheaper, settle it
+                g[index] = rhs[index]
+            else:
+                # Underconsistent: the cell got more expensive, invalidate it and re-derive
+                g[index] = INFINITY
+                self.update_vertex(index)
+            for offset in offsets:
+                neighbor = index + offset
+                if cells[neighbor]:
+                    self.update_vertex(neighbor)
@@ -0,0 +1,183 @@
+'''
+Landmark (ALT) distance index for the A* heuristic.
+
+A handful of landmark cells are picked far apart, and the exact BFS distance
+from every landmark to every cell is stored. By the triangle inequality,
+|d(L, goal) - d(L, n)| never exceeds the true distance from n to goal, which
+gives A* a much tighter admissible estimate than Manhattan distance on maps
+with walls to route around.
+
+The table is written to a file named after a hash of the grid contents and
+memory-mapped when loaded. Restarting on an unchanged map costs one hash and
+one mmap. Any obstacle change produces a new hash, so the index is rebuilt.
+
+Usage:
+    index = preprocess(pathfinding)
+    pathfinding.use_landmarks(index)
+'''
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+
+# Distance stored for cells a landmark cannot reach
+UNREACHABLE = 0xFFFFFFFF
+
+# File layout: header, then `count` landmark cell indices, then `count` rows of per-cell distances (uint32)
+_HEADER = struct.Struct("<4s2sHIII")
+_MAGIC = b"ALT1"
+_BYTE_ORDER = b"LE" if sys.byteorder == "little" else b"BE"
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "path-planning-simulator", "landmarks")
+
+
+def grid_hash(pathfinding):
+    """Hash of the grid shape and obstacle layout, used as the cache key"""
+    digest = hashlib.sha256()
+    digest.update(struct.pack("<II", pathfinding.grid_height, pathfinding.grid_width))
+    digest.update(pathfinding.cells)
+    return digest.hexdigest()
+
+
+def distances_from(pathfinding, source):
+    """BFS distance from the flat index `source` to every cell (UNREACHABLE where blocked off)"""
+    cells = pathfinding.cells
+    offsets = pathfinding.offsets
+    distances = array("I", b"\xff" * (4 * len(cells)))
+    distances[source] = 0
+    queue = deque([source])
+
+    while queue:
+        current = queue.popleft()
+        next_distance = distances[current] + 1
+        for offset in offsets:
+            neighbor = current + offset
+            if cells[neighbor] and distances[neighbor] == UNREACHABLE:
+                distances[neighbor] = next_distance
+                queue.append(neighbor)
+
+    return distances
+
+
+def select_landmarks(pathfinding, count):
+    """
+    Farthest-point landmark selection.
+
+    Starts from the cell farthest from the first open cell, then repeatedly adds the
+    cell whose distance to its nearest chosen landmark is largest.
+
+    Returns:
+        (landmarks, rows): Flat indices of the landmarks and their distance arrays
+    """
+    cells = pathfinding.cells
+    first_open = next((index for index, value in enumerate(cells) if value), None)
+    if first_open is None:
+        return [], []
+
+    seed_distances = distances_from(pathfinding, first_open)
+    candidate = max(range(len(cells)), key=lambda index: -1 if seed_distances[index] == UNREACHABLE else seed_distances[index])
+
+    landmarks = []
+    rows = []
+    nearest = array("I", b"\xff" * (4 * len(cells)))
+    while len(landmarks) < count:
+        landmarks.append(candidate)
+        distances = distances_from(pathfinding, candidate)
+        rows.append(distances)
+
+        best_distance = 0
+        for index, distance in enumerate(distances):
+            if distance < nearest[index]:
+                nearest[index] = distance
+            if nearest[index] != UNREACHABLE and nearest[index] > best_distance:
+                best_distance = nearest[index]
+                candidate = index
+        if best_distance == 0:
+            break  # every reachable cell is already a landmark
+
+    return landmarks, rows
+
+
+class LandmarkIndex:
+    """Memory-mapped landmark distance table for one grid (see module docstring)"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, byte_order, _, height, width, count = _HEADER.unpack_from(self.mapping)
+            if magic != _MAGIC or byte_order != _BYTE_ORDER:
+                raise ValueError(f"{path} is not a landmark index for this machine")
+            size = (height + 2) * (width + 2)
+            if len(self.mapping) != _HEADER.size + 4 * count * (size + 1):
+                raise ValueError(f"{path} is truncated or corrupt")
+        except (ValueError, struct.error):
+            self.mapping.close()
+            raise
+
+        self.shape = (height, width)
+        self.size = size
+        table = memoryview(self.mapping)[_HEADER.size:].cast("I")
+        self.landmarks = list(table[:count])
+        self.rows = [table[count + k * self.size:count + (k + 1) * self.size] for k in range(count)]
+        self.table = table
+
+    @classmethod
+    def write(cls, path, pathfinding, landmarks, rows):
+        """Writes a table to `path` (atomically, via a temporary file) and maps it"""
+        header = _HEADER.pack(_MAGIC, _BYTE_ORDER, 0, pathfinding.grid_height, pathfinding.grid_width, len(landmarks))
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(header)
+            array("I", landmarks).tofile(file)
+            for row in rows:
+                row.tofile(file)
+        os.replace(temporary_path, path)
+        return cls(path)
+
+    def heuristic_to(self, goal_index):
+        """Returns a function giving the ALT lower bound on the distance from a cell to goal_index"""
+        goal_rows = [(row, row[goal_index]) for row in self.rows if row[goal_index] != UNREACHABLE]
+
+        def heuristic(index):
+            best = 0
+            for row, goal_distance in goal_rows:
+                distance = row[index]
+                if distance != UNREACHABLE:
+                    bound = distance - goal_distance if distance > goal_distance else goal_distance - distance
+                    if bound > best:
+                        best = bound
+            return best
+
+        return heuristic
+
+    def close(self):
+        """Releases the memory map"""
+        self.rows = []
+        self.table.release()
+        self.mapping.close()
+
+
+def preprocess(pathfinding, cache_dir=DEFAULT_CACHE_DIR, count=8):
+    """
+    Offline "preprocess map" step: loads the landmark index for the current grid
+    from the cache, building and saving it first if this grid has not been seen.
+
+    Returns:
+        index: LandmarkIndex, ready for pathfinding.use_landmarks(index)
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{grid_hash(pathfinding)}-{count}.alt")
+
+    if os.path.exists(path):
+        try:
+            return LandmarkIndex(path)
+        except (ValueError, struct.error, OSError):
+            pass  # other byte order, truncated, empty or unreadable: rebuilt and overwritten below
+
+    landmarks, rows = select_landmarks(pathfinding, count)
+    return LandmarkIndex.write(path, pathfinding, landmarks, rows)
@@ -0,0 +1,338 @@
+'''
+Map import and export.
+
+Every reader returns (cells, height, width), where cells is a flat bytearray
+laid out like PathfindingAlgorithms.build_cells output, ready for
+PathfindingAlgorithms.from_cells. Rows are converted with bytes.translate, so
+no Python code runs per cell.
+
+Supported formats, chosen by file extension:
+- .map: the text format of the movingai.com benchmark sets. "." "G" and "S"
+  are open; "@" "O" "T" "W" and anything else are obstacles. Terrain costs
+  are not part of the format: they are saved as open cells.
+- .pgm (P5 binary or P2 text) and .png (8/16-bit, non-interlaced, no extra
+  libraries): occupancy images. Pixels at least `threshold` bright are open;
+  colour images use their first channel. Terrain costs are not stored.
+- .grid: the native binary format, a small header followed by the padded
+  cell array itself. open_native memory-maps the file and hands the planner
+  a view of it, so even a 100 MB map opens in milliseconds. The mapping is
+  copy-on-write: editing cells never changes the file.
+'''
+import mmap
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+
+from pathfinding import BLOCKED, OPEN, PathfindingAlgorithms, max_cell_cost
+
+# Native file layout: header (magic, largest cell cost, height, width), then the padded cell array
+_HEADER = struct.Struct("<4sHII")
+_MAGIC = b"GRD1"
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Samples per pixel for each PNG colour type: grey, RGB, palette, grey + alpha, RGBA
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# movingai terrain characters that can be walked on (everything else is an obstacle)
+_MOVINGAI_OPEN = b".GS"
+_MOVINGAI_TABLE = bytes(OPEN if b in _MOVINGAI_OPEN else BLOCKED for b in range(256))
+
+# Cell cost -> character used by cells_to_grid: obstacles, open space and terrain digits
+_GRID_CHARACTERS = bytes(
+    ord("X") if cost == BLOCKED else ord("O") if cost == OPEN else ord(str(min(cost, 9)))
+    for cost in range(256)
+)
+
+
+def pad_rows(rows, width):
+    """Joins translated rows (each `width` cell costs) into a flat array with a BLOCKED border"""
+    border = bytes(width + 2)
+    return bytearray(border + b"".join(b"\x00" + row + b"\x00" for row in rows) + border)
+
+
+def cells_to_grid(cells, height, width):
+    """Converts a flat cell array back into the GUI's list-of-lists grid ("X", "O" or a terrain digit)"""
+    stride = width + 2
+    return [
+        list(bytes(cells[(i + 1) * stride + 1:(i + 1) * stride + 1 + width]).translate(_GRID_CHARACTERS).decode("ascii"))
+        for i in range(height)
+    ]
+
+
+def cell_rows(cells, height, width):
+    """Yields each row of a flat cell array as bytes, without the border"""
+    stride = width + 2
+    for i in range(1, height + 1):
+        yield bytes(cells[i * stride + 1:i * stride + 1 + width])
+
+
+# --- movingai .map ---
+
+def read_movingai(path):
+    with open(path, "rb") as file:
+        header = {}
+        for line in file:
+            line = line.strip()
+            if line == b"map":
+                break
+            key, _, value = line.partition(b" ")
+            header[key] = value
+        else:
+            raise ValueError(f"{path}: no 'map' line")
+        height = int(header[b"height"])
+        width = int(header[b"width"])
+        lines = file.read().split(b"\n")
+
+    rows = [line.rstrip(b"\r")[:width].ljust(width, b"@").translate(_MOVINGAI_TABLE) for line in lines[:height]]
+    if len(rows) < height:
+        raise ValueError(f"{path}: expected {height} rows, found {len(rows)}")
+    return pad_rows(rows, width), height, width
+
+
+def write_movingai(path, cells, height, width):
+    table = bytes(ord("@") if cost == BLOCKED else ord(".") for cost in range(256))
+    with open(path, "wb") as file:
+        file.write(b"type octile\nheight %d\nwidth %d\nmap\n" % (height, width))
+        for row in cell_rows(cells, height, width):
+            file.write(row.translate(table) + b"\n")
+
+
+# --- Occupancy images ---
+
+def occupancy_table(threshold):
+    return bytes(OPEN if value >= threshold else BLOCKED for value in range(256))
+
+
+def read_pgm(path, threshold=128):
+    with open(path, "rb") as file:
+        data = file.read()
+
+    # Header: magic, width, height, maxval, separated by whitespace and "#" comments
+    tokens = []
+    position = 0
+    while len(tokens) < 4:
+        match = re.compile(rb"\s*(?:#[^\n]*\n\s*)*(\S+)").match(data, position)
+        if match is None:
+            raise ValueError(f"{path}: truncated PGM header")
+        tokens.append(match.group(1))
+        position = match.end()
+    magic, width, height, maxval = tokens[0], int(tokens[1]), int(tokens[2]), int(tokens[3])
+
+    # Samples are normalised to 0..255 so the threshold means the same for every maxval
+    if magic == b"P5":
+        # A single whitespace byte separates the header from the pixels
+        pixels = data[position + 1:]
+        if maxval > 255:
+            # 16-bit samples are big-endian
+            samples = array("H", pixels[:2 * min(len(pixels) // 2, width * height)])
+            if sys.byteorder == "little":
+                samples.byteswap()
+            scale = [min(value, maxval) * 255 // maxval for value in range(65536)]
+            pixels = bytes(map(scale.__getitem__, samples))
+        elif maxval != 255:
+            pixels = pixels.translate(bytes(min(value, maxval) * 255 // maxval for value in range(256)))
+    elif magic == b"P2":
+        values = data[position:].split()
+        pixels = bytes(min(int(value), maxval) * 255 // maxval for value in values)
+    else:
+        raise ValueError(f"{path}: not a PGM file")
+    if len(pixels) < width * height:
+        raise ValueError(f"{path}: expected {width * height} pixels, found {len(pixels)}")
+
+    table = occupancy_table(threshold)
+    rows = [pixels[i * width:(i + 1) * width].translate(table) for i in range(height)]
+    return pad_rows(rows, width), height, width
+
+
+def write_pgm(path, cells, height, width):
+    table = bytes(0 if cost == BLOCKED else 255 for cost in range(256))
+    with open(path, "wb") as file:
+        file.write(b"P5\n%d %d\n255\n" % (width, height))
+        for row in cell_rows(cells, height, width):
+            file.write(row.translate(table))
+
+
+def read_png(path, threshold=128):
+    with open(path, "rb") as file:
+        data = file.read()
+    if not data.startswith(_PNG_SIGNATURE):
+        raise ValueError(f"{path}: not a PNG file")
+
+    chunks = {}
+    compressed = []
+    position = len(_PNG_SIGNATURE)
+    while position < len(data):
+        length, kind = struct.unpack_from(">I4s", data, position)
+        body = data[position + 8:position + 8 + length]
+        if kind == b"IDAT":
+            compressed.append(body)
+        else:
+            chunks.setdefault(kind, body)
+        position += 12 + length
+        if kind == b"IEND":
+            break
+
+    width, height, bit_depth, colour_type, _, _, interlace = struct.unpack(">IIBBBBB", chunks[b"IHDR"])
+    if colour_type not in _PNG_CHANNELS or bit_depth not in (8, 16) or interlace:
+        raise ValueError(f"{path}: only non-interlaced 8/16-bit PNG images are supported")
+
+    sample_size = bit_depth // 8
+    pixel_size = _PNG_CHANNELS[colour_type] * sample_size
+    row_size = width * pixel_size
+    raw = zlib.decompress(b"".join(compressed))
+
+    if colour_type == 3:
+        # Palette entries are RGB triples; their red channel stands in for brightness
+        palette = chunks[b"PLTE"][0::3]
+        to_brightness = bytes(palette[index] if index < len(palette) else 0 for index in range(256))
+    table = occupancy_table(threshold)
+
+    rows = []
+    previous = bytes(row_size)
+    for i in range(height):
+        start = i * (row_size + 1)
+        row = unfilter(raw[start], raw[start + 1:start + 1 + row_size], previous, pixel_size)
+        previous = row
+        # First sample of each pixel, high byte first for 16-bit images
+        samples = row[0::pixel_size]
+        if colour_type == 3:
+            samples = samples.translate(to_brightness)
+        rows.append(samples.translate(table))
+    return pad_rows(rows, width), height, width
+
+
+def unfilter(filter_type, row, previous, pixel_size):
+    """Reverses one PNG scanline filter"""
+    if filter_type == 0:
+        return row
+    if filter_type == 2:
+        # Up: add the row above, bytewise, as one big integer (the masks stop carries between bytes)
+        size = len(row)
+        low_bits = int.from_bytes(b"\x7f" * size, "big")
+        high_bits = int.from_bytes(b"\x80" * size, "big")
+        a = int.from_bytes(row, "big")
+        b = int.from_bytes(previous, "big")
+        total = ((a & low_bits) + (b & low_bits)) ^ ((a ^ b) & high_bits)
+        return total.to_bytes(size, "big")
+
+    out = bytearray(row)
+    for k in range(len(out)):
+        left = out[k - pixel_size] if k >= pixel_size else 0
+        up = previous[k]
+        if filter_type == 1:
+            out[k] = (out[k] + left) & 0xFF
+        elif filter_type == 3:
+            out[k] = (out[k] + (left + up) // 2) & 0xFF
+        elif filter_type == 4:
+            upper_left = previous[k - pixel_size] if k >= pixel_size else 0
+            estimate = left + up - upper_left
+            distance_left = abs(estimate - left)
+            distance_up = abs(estimate - up)
+            distance_upper_left = abs(estimate - upper_left)
+            if distance_left <= distance_up and distance_left <= distance_upper_left:
+                predictor = left
+            elif distance_up <= distance_upper_left:
+                predictor = up
+            else:
+                predictor = upper_left
+            out[k] = (out[k] + predictor) & 0xFF
+        else:
+            raise ValueError(f"unknown PNG filter type {filter_type}")
+    return bytes(out)
+
+
+def write_png(path, cells, height, width):
+    table = bytes(0 if cost == BLOCKED else 255 for cost in range(256))
+    # Filter type 0 on every row
+    raw = b"".join(b"\x00" + row.translate(table) for row in cell_rows(cells, height, width))
+
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    with open(path, "wb") as file:
+        file.write(_PNG_SIGNATURE)
+        file.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)))
+        file.write(chunk(b"IDAT", zlib.compress(raw, 6)))
+        file.write(chunk(b"IEND", b""))
+
+
+# --- Native memory-mapped format ---
+
+class NativeMap:
+    """A .grid file mapped into memory; .cells is a writable copy-on-write view of its cell array"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        magic, self.max_cost, self.height, self.width = _HEADER.unpack_from(self.mapping)
+        size = (self.height + 2) * (self.width + 2)
+        if magic != _MAGIC or len(self.mapping) != _HEADER.size + size:
+            self.mapping.close()
+            raise ValueError(f"{path} is not a native grid file")
+        self.cells = memoryview(self.mapping)[_HEADER.size:]
+
+    def planner(self):
+        """A PathfindingAlgorithms searching the mapped cells directly"""
+        return PathfindingAlgorithms.from_cells(self.cells, self.height, self.width, self.max_cost)
+
+    def close(self):
+        """Releases the memory map (planners using .cells must be discarded first)"""
+        self.cells.release()
+        self.mapping.close()
+
+
+def open_native(path):
+    return NativeMap(path)
+
+
+def read_native(path):
+    """Reads a .grid file into a bytearray (use open_native to map it instead)"""
+    native = NativeMap(path)
+    try:
+        return bytearray(native.cells), native.height, native.width
+    finally:
+        native.close()
+
+
+def write_native(path, cells, height, width):
+    """Writes a .grid file (atomically, via a temporary file)"""
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, max_cell_cost(bytes(cells)), height, width))
+        file.write(cells)
+    os.replace(temporary_path, path)
+
+
+# --- Dispatch by extension ---
+
+READERS = {".map": read_movingai, ".pgm": read_pgm, ".png": read_png, ".grid": read_native}
+WRITERS = {".map": write_movingai, ".pgm": write_pgm, ".png": write_png, ".grid": write_native}
+
+
+def format_of(path, table):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in table:
+        raise ValueError(f"Unsupported map format '{extension}' (expected one of {', '.join(table)})")
+    return table[extension]
+
+
+def load_map(path):
+    """Reads any supported map file; returns (cells, height, width)"""
+    return format_of(path, READERS)(path)
+
+
+def save_map(path, cells, height, width):
+    """Writes a flat cell array in the format matching the file extension"""
+    format_of(path, WRITERS)(path, cells, height, width)
+
+
+def load_planner(path):
+    """A PathfindingAlgorithms for any supported map file (.grid files are memory-mapped, not read)"""
+    if os.path.splitext(path)[1].lower() == ".grid":
+        return open_native(path).planner()
+    cells, height, width = load_map(path)
+    return PathfindingAlgorithms.from_cells(cells, height, width)
@@ -0,0 +1,317 @@
+'''
+Multi-agent path planning on a shared grid.
+
+Agents move in lockstep: at every time step each one moves to a 4-connected
+neighbour or waits. Every step takes one time unit whatever the terrain cost.
+Two agents may never occupy the same cell at the same time, and may never
+swap cells in one step. An agent that has reached its goal stays there.
+
+Both planners use the same low-level search, space-time A*
+(plan_agent). It searches (cell, time) states, and its heuristic is the
+exact distance to the goal on the static grid, from one BFS per goal.
+
+- cooperative(): Cooperative A*. Agents are planned one after another, and each
+  path is written into a space-time reservation table that later agents must
+  avoid. It is fast but neither optimal nor complete: an agent fails if the
+  ones before it box it in.
+- cbs(): Conflict-Based Search. Every agent is planned alone. The cheapest
+  plan's first collision is then split into two branches, each forbidding
+  one of the two agents from being there at that time, and only the
+  constrained agent is replanned. The first collision-free plan it finds has the
+  lowest sum of arrival times.
+
+Distance maps are cached per goal. The planner listens to
+PathfindingAlgorithms like DStarLite, so grid edits clear the cache.
+
+Usage:
+    planner = MultiAgentPlanner(pathfinding)
+    paths = planner.cooperative([(start1, goal1), (start2, goal2)])
+    paths = planner.cbs([(start1, goal1), (start2, goal2)])
+    # paths[k] is a Path with one cell per time step (waits repeat a cell), or None
+'''
+import heapq
+import itertools
+import time
+from array import array
+from collections import deque
+
+from pathfinding import Path, SearchStats
+
+
+class MultiAgentPlanner:
+    """Plans collision-free paths for several agents over a PathfindingAlgorithms grid"""
+    def __init__(self, pathfinding):
+        self.pathfinding = pathfinding
+        pathfinding.add_listener(self)
+        # Distance-to-goal arrays for the heuristic, keyed by goal index
+        self.distance_maps = {}
+        # SearchStats of the last call; expansions and pushes count low-level space-time states
+        self.stats = None
+        # Constraint tree nodes expanded by the last cbs() call
+        self.cbs_nodes = 0
+
+    def close(self):
+        """Stops listening for grid changes"""
+        self.pathfinding.remove_listener(self)
+
+    # --- Grid change notifications (see PathfindingAlgorithms.add_listener) ---
+
+    def update_cells(self, changed_cells):
+        self.distance_maps.clear()
+
+    def grid_replaced(self):
+        self.distance_maps.clear()
+
+    # --- Planners ---
+
+    def cooperative(self, agents, max_time=None):
+        """
+        Cooperative A*: plans the agents in order against a shared reservation table
+
+        Args:
+            agents: list of (start, goal) (row, col) pairs
+            max_time: latest time step any agent may still be moving (see plan_agent)
+
+        Returns one Path per agent, or None for an agent that could not be planned
+        (the other agents ignore it).
+        """
+        started = time.perf_counter_ns()
+        self.stats = SearchStats("cooperative_a_star")
+        size = len(self.pathfinding.cells)
+
+        # Reservation table: occupied (time * size + index) keys, steps that would swap with
+        # a planned agent, parked agents' goals, and the last time each cell is reserved
+        vertex = set()
+        moves = set()
+        parked = {}
+        latest = {}
+        paths = []
+        for start, goal in agents:
+            start_index = self.pathfinding.index_of(start)
+            goal_index = self.pathfinding.index_of(goal)
+            path = self.plan_agent(start_index, goal_index, vertex, moves, parked, latest.get(goal_index, -1), max_time)
+            paths.append(path)
+            if path is None:
+                continue
+            for step, index in enumerate(path):
+                vertex.add(step * size + index)
+                if latest.get(index, -1) < step:
+                    latest[index] = step
+                if step:
+                    # Forbids the opposite step, so nobody swaps places with this agent
+                    moves.add((step, index, path[step - 1]))
+            parked[goal_index] = len(path) - 1
+
+        return self.finish(paths, started)
+
+    def cbs(self, agents, max_nodes=10000, max_time=None):
+        """
+        Conflict-Based Search: collision-free paths with the lowest sum of arrival times
+
+        Args:
+            agents: list of (start, goal) (row, col) pairs
+            max_nodes: constraint tree nodes to expand before giving up
+            max_time: latest time step any agent may still be moving (see plan_agent)
+
+        Returns one Path per agent, or None when there is no solution within the limits.
+        """
+        started = time.perf_counter_ns()
+        self.stats = SearchStats("cbs")
+        self.cbs_nodes = 0
+        index_of = self.pathfinding.index_of
+        size = len(self.pathfinding.cells)
+        endpoints = [(index_of(start), index_of(goal)) for start, goal in agents]
+
+        # Per-agent constraints: (forbidden vertex keys, forbidden steps, time the goal is last forbidden)
+        no_constraints = (frozenset(), frozenset(), -1)
+        paths = [self.plan_agent(start_index, goal_index, max_time=max_time) for start_index, goal_index in endpoints]
+        if None in paths:
+            return self.finish([None] * len(agents), started)
+
+        # Constraint tree nodes ordered by sum of costs, then by number of collisions
+        counter = itertools.count()
+        conflict, conflict_count = find_conflicts(paths)
+        open_nodes = [(sum_of_costs(paths), conflict_count, next(counter), paths, [no_constraints] * len(agents), conflict)]
+        while open_nodes:
+            _, _, _, paths, constraints, conflict = heapq.heappop(open_nodes)
+            if conflict is None:
+                return self.finish(paths, started)
+            self.cbs_nodes += 1
+            if self.cbs_nodes > max_nodes:
+                break
+
+            kind, agent_a, agent_b, step, index_a, index_b = conflict
+            for agent, key in ((agent_a, (index_a, index_b)), (agent_b, (index_b, index_a))):
+                vertex, moves, goal_time = constraints[agent]
+                if kind == "vertex":
+                    vertex = vertex | {step * size + index_a}
+                    if index_a == endpoints[agent][1]:
+                        goal_time = max(goal_time, step)
+                else:
+                    # The agent may not move from key[0] to key[1] arriving at step
+                    moves = moves | {(step, key[0], key[1])}
+
+                start_index, goal_index = endpoints[agent]
+                path = self.plan_agent(start_index, goal_index, vertex, moves, None, goal_time, max_time)
+                if path is None:
+                    continue
+                child_paths = list(paths)
+                child_paths[agent] = path
+                child_constraints = list(constraints)
+                child_constraints[agent] = (vertex, moves, goal_time)
+                child_conflict, child_count = find_conflicts(child_paths)
+                heapq.heappush(open_nodes, (sum_of_costs(child_paths), child_count, next(counter), child_paths, child_constraints, child_conflict))
+
+        return self.finish([None] * len(agents), started)
+
+    def finish(self, paths, started):
+        """Packs index paths into Path objects and completes self.stats"""
+        stride = self.pathfinding.stride
+        width = self.pathfinding.grid_width
+        result = []
+        for path in paths:
+            if path is None:
+                result.append(None)
+                continue
+            cells = array("i", [(index // stride - 1) * width + index % stride - 1 for index in path])
+            result.append(Path(cells, width, len(path) - 1))
+        if all(path is not None for path in result):
+            self.stats.path_cost = sum_of_costs(paths)
+        self.stats.elapsed_ns = time.perf_counter_ns() - started
+        return result
+
+    # --- Heuristic ---
+
+    def distances(self, goal_index):
+        """Steps from every cell to the goal on the static grid (-1 where it cannot be reached)"""
+        distance = self.distance_maps.get(goal_index)
+        if distance is not None:
+            return distance
+
+        cells = self.pathfinding.cells
+        offsets = self.pathfinding.offsets
+        distance = array("i", [-1]) * len(cells)
+        distance[goal_index] = 0
+        queue = deque([goal_index])
+        while queue:
+            current = queue.popleft()
+            next_distance = distance[current] + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if cells[neighbor] and distance[neighbor] < 0:
+                    distance[neighbor] = next_distance
+                    queue.append(neighbor)
+        self.distance_maps[goal_index] = distance
+        return distance
+
+    # --- Low-level search ---
+
+    def plan_agent(self, start_index, goal_index, vertex=(), moves=(), parked=None, finish_after=-1, max_time=None):
+        """
+        Space-time A* for one agent; returns its flat cell index at every time step, or None
+
+        Args:
+            start_index, goal_index: flat cell indices (None for a position outside the grid)
+            vertex: (time * len(cells) + index) keys of cells the agent may not occupy at that time
+            moves: (time, from, to) steps the agent may not take, arriving at time
+            parked: {index: time} cells that are occupied from that time onwards
+            finish_after: the agent may only stop at its goal after this time
+            max_time: latest time step searched. Defaults to finish_after plus the agent's
+                      distance to its goal plus the grid's height and width, which leaves
+                      room for detours and waits without searching forever when boxed in.
+        """
+        if start_index is None or goal_index is None:
+            return None
+        cells = self.pathfinding.cells
+        size = len(cells)
+        distance = self.distances(goal_index)
+        if distance[start_index] < 0:
+            return None
+        if max_time is None:
+            max_time = finish_after + 1 + distance[start_index] + self.pathfinding.grid_height + self.pathfinding.grid_width
+        parked = parked or {}
+        # Waiting is a step with offset 0
+        steps = [0] + self.pathfinding.offsets
+        stats = self.stats
+
+        # Every step costs one time unit, so a state's cost is its time and the first
+        # visit to a (time, cell) key is final: parents doubles as the closed set
+        parents = {start_index: None}
+        # Entries are (f, -time, cell): ties go to the later state, deeper along the same f
+        heap = [(distance[start_index], 0, start_index)]
+        stats.pushes += 1
+        while heap:
+            _, negative_time, index = heapq.heappop(heap)
+            now = -negative_time
+            stats.expansions += 1
+            key = now * size + index
+            if index == goal_index and now > finish_after:
+                path = []
+                while key is not None:
+                    path.append(key % size)
+                    key = parents[key]
+                path.reverse()
+                return path
+            if now >= max_time:
+                continue
+
+            later = now + 1
+            base = later * size
+            for offset in steps:
+                neighbor = index + offset
+                next_key = base + neighbor
+                if not cells[neighbor] or next_key in parents or next_key in vertex:
+                    continue
+                if neighbor in parked and later >= parked[neighbor]:
+                    continue
+                if offset and (later, index, neighbor) in moves:
+                    continue
+                parents[next_key] = key
+                heapq.heappush(heap, (later + distance[neighbor], -later, neighbor))
+                stats.pushes += 1
+            if len(heap) > stats.max_frontier:
+                stats.max_frontier = len(heap)
+        return None
+
+
+def sum_of_costs(paths):
+    """Sum of the agents' arrival times"""
+    return sum(len(path) - 1 for path in paths)
+
+
+def find_conflicts(paths):
+    """
+    Returns (first conflict, number of conflicts) for index paths; agents wait at their goal after arriving
+
+    A conflict is ("vertex", a, b, time, index, index) when agents a and b share a cell,
+    or ("edge", a, b, time, from, to) when a steps from -> to as b steps to -> from.
+    """
+    first = None
+    count = 0
+    horizon = max((len(path) for path in paths), default=0)
+    previous = None
+    for step in range(horizon):
+        positions = [path[min(step, len(path) - 1)] for path in paths]
+        occupied = {}
+        for agent, index in enumerate(positions):
+            other = occupied.get(index)
+            if other is None:
+                occupied[index] = agent
+                continue
+            count += 1
+            if first is None:
+                first = ("vertex", other, agent, step, index, index)
+
+        if previous is not None:
+            stepping = {}
+            for agent, index in enumerate(positions):
+                if previous[agent] != index:
+                    stepping[(previous[agent], index)] = agent
+            for (origin, target), agent in stepping.items():
+                other = stepping.get((target, origin))
+                if other is not None and agent < other:
+                    count += 1
+                    if first is None:
+                        first = ("edge", agent, other, step, origin, target)
+        previous = positions
+    return first, count
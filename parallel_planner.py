@@ -0,0 +1,132 @@
+'''
+Process-pool planner for large batches of independent queries.
+
+The planner's flat occupancy array is copied once into a shared memory block.
+Every worker process attaches to that block when it starts and searches it in
+place, so only the (start, goal) pairs and the resulting paths cross process
+boundaries. Workers run PathfindingAlgorithms.solve_many on their share of the
+batch, so results are identical to the serial call.
+'''
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from pathfinding import PathfindingAlgorithms
+
+# Per-worker state, set up once by _init_worker
+_worker_memory = None
+_worker_pathfinding = None
+
+
+def _init_worker(memory_name, grid_height, grid_width):
+    global _worker_memory, _worker_pathfinding
+    # Workers share the parent's resource tracker, which unlinks the block once the parent is done with it
+    _worker_memory = SharedMemory(name=memory_name)
+
+    size = (grid_height + 2) * (grid_width + 2)
+    _worker_pathfinding = PathfindingAlgorithms.from_cells(_worker_memory.buf[:size], grid_height, grid_width)
+
+
+def _solve_chunk(pairs, algorithm, connectivity, corner_cutting):
+    if (_worker_pathfinding.connectivity, _worker_pathfinding.corner_cutting) != (connectivity, corner_cutting):
+        _worker_pathfinding.set_movement(connectivity, corner_cutting)
+    return _worker_pathfinding.solve_many(pairs, algorithm)
+
+
+class ParallelPlanner:
+    """
+    Spreads solve_many batches across a pool of worker processes.
+
+    Usage:
+        with ParallelPlanner(pathfinding, workers=4) as planner:
+            paths = planner.solve_many(pairs, "a_star")
+
+    The grid is snapshotted when the planner is created. Call publish() after the
+    grid changes to push the new obstacles to the workers.
+    """
+    def __init__(self, pathfinding, workers=None):
+        self.pathfinding = pathfinding
+        self.workers = workers or os.cpu_count() or 1
+        self.memory = None
+        self.pool = None
+        self.publish()
+
+    def publish(self):
+        """Copies the planner's current grid into shared memory, restarting the pool if the size changed"""
+        cells = self.pathfinding.cells
+        shape = (self.pathfinding.grid_height, self.pathfinding.grid_width)
+
+        if self.memory is not None and self.shape == shape:
+            # Same size: workers see the new contents through the existing block
+            self.memory.buf[:len(cells)] = cells
+            return
+
+        self.close()
+        self.shape = shape
+        self.memory = SharedMemory(create=True, size=max(len(cells), 1))
+        self.memory.buf[:len(cells)] = cells
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.memory.name, *shape),
+        )
+
+    def solve_many(self, pairs, algorithm="a_star", chunks_per_worker=4):
+        """
+        Parallel equivalent of PathfindingAlgorithms.solve_many
+
+        Queries that share a start are kept in the same chunk, so bfs/dijkstra
+        sweeps are still shared. Workers use the planner's current movement model.
+
+        Returns:
+            paths: List aligned with pairs, as returned by solve_many
+        """
+        if algorithm not in ("a_star", "bfs", "dijkstra", "dfs"):
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+
+        chunks = self.make_chunks(pairs, self.workers * chunks_per_worker)
+        movement = (self.pathfinding.connectivity, self.pathfinding.corner_cutting)
+        futures = [
+            self.pool.submit(_solve_chunk, [pairs[k] for k in chunk], algorithm, *movement)
+            for chunk in chunks
+        ]
+
+        paths = [None] * len(pairs)
+        for chunk, future in zip(chunks, futures):
+            for k, path in zip(chunk, future.result()):
+                paths[k] = path
+        return paths
+
+    def make_chunks(self, pairs, chunk_count):
+        """Splits pair indices into roughly equal chunks without splitting a group of shared starts"""
+        queries_by_start = {}
+        for k, (start, _) in enumerate(pairs):
+            queries_by_start.setdefault(start, []).append(k)
+
+        target = max(1, -(-len(pairs) // max(chunk_count, 1)))
+        chunks = []
+        chunk = []
+        for queries in queries_by_start.values():
+            chunk.extend(queries)
+            if len(chunk) >= target:
+                chunks.append(chunk)
+                chunk = []
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def close(self):
+        """Shuts down the worker pool and frees the shared grid"""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,174 +1,1863 @@
 import heapq
-from collections import deque
+import math
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+
+# Values stored in PathfindingAlgorithms.cells: the cost of entering a cell, 0 meaning blocked
+BLOCKED = 0
+OPEN = 1
+
+# Maps every byte of an encoded grid row to its cell value: "X" is an obstacle, the digits
+# "1"-"9" are terrain with that traversal cost, and everything else ("O", "S", "G", "P") costs 1
+_OCCUPANCY_TABLE = bytes(
+    BLOCKED if b == ord("X") else b - ord("0") if ord("1") <= b <= ord("9") else OPEN
+    for b in range(256)
+)
+
+
+SQRT2 = math.sqrt(2)
+
+# SearchTree.parents entry of a cell the search never reached
+UNREACHED = -1
+
+# Search methods that PathfindingAlgorithms.search can dispatch to (and cache)
+SEARCHES = (
+    "a_star", "bfs", "dijkstra", "dfs", "jump_point_search", "theta_star",
+    "bidirectional_bfs", "bidirectional_dijkstra", "bidirectional_a_star", "weighted_a_star",
+)
+
+
+def cell_cost(cell):
+    """Traversal cost of a grid cell string ("X" -> 0 = blocked, "1"-"9" -> terrain cost, else 1)"""
+    return _OCCUPANCY_TABLE[ord(cell[0])] if cell else OPEN
+
+
+def max_cell_cost(cells):
+    """Largest cost in a flat cell array (at least OPEN)"""
+    if isinstance(cells, (bytes, bytearray)):
+        # Searching for each possible value runs in C and stops at the first (highest) hit
+        return next((cost for cost in range(255, OPEN, -1) if cells.find(bytes([cost])) >= 0), OPEN)
+    return max(max(cells, default=OPEN), OPEN)
+
+
+class SearchStats:
+    """
+    Counters filled in by every search method (same schema for all algorithms)
+
+    expansions:   nodes popped and expanded
+    pushes:       entries added to the frontier (queue, heap or stack)
+    stale_pops:   popped entries that were outdated (already expanded, or superseded by a cheaper entry)
+    max_frontier: largest frontier size seen during the search
+    elapsed_ns:   wall time of the whole call, in nanoseconds
+    path_cost:    cost of the path found (None if the goal was not reached, or for bfs/dfs)
+    suboptimality: bound on path_cost / optimal cost, from the bounded-suboptimal searches
+                  (weighted_a_star, anytime.ARAStar); None for the others
+    """
+    def __init__(self, algorithm, expansions=0, pushes=0, stale_pops=0, max_frontier=0, elapsed_ns=0, path_cost=None,
+                 suboptimality=None):
+        self.algorithm = algorithm
+        self.expansions = expansions
+        self.pushes = pushes
+        self.stale_pops = stale_pops
+        self.max_frontier = max_frontier
+        self.elapsed_ns = elapsed_ns
+        self.path_cost = path_cost
+        self.suboptimality = suboptimality
+
+    def as_dict(self):
+        return {
+            "algorithm": self.algorithm,
+            "expansions": self.expansions,
+            "pushes": self.pushes,
+            "stale_pops": self.stale_pops,
+            "max_frontier": self.max_frontier,
+            "elapsed_ns": self.elapsed_ns,
+            "path_cost": self.path_cost,
+            "suboptimality": self.suboptimality,
+        }
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.as_dict().items())
+        return f"SearchStats({fields})"
+
+
+class Path:
+    """
+    A path from start to goal inclusive, packed as one int32 per cell (row * width + col).
+
+    Indexing and iterating give (row, col) positions. length is the number of steps
+    and cost the path cost reported by the search (None for bfs/dfs).
+    """
+    def __init__(self, cells, width, cost=None):
+        self.cells = cells
+        self.width = width
+        self.cost = cost
+
+    @property
+    def length(self):
+        return len(self.cells) - 1
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [divmod(cell, self.width) for cell in self.cells[k]]
+        return divmod(self.cells[k], self.width)
+
+    def __iter__(self):
+        width = self.width
+        for cell in self.cells:
+            yield divmod(cell, width)
+
+    def positions(self):
+        """The path as a list of (row, col) positions"""
+        return list(self)
+
+    def __repr__(self):
+        return f"Path(length={self.length}, cost={self.cost!r})"
+
+
+class SearchTree(Mapping):
+    """
+    The search tree returned by the search methods, with the search's SearchStats as .stats
+
+    Stored as one int32 per cell of the flat grid: parents[index] is the flat index of
+    the cell's parent, the cell's own index for a root, or UNREACHED. It reads like the
+    old came_from dict (tree[(row, col)] is the parent position, None for a root), but
+    path() walks the array directly and packs the result without a tuple per node.
+    """
+    def __init__(self, parents, stride, start_index, goal_index, stats):
+        self.parents = parents
+        self.stride = stride
+        self.start_index = start_index
+        self.goal_index = goal_index
+        self.stats = stats
+        self.goal_path = None
+
+    def index_of(self, position):
+        """Flat index of an in-grid (row, col), or None outside the grid"""
+        row, col = position
+        stride = self.stride
+        if 0 <= row < len(self.parents) // stride - 2 and 0 <= col < stride - 2:
+            return (row + 1) * stride + col + 1
+        return None
+
+    def __getitem__(self, position):
+        index = self.index_of(position)
+        if index is None or self.parents[index] == UNREACHED:
+            raise KeyError(position)
+        parent = self.parents[index]
+        if parent == index:
+            return None
+        return (parent // self.stride - 1, parent % self.stride - 1)
+
+    def __iter__(self):
+        stride = self.stride
+        for index, parent in enumerate(self.parents):
+            if parent != UNREACHED:
+                yield (index // stride - 1, index % stride - 1)
+
+    def __len__(self):
+        return len(self.parents) - self.parents.count(UNREACHED)
+
+    def path(self, goal=None):
+        """
+        The Path from the search's start to goal (default: the search's goal), or None
+        if the search did not reach it. The path to the search's goal is built once and
+        cached.
+        """
+        if goal is None:
+            # A search towards a goal outside the grid has no goal cell to trace from
+            if self.goal_path is None and self.goal_index is not None:
+                self.goal_path = self.trace(self.goal_index, self.stats.path_cost)
+            return self.goal_path
+        goal_index = self.index_of(goal)
+        if goal_index is None:
+            return None
+        return self.trace(goal_index, self.stats.path_cost if goal_index == self.goal_index else None)
+
+    def trace(self, goal_index, cost):
+        parents = self.parents
+        stride = self.stride
+        width = stride - 2
+        start_index = self.start_index
+
+        cells = array("i")
+        current = goal_index
+        while current != start_index:
+            parent = parents[current]
+            # Unreached, or a root other than this search's start
+            if parent == UNREACHED or parent == current:
+                return None
+            cells.append((current // stride - 1) * width + current % stride - 1)
+            current = parent
+        cells.append((start_index // stride - 1) * width + start_index % stride - 1)
+        cells.reverse()
+        return Path(cells, width, cost)
+
+
+class SearchEvents:
+    """
+    Batched, optionally sampled, expansion events for profiling or visualization.
+
+    Unlike visualize_callback, which is called for every popped node, the hook is
+    called with a list of (row, col) positions once per `batch_size` recorded
+    expansions (and once more when the search ends). With sample_every=N only every
+    Nth expansion is recorded. Pass an instance as `events=` to any search method;
+    searches without one pay nothing for it.
+    """
+    def __init__(self, hook, batch_size=1024, sample_every=1):
+        self.hook = hook
+        self.batch_size = batch_size
+        self.sample_every = sample_every
+        self.pending = []
+        self.count = 0
+        self.stride = 1
+
+    def start(self, pathfinding):
+        """Called by the search before the first expansion"""
+        self.stride = pathfinding.stride
+        self.pending = []
+        self.count = 0
+
+    def record(self, index):
+        """Called by the search with the flat index of every expanded node"""
+        self.count += 1
+        if self.count % self.sample_every == 0:
+            self.pending.append(index)
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Hands the pending positions to the hook"""
+        if self.pending:
+            stride = self.stride
+            self.hook([(index // stride - 1, index % stride - 1) for index in self.pending])
+            self.pending = []
+
+
+class HeapQueue:
+    """
+    Binary heap (heapq) frontier with lazy deletion.
+
+    push() always adds a new entry, so an improved item leaves its old entry behind;
+    pop() may return such outdated entries and the caller has to recognise them.
+    Entries with equal priority are ordered by their tie value, lowest first.
+    """
+    decrease_key = False
+
+    def __init__(self):
+        self.heap = []
+
+    def push(self, item, priority, tie=0):
+        heapq.heappush(self.heap, (priority, tie, item))
+
+    def pop(self):
+        """Removes and returns the (priority, item) entry with the lowest priority"""
+        priority, _, item = heapq.heappop(self.heap)
+        return priority, item
+
+    def peek_priority(self):
+        """Lowest queued priority (possibly of an outdated entry, so a lower bound)"""
+        return self.heap[0][0]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class IndexedHeap:
+    """
+    Binary heap frontier with decrease-key.
+
+    Every queued item has exactly one entry, and a position map finds it, so pushing an
+    item that is already queued with a better key moves it up instead of adding a
+    duplicate: pop() never returns outdated entries. Entries with equal priority are
+    ordered by their tie value, lowest first.
+    """
+    decrease_key = True
+
+    def __init__(self):
+        # Parallel lists: (priority, tie) keys and items, in heap order
+        self.keys = []
+        self.items = []
+        self.position = {}
+
+    def push(self, item, priority, tie=0):
+        key = (priority, tie)
+        position = self.position.get(item)
+        if position is None:
+            position = len(self.items)
+            self.keys.append(key)
+            self.items.append(item)
+        elif key < self.keys[position]:
+            self.keys[position] = key
+        else:
+            return
+        self.sift_up(position, key, item)
+
+    def sift_up(self, position, key, item):
+        keys = self.keys
+        items = self.items
+        where = self.position
+        while position:
+            parent = (position - 1) >> 1
+            parent_key = keys[parent]
+            if not key < parent_key:
+                break
+            keys[position] = parent_key
+            items[position] = items[parent]
+            where[items[position]] = position
+            position = parent
+        keys[position] = key
+        items[position] = item
+        where[item] = position
+
+    def pop(self):
+        """Removes and returns the (priority, item) entry with the lowest priority"""
+        keys = self.keys
+        items = self.items
+        where = self.position
+        top_key = keys[0]
+        top_item = items[0]
+        del where[top_item]
+        key = keys.pop()
+        item = items.pop()
+        size = len(items)
+        if size:
+            # Sift the last entry down from the root
+            position = 0
+            child = 1
+            while child < size:
+                right = child + 1
+                if right < size and keys[right] < keys[child]:
+                    child = right
+                if not keys[child] < key:
+                    break
+                keys[position] = keys[child]
+                items[position] = items[child]
+                where[items[position]] = position
+                position = child
+                child = 2 * position + 1
+            keys[position] = key
+            items[position] = item
+            where[item] = position
+        return top_key[0], top_item
+
+    def peek_priority(self):
+        """Lowest queued priority"""
+        return self.keys[0][0]
+
+    def __len__(self):
+        return len(self.items)
+
+
+class BucketQueue:
+    """
+    Dial's bucket queue for small non-negative integer priorities.
+
+    Valid when every queued priority lies within `span` of the lowest one, which holds
+    for Dijkstra (span = max step cost + 1) and for A* with a consistent heuristic
+    (span = max step cost + 2). Items are kept in exactly one bucket, so pushing an
+    item that is already queued moves it (decrease-key) instead of duplicating it.
+    Within a bucket the most recently pushed item is popped first; tie values are
+    ignored, but the newest item is usually also the deepest.
+    """
+    decrease_key = True
+
+    def __init__(self, span):
+        self.span = span
+        self.buckets = [{} for _ in range(span)]
+        self.priority_of = {}
+        # Lower bound on every queued priority: the last popped one (or the lowest pushed so far)
+        self.current = None
+
+    def push(self, item, priority, tie=0):
+        old_priority = self.priority_of.get(item)
+        if old_priority is not None:
+            del self.buckets[old_priority % self.span][item]
+        if self.current is None or priority < self.current:
+            self.current = priority
+        self.priority_of[item] = priority
+        self.buckets[priority % self.span][item] = None
+
+    def pop(self):
+        """Removes and returns the (priority, item) entry with the lowest priority"""
+        buckets = self.buckets
+        span = self.span
+        current = self.current
+        while not buckets[current % span]:
+            current += 1
+        item, _ = buckets[current % span].popitem()
+        self.current = current
+        return self.priority_of.pop(item), item
+
+    def peek_priority(self):
+        """Lowest queued priority, without removing its item"""
+        buckets = self.buckets
+        span = self.span
+        current = self.current
+        while not buckets[current % span]:
+            current += 1
+        self.current = current
+        return current
+
+    def __len__(self):
+        return len(self.priority_of)
+
+
+class ResultCache:
+    """
+    Least recently used SearchTrees of PathfindingAlgorithms.search, keyed by
+    (grid version, algorithm, start, goal, options)
+
+    Bounded both by entry count and by the bytes of the trees' parent arrays. A
+    tree bigger than max_bytes on its own is not stored. Keys from an older grid
+    version can never be hit again, so the first result stored for a newer
+    version drops them all at once.
+
+    hits, misses and evictions (entries pushed out by either limit) count since
+    creation or the last reset_counters(). get, put and clear take a lock, so
+    searches running on several threads can share one cache.
+    """
+    def __init__(self, capacity=32, max_bytes=64 << 20):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.bytes = 0
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """The cached tree for key (marked as most recently used), or None"""
+        with self.lock:
+            tree = self.entries.get(key)
+            if tree is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return tree
+
+    def put(self, key, tree, size):
+        """Stores tree under key (a tuple starting with the grid version), taking size bytes"""
+        with self.lock:
+            if key[0] != self.version:
+                self.clear()
+                self.version = key[0]
+            if size > self.max_bytes:
+                return
+            if key in self.entries:
+                self.bytes -= self.sizes[key]
+            self.entries[key] = tree
+            self.entries.move_to_end(key)
+            self.sizes[key] = size
+            self.bytes += size
+            while len(self.entries) > self.capacity or self.bytes > self.max_bytes:
+                old_key, _ = self.entries.popitem(last=False)
+                self.bytes -= self.sizes.pop(old_key)
+                self.evictions += 1
+
+    def clear(self):
+        """Drops every entry (the counters are kept)"""
+        with self.lock:
+            self.entries.clear()
+            self.sizes.clear()
+            self.bytes = 0
+
+    def reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
-import heapq
-from collections import deque
 
 class PathfindingAlgorithms:
     def __init__(self, grid, grid_height, grid_width):
-        self.grid = grid
-        self.grid_height = grid_height
-        self.grid_width = grid_width
         self.directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]  # up, right, down, left
+        # Optional LandmarkIndex (see landmarks.py) used to tighten the A* heuristic
+        self.landmarks = None
+        # Objects notified of grid changes, e.g. incremental planners (see add_listener)
+        self.listeners = []
+        # Frontier used by dijkstra/a_star: "bucket" (BucketQueue), "indexed" (IndexedHeap) or "heap" (HeapQueue)
+        self.queue_type = "bucket"
+        # Order of a_star entries with equal f: "larger_g" (deepest first), "smaller_g" or "none"
+        self.tie_break = "larger_g"
+        # Heuristic weight of weighted_a_star: its paths cost at most epsilon times the optimum
+        self.epsilon = 2.0
+        # bfs implementation: "loop" (a queue, one cell at a time) or "wavefront" (bitset layers, see wavefront_bfs.py)
+        self.bfs_engine = "loop"
+        # Optional ComponentIndex (see connectivity.py) answering disconnected queries without a search
+        self.components = None
+        # Movement model for dijkstra/a_star (see set_movement)
+        self.connectivity = 4
+        self.corner_cutting = False
+        # Bumped on every grid change, so cached results of older grids are never returned
+        self.version = 0
+        # Results of search() calls; None disables caching
+        self.result_cache = ResultCache()
+        self.update_grid_reference(grid, grid_height, grid_width)
+        
+    @classmethod
+    def from_cells(cls, cells, grid_height, grid_width, max_cost=None):
+        """Creates an instance that searches an existing flat occupancy buffer (see set_cells)"""
+        pathfinding = cls([], 0, 0)
+        pathfinding.set_cells(cells, grid_height, grid_width, max_cost)
+        return pathfinding
         
     def update_grid_reference(self, grid, grid_height, grid_width):
-        """Update the grid reference when the grid is modified in the main application"""
+        """Update the grid reference when the grid is modified in the main application
+
+        The grid is converted once into a flat occupancy array (see build_cells) which
+        is what the search methods actually run on.
+        """
         self.grid = grid
+        self.set_cells(self.build_cells(grid, grid_height, grid_width), grid_height, grid_width)
+
+        for listener in self.listeners:
+            listener.grid_replaced()
+
+    def add_listener(self, listener):
+        """
+        Registers an object to be told about grid changes. It must provide:
+            update_cells(changed_cells): called with the (row, col) cells that changed
+            grid_replaced(): called when update_grid_reference installs a whole new grid
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Stops sending grid changes to a listener registered with add_listener"""
+        self.listeners.remove(listener)
+
+    def set_cells(self, cells, grid_height, grid_width, max_cost=None):
+        """
+        Installs a flat cell-cost array laid out like build_cells output.
+
+        Any buffer supporting len() and integer indexing works, e.g. a memoryview over
+        shared memory, and it is used as-is without copying. Passing the largest cell
+        cost, when it is already known, skips scanning the array for it. Code writing
+        into the buffer directly must bump self.version, or search() may return
+        results cached for the old contents.
+        """
         self.grid_height = grid_height
         self.grid_width = grid_width
+        self.version += 1
+
+        # Row length of the flat array, including the one-cell border on each side
+        self.stride = grid_width + 2
+        self.cells = cells
+        # Upper bound on the cost of any single step, sizes the bucket queue
+        self.max_cost = max_cell_cost(cells) if max_cost is None else max_cost
+        # Flat index offsets matching self.directions
+        self.offsets = [dy * self.stride + dx for dy, dx in self.directions]
+        self.moves = self.build_moves(self.connectivity)
+
+        # Per-cell search buffers for solve_many, allocated on first use (see ensure_buffers)
+        self.stamp = None
+        self.parent = None
+        self.distance = None
+        self.generation = 0
+        # Shared parent array of searches that never start (see empty_parents)
+        self.unreached_parents = None
+
+        # Landmark distances describe the old grid and would no longer be admissible
+        self.landmarks = None
+
+    def set_movement(self, connectivity=4, corner_cutting=False):
+        """
+        Selects the movement model used by dijkstra and a_star
+
+        Args:
+            connectivity: 4 (orthogonal steps only) or 8 (diagonal steps too, costing sqrt(2) times the cell cost)
+            corner_cutting: With 8-connectivity, allow a diagonal step past one blocked corner
+                            (a step between two blocked cells is never allowed)
+        """
+        if connectivity not in (4, 8):
+            raise ValueError("connectivity must be 4 or 8")
+        self.connectivity = connectivity
+        self.corner_cutting = corner_cutting
+        self.moves = self.build_moves(connectivity)
+
+    def build_moves(self, connectivity):
+        """
+        Returns the moves as (offset, cost multiplier, side_a, side_b) tuples. For diagonal
+        moves side_a/side_b are the offsets of the two orthogonal cells the move passes
+        between; for orthogonal moves they are 0.
+        """
+        moves = [(offset, 1, 0, 0) for offset in self.offsets]
+        if connectivity == 8:
+            for dy, dx in ((-1, 1), (1, 1), (1, -1), (-1, -1)):
+                moves.append((dy * self.stride + dx, SQRT2, dy * self.stride, dx))
+        return moves
+
+    def build_cells(self, grid, grid_height, grid_width):
+        """
+        Converts a list-of-lists (or list-of-strings) grid into a flat bytearray of
+        cell costs (see _OCCUPANCY_TABLE).
+
+        The array is padded with a border of BLOCKED cells, so a neighbour of any
+        in-grid cell is always a valid index and no bounds checks are needed.
+        Cell (i, j) lives at index (i + 1) * stride + (j + 1).
+        """
+        stride = grid_width + 2
+        cells = bytearray(stride)  # top border
+        for i in range(grid_height):
+            row = "".join(grid[i][:grid_width]).encode("ascii", "replace")
+            cells += b"\x00" + row.translate(_OCCUPANCY_TABLE) + b"\x00"
+        cells += bytearray(stride)  # bottom border
+        return cells
+
+    def ensure_buffers(self):
+        """Allocates the solve_many buffers for the current grid size (only when it changed)"""
+        size = len(self.cells)
+        if self.stamp is None or len(self.stamp) != size:
+            self.stamp = array("I", bytes(4 * size))
+            self.parent = array("i", bytes(4 * size))
+            self.generation = 0
+        # Ints for 4-connected moves, which the bucket queue needs; doubles, as diagonal steps
+        # give non-integer distances
+        typecode = "i" if self.connectivity == 4 else "d"
+        if self.distance is None or len(self.distance) != size or self.distance.typecode != typecode:
+            self.distance = array(typecode, [0]) * size
+
+    def next_generation(self):
+        """
+        Starts a new search over the shared buffers.
+
+        A cell has been reached in the current search only if stamp[cell] equals the
+        returned generation, so the buffers never need clearing between queries.
+        """
+        self.generation += 1
+        if self.generation > 0xFFFFFFFE:
+            self.stamp = array("I", bytes(4 * len(self.cells)))
+            self.generation = 1
+        return self.generation
+
+    def update_cell(self, position):
+        """Re-reads a single cell of self.grid into the flat array (e.g. after an obstacle toggle)"""
+        self.update_cells([position])
+
+    def update_cells(self, changed_cells):
+        """Re-reads the given (row, col) cells of self.grid into the flat array and notifies listeners"""
+        for i, j in changed_cells:
+            cost = cell_cost(self.grid[i][j])
+            self.cells[self.to_index((i, j))] = cost
+            if cost > self.max_cost:
+                self.max_cost = cost
+        self.landmarks = None
+        self.version += 1
+
+        for listener in self.listeners:
+            listener.update_cells(changed_cells)
+
+    def to_index(self, position):
+        """Converts a (row, col) position into its flat cell index"""
+        return (position[0] + 1) * self.stride + position[1] + 1
+
+    def index_of(self, position):
+        """
+        Flat cell index of a search endpoint, or None outside the grid (to_index would
+        wrap such a position onto a real cell)
+        """
+        row, col = position
+        if 0 <= row < self.grid_height and 0 <= col < self.grid_width:
+            return (row + 1) * self.stride + col + 1
+        return None
+
+    def to_position(self, index):
+        """Converts a flat cell index back into a (row, col) position"""
+        i, j = divmod(index, self.stride)
+        return (i - 1, j - 1)
+
+    def new_parents(self):
+        """A parent array for a new SearchTree, with every cell UNREACHED"""
+        return array("i", [UNREACHED]) * len(self.cells)
+
+    def empty_parents(self):
+        """
+        The parent array of a search that found nothing, allocated once per grid and
+        shared by those searches' trees (which must not be modified)
+        """
+        if self.unreached_parents is None:
+            self.unreached_parents = self.new_parents()
+        return self.unreached_parents
         
     def is_valid_position(self, position):
         """Check if a position is valid (within grid bounds and not an obstacle)"""
         i, j = position
         return (0 <= i < self.grid_height and 
                 0 <= j < self.grid_width and 
-                self.grid[i][j] != "X")
+                self.cells[self.to_index(position)] != BLOCKED)
     
-    def a_star(self, start, goal, visualize_callback=None):
+    def use_landmarks(self, landmarks):
+        """Attaches a LandmarkIndex built for the current grid; it is dropped again on any grid change"""
+        if landmarks.shape != (self.grid_height, self.grid_width):
+            raise ValueError("Landmark index was built for a different grid size")
+        self.landmarks = landmarks
+
+    def use_components(self, components):
+        """Attaches a ComponentIndex; searches between different components then return at once"""
+        self.components = components
+
+    def disconnected(self, start_index, goal_index):
+        """
+        True when there is nothing to search: the start is outside the grid (index None),
+        or the attached ComponentIndex proves the goal unreachable from start. A goal
+        outside the grid is left to the search, which sweeps every cell start reaches
+        without finding it.
+        """
+        if start_index is None:
+            return True
+        return (goal_index is not None and self.components is not None
+                and not self.components.connected_indices(start_index, goal_index))
+
+    def goal_reached(self, parents, start_index, goal_index):
+        """Whether a search's parent array reaches goal_index (never true for a goal outside the grid)"""
+        return goal_index is not None and (parents[goal_index] != UNREACHED or goal_index == start_index)
+
+    def make_heuristic(self, goal_index, use_landmarks=True):
+        """
+        Returns the A* heuristic towards goal_index for the current movement model.
+
+        4-connected: Manhattan distance, or the larger of Manhattan and the landmark (ALT)
+        bound when a landmark index is attached and use_landmarks is set. 8-connected:
+        octile distance (landmark distances are 4-connected and would overestimate
+        diagonal shortcuts). A goal outside the grid (goal_index None) gives 0 everywhere.
+        """
+        if goal_index is None:
+            return lambda index: 0
+        stride = self.stride
+        goal_row, goal_col = divmod(goal_index, stride)
+
+        def manhattan(index):
+            row, col = divmod(index, stride)
+            return abs(row - goal_row) + abs(col - goal_col)
+
+        def octile(index):
+            row, col = divmod(index, stride)
+            dy = abs(row - goal_row)
+            dx = abs(col - goal_col)
+            return dx + dy + (SQRT2 - 2) * (dx if dx < dy else dy)
+
+        if self.connectivity == 8:
+            return octile
+        landmarks = self.landmarks
+        if landmarks is None or not use_landmarks:
+            return manhattan
+
+        landmark_bound = landmarks.heuristic_to(goal_index)
+
+        def heuristic(index):
+            estimate = manhattan(index)
+            bound = landmark_bound(index)
+            return bound if bound > estimate else estimate
+
+        return heuristic
+
+    def make_frontier(self, span):
+        """
+        Creates the priority queue used by dijkstra/a_star, according to self.queue_type.
+        Diagonal moves give non-integer priorities, which use the heap instead of buckets.
+        """
+        if self.queue_type == "indexed":
+            return IndexedHeap()
+        if self.queue_type == "bucket" and self.connectivity == 4:
+            return BucketQueue(span)
+        return HeapQueue()
+
+    def tie_sign(self):
+        """Multiplier turning a g value into an a_star tie value (see self.tie_break)"""
+        if self.tie_break not in ("larger_g", "smaller_g", "none"):
+            raise ValueError(f"Unknown tie_break: {self.tie_break}")
+        return {"larger_g": -1, "smaller_g": 1, "none": 0}[self.tie_break]
+
+    def a_star(self, start, goal, visualize_callback=None, events=None):
         """
         A* pathfinding algorithm
+
+        Entering a cell costs its terrain cost (1 for plain open cells).
         
         Args:
             start: Tuple (row, col) of start position
             goal: Tuple (row, col) of goal position
             visualize_callback: Function to call for visualization during search
+            events: Optional SearchEvents receiving batched expansion events
             
         Returns:
-            came_from: Dictionary containing the path connections
+            came_from: SearchTree of parent links, with .stats (path() gives the packed Path)
         """
-        def heuristic(a, b):
-            return abs(a[0] - b[0]) + abs(a[1] - b[1])  # Manhattan distance
+        started_ns = time.perf_counter_ns()
+        cells = self.cells
+        moves = self.moves
+        corner_cutting = self.corner_cutting
+        start_index = self.index_of(start)
+        goal_index = self.index_of(goal)
+        heuristic = self.make_heuristic(goal_index)
+        record = self.start_events(events)
+        stats = SearchStats("a_star", pushes=1, max_frontier=1)
+        if self.disconnected(start_index, goal_index):
+            return self.finish_search(self.empty_parents(), start_index, goal_index, stats, started_ns, events)
             
-        priority_queue = [(0, start)]
-        came_from = {}
-        g_score = {start: 0}
-        f_score = {start: heuristic(start, goal)}
+        # The heuristic changes by at most 1 per step, so f grows by at most max_cost + 1
+        frontier = self.make_frontier(self.max_cost + 2)
+        frontier.push(start_index, heuristic(start_index))
+        # Only a lazy-deletion heap can pop outdated entries
+        lazy = not frontier.decrease_key
+        tie_sign = self.tie_sign()
+        parents = self.new_parents()
+        g_score = {start_index: 0}
         
-        while priority_queue:
-            _, current = heapq.heappop(priority_queue)
+        while frontier:
+            priority, current = frontier.pop()
+            # The live entry of an item has f = g + h exactly; a larger f was superseded
+            if lazy and priority > g_score[current] + heuristic(current):
+                stats.stale_pops += 1
+                continue
+            stats.expansions += 1
             
             if visualize_callback:
-                visualize_callback(current, current == goal)
+                visualize_callback(self.to_position(current), current == goal_index)
+            if record:
+                record(current)
                 
-            if current == goal:
+            if current == goal_index:
                 break
                 
-            for dy, dx in self.directions:
-                neighbor = (current[0] + dy, current[1] + dx)
+            current_g_score = g_score[current]
+            for offset, multiplier, side_a, side_b in moves:
+                neighbor = current + offset
+                step_cost = cells[neighbor]
                 
-                if self.is_valid_position(neighbor):
-                    temp_g_score = g_score[current] + 1
-                    
+                if step_cost:
+                    if side_a and not self.diagonal_allowed(cells[current + side_a], cells[current + side_b], corner_cutting):
+                        continue
+                    temp_g_score = current_g_score + step_cost * multiplier
                     if neighbor not in g_score or temp_g_score < g_score[neighbor]:
                         g_score[neighbor] = temp_g_score
-                        f_score[neighbor] = temp_g_score + heuristic(neighbor, goal)
-                        heapq.heappush(priority_queue, (f_score[neighbor], neighbor))
-                        came_from[neighbor] = current
-                        
-        return came_from
+                        frontier.push(neighbor, temp_g_score + heuristic(neighbor), tie_sign * temp_g_score)
+                        parents[neighbor] = current
+                        stats.pushes += 1
+
+            if len(frontier) > stats.max_frontier:
+                stats.max_frontier = len(frontier)
+
+        stats.path_cost = g_score[goal_index] if self.goal_reached(parents, start_index, goal_index) else None
+        return self.finish_search(parents, start_index, goal_index, stats, started_ns, events)
+
+    def weighted_a_star(self, start, goal, visualize_callback=None, events=None):
+        """
+        Weighted A*: A* ordered by g + epsilon * h, with epsilon = self.epsilon
+
+        Entering a cell costs its terrain cost (1 for plain open cells). The inflated
+        heuristic pulls the search towards the goal, so it expands far fewer cells than
+        a_star, and the path costs at most epsilon times the optimum (reported as
+        stats.suboptimality). Each cell is expanded at most once: a cheaper route to an
+        expanded cell found later is ignored, which the bound already allows for.
+        epsilon=1 finds a_star's path cost.
+
+        Args:
+            start: Tuple (row, col) of start position
+            goal: Tuple (row, col) of goal position
+            visualize_callback: Function to call for visualization during search
+            events: Optional SearchEvents receiving batched expansion events
+
+        Returns:
+            came_from: SearchTree of parent links, with .stats (path() gives the packed Path)
+        """
+        epsilon = self.epsilon
+        if epsilon < 1:
+            raise ValueError(f"epsilon must be at least 1, got {epsilon}")
+        started_ns = time.perf_counter_ns()
+        cells = self.cells
+        moves = self.moves
+        corner_cutting = self.corner_cutting
+        start_index = self.index_of(start)
+        goal_index = self.index_of(goal)
+        heuristic = self.make_heuristic(goal_index)
+        record = self.start_events(events)
+        stats = SearchStats("weighted_a_star", pushes=1, max_frontier=1, suboptimality=epsilon)
+        if self.disconnected(start_index, goal_index):
+            return self.finish_search(self.empty_parents(), start_index, goal_index, stats, started_ns, events)
+
+        # Inflated priorities are not whole numbers, which rules out the bucket queue
+        frontier = IndexedHeap() if self.queue_type == "indexed" else HeapQueue()
+        frontier.push(start_index, epsilon * heuristic(start_index))
+        tie_sign = self.tie_sign()
+        parents = self.new_parents()
+        g_score = {start_index: 0}
+        closed = set()
+
+        while frontier:
+            priority, current = frontier.pop()
+            # A cell's cheapest entry pops first, so any later entry of it is outdated
+            if current in closed:
+                stats.stale_pops += 1
+                continue
+            closed.add(current)
+            stats.expansions += 1
+
+            if visualize_callback:
+                visualize_callback(self.to_position(current), current == goal_index)
+            if record:
+                record(current)
+
+            if current == goal_index:
+                break
+
+            current_g_score = g_score[current]
+            for offset, multiplier, side_a, side_b in moves:
+                neighbor = current + offset
+                step_cost = cells[neighbor]
+
+                if step_cost and neighbor not in closed:
+                    if side_a and not self.diagonal_allowed(cells[current + side_a], cells[current + side_b], corner_cutting):
+                        continue
+                    temp_g_score = current_g_score + step_cost * multiplier
+                    if neighbor not in g_score or temp_g_score < g_score[neighbor]:
+                        g_score[neighbor] = temp_g_score
+                        frontier.push(neighbor, temp_g_score + epsilon * heuristic(neighbor), tie_sign * temp_g_score)
+                        parents[neighbor] = current
+                        stats.pushes += 1
+
+            if len(frontier) > stats.max_frontier:
+                stats.max_frontier = len(frontier)
+
+        stats.path_cost = g_score[goal_index] if self.goal_reached(parents, start_index, goal_index) else None
+        return self.finish_search(parents, start_index, goal_index, stats, started_ns, events)
+
+    def diagonal_allowed(self, side_a, side_b, corner_cutting):
+        """Whether a diagonal step may pass between two orthogonal cells with these values"""
+        if corner_cutting:
+            return bool(side_a or side_b)
+        return bool(side_a and side_b)
         
-    def bfs(self, start, goal, visualize_callback=None):
-        """Breadth-First Search algorithm
+    def theta_star(self, start, goal, visualize_callback=None, events=None):
+        """
+        Theta* any-angle pathfinding algorithm
+
+        Expands the 8-connected grid like A*, but a node may take its grandparent as
+        its parent whenever the straight segment between their cell centres is clear
+        of obstacles, so paths are not restricted to grid directions. Costs are
+        Euclidean lengths (terrain costs are ignored) and the heuristic is the
+        Euclidean distance to the goal.
         
         Args:
             start: Tuple (row, col) of start position
             goal: Tuple (row, col) of goal position
             visualize_callback: Function to call for visualization during search
+            events: Optional SearchEvents receiving batched expansion events
             
         Returns:
-            came_from: Dictionary containing the path connections
+            came_from: SearchTree containing the path connections (each straight segment
+                       of the final path is filled in cell by cell); stats.path_cost is
+                       the Euclidean length of the path
         """
-        queue = deque([start])
-        came_from = {start: None}
+        started_ns = time.perf_counter_ns()
+        cells = self.cells
+        stride = self.stride
+        moves = self.build_moves(8)
+        corner_cutting = self.corner_cutting
+        start_index = self.index_of(start)
+        goal_index = self.index_of(goal)
+        record = self.start_events(events)
+        stats = SearchStats("theta_star", pushes=1, max_frontier=1)
+        if self.disconnected(start_index, goal_index):
+            return self.finish_search(self.empty_parents(), start_index, goal_index, stats, started_ns, events)
+
+        def distance(a, b):
+            row_a, col_a = divmod(a, stride)
+            row_b, col_b = divmod(b, stride)
+            return math.hypot(row_a - row_b, col_a - col_b)
+
+        def to_goal(index):
+            return 0 if goal_index is None else distance(index, goal_index)
+
+        frontier = HeapQueue()
+        frontier.push(start_index, to_goal(start_index))
+        parents = {start_index: start_index}
+        g_score = {start_index: 0}
+        closed = set()
+
+        while frontier:
+            priority, current = frontier.pop()
+            if current in closed:
+                stats.stale_pops += 1
+                continue
+            closed.add(current)
+            stats.expansions += 1
+
+            if visualize_callback:
+                visualize_callback(self.to_position(current), current == goal_index)
+            if record:
+                record(current)
+
+            if current == goal_index:
+                break
+
+            current_parent = parents[current]
+            for offset, multiplier, side_a, side_b in moves:
+                neighbor = current + offset
+                if not cells[neighbor] or neighbor in closed:
+                    continue
+                if side_a and not self.diagonal_allowed(cells[current + side_a], cells[current + side_b], corner_cutting):
+                    continue
+
+                # Path 2: straight from the parent, skipping current, when the parent can see the neighbour
+                if current_parent != current and self.line_of_sight(current_parent, neighbor):
+                    via = current_parent
+                    temp_g_score = g_score[current_parent] + distance(current_parent, neighbor)
+                else:
+                    via = current
+                    temp_g_score = g_score[current] + multiplier
+
+                if neighbor not in g_score or temp_g_score < g_score[neighbor]:
+                    g_score[neighbor] = temp_g_score
+                    parents[neighbor] = via
+                    frontier.push(neighbor, temp_g_score + to_goal(neighbor))
+                    stats.pushes += 1
+
+            if len(frontier) > stats.max_frontier:
+                stats.max_frontier = len(frontier)
+
+        came_from = self.new_parents()
+        if goal_index in closed:
+            stats.path_cost = g_score[goal_index]
+            # Fill in the cells crossed by each straight segment of the final path
+            current = goal_index
+            while current != start_index:
+                parent = parents[current]
+                segment = [parent]
+                self.line_of_sight(parent, current, segment)
+                for previous, cell in zip(segment, segment[1:]):
+                    came_from[cell] = previous
+                current = parent
+
+        return self.finish_search(came_from, start_index, goal_index, stats, started_ns, events)
+
+    def line_of_sight(self, a, b, crossed=None):
+        """
+        Whether the straight segment between the centres of cells a and b only crosses
+        open cells. Where it passes exactly through a cell corner, the two cells beside
+        the corner are checked like a diagonal step (see diagonal_allowed).
+
+        If a list is passed as `crossed`, the cells walked through (excluding a) are
+        appended to it in order.
+        """
+        cells = self.cells
+        stride = self.stride
+        row, col = divmod(a, stride)
+        target_row, target_col = divmod(b, stride)
+        step_row = 1 if target_row > row else -1
+        step_col = 1 if target_col > col else -1
+        rows = abs(target_row - row)
+        cols = abs(target_col - col)
+
+        # Walk cell by cell, deciding at each step whether the segment leaves through a
+        # horizontal edge, a vertical edge, or exactly through a corner
+        row_steps = col_steps = 0
+        index = a
+        while row_steps < rows or col_steps < cols:
+            decision = (1 + 2 * col_steps) * rows - (1 + 2 * row_steps) * cols
+            if decision == 0:
+                if not self.diagonal_allowed(cells[index + step_row * stride], cells[index + step_col], self.corner_cutting):
+                    return False
+                index += step_row * stride + step_col
+                row_steps += 1
+                col_steps += 1
+            elif decision < 0:
+                index += step_col
+                col_steps += 1
+            else:
+                index += step_row * stride
+                row_steps += 1
+
+            if not cells[index]:
+                return False
+            if crossed is not None:
+                crossed.append(index)
+        return True
+
+    def jump_point_search(self, start, goal, visualize_callback=None, events=None):
+        """
+        Jump Point Search for the 4-connected, uniform-cost grid (terrain costs are ignored)
+
+        Straight runs of open cells are scanned without touching the priority queue;
+        only jump points (cells where the path may need to turn) are pushed. Path
+        lengths are the same as a_star's.
+        
+        Args:
+            start: Tuple (row, col) of start position
+            goal: Tuple (row, col) of goal position
+            visualize_callback: Function to call for visualization during search
+            events: Optional SearchEvents receiving batched expansion events
+            
+        Returns:
+            came_from: SearchTree containing the path connections (the path to the
+                       goal is filled in cell by cell, like the other algorithms)
+        """
+        started_ns = time.perf_counter_ns()
+        stride = self.stride
+        start_index = self.index_of(start)
+        goal_index = self.index_of(goal)
+        heuristic = self.make_heuristic(goal_index)
+        record = self.start_events(events)
+        stats = SearchStats("jump_point_search", pushes=1, max_frontier=1)
+        if self.disconnected(start_index, goal_index):
+            return self.finish_search(self.empty_parents(), start_index, goal_index, stats, started_ns, events)
+
+        priority_queue = [(heuristic(start_index), start_index)]
+        parents = self.new_parents()
+        g_score = {start_index: 0}
+
+        while priority_queue:
+            priority, current = heapq.heappop(priority_queue)
+            # A larger f than g + h means a cheaper entry for this jump point was pushed later
+            if priority > g_score[current] + heuristic(current):
+                stats.stale_pops += 1
+                continue
+            stats.expansions += 1
+
+            if visualize_callback:
+                visualize_callback(self.to_position(current), current == goal_index)
+            if record:
+                record(current)
+
+            if current == goal_index:
+                break
+
+            jump_parent = parents[current]
+            for jump_point in self.jump_successors(current, None if jump_parent == UNREACHED else jump_parent, goal_index):
+                # Jump points share a row or column with their parent
+                step = abs(jump_point - current)
+                temp_g_score = g_score[current] + (step if step < stride else step // stride)
+
+                if jump_point not in g_score or temp_g_score < g_score[jump_point]:
+                    g_score[jump_point] = temp_g_score
+                    heapq.heappush(priority_queue, (temp_g_score + heuristic(jump_point), jump_point))
+                    parents[jump_point] = current
+                    stats.pushes += 1
+
+            if len(priority_queue) > stats.max_frontier:
+                stats.max_frontier = len(priority_queue)
+
+        if self.goal_reached(parents, start_index, goal_index):
+            stats.path_cost = g_score[goal_index]
+
+        if goal_index is not None and parents[goal_index] != UNREACHED:
+            # Fill in the cells between consecutive jump points on the final path
+            current = goal_index
+            while current != start_index:
+                jump_parent = parents[current]
+                offset = self.direction_between(jump_parent, current)
+                for cell in range(current, jump_parent, -offset):
+                    parents[cell] = cell - offset
+                current = jump_parent
+
+        return self.finish_search(parents, start_index, goal_index, stats, started_ns, events)
+
+    def direction_between(self, a, b):
+        """Unit flat-index offset pointing from cell a to cell b (which share a row or column)"""
+        if abs(b - a) < self.stride:
+            return 1 if b > a else -1
+        return self.stride if b > a else -self.stride
+
+    def jump_successors(self, current, parent, goal_index):
+        """Jump points reachable from current, pruning directions by the direction we arrived from"""
+        stride = self.stride
+        if parent is None:
+            directions = (-stride, 1, stride, -1)
+        else:
+            direction = self.direction_between(parent, current)
+            if direction in (1, -1):
+                directions = (direction, -stride, stride)
+            else:
+                directions = (direction, -1, 1)
+
+        successors = []
+        for direction in directions:
+            if direction in (1, -1):
+                jump_point = self.jump_horizontal(current, direction, goal_index)
+            else:
+                jump_point = self.jump_vertical(current, direction, goal_index)
+            if jump_point is not None:
+                successors.append(jump_point)
+        return successors
+
+    def jump_horizontal(self, index, direction, goal_index):
+        """Scans along a row from index; returns the first jump point or None on hitting an obstacle"""
+        cells = self.cells
+        stride = self.stride
+        while True:
+            index += direction
+            if not cells[index]:
+                return None
+            if index == goal_index:
+                return index
+            # A cell above/below opens up right after an obstacle: it can only be reached optimally from here
+            if ((cells[index - stride] and not cells[index - direction - stride]) or
+                    (cells[index + stride] and not cells[index - direction + stride])):
+                return index
+
+    def jump_vertical(self, index, direction, goal_index):
+        """Scans along a column from index; returns the first jump point or None on hitting an obstacle"""
+        cells = self.cells
+        while True:
+            index += direction
+            if not cells[index]:
+                return None
+            if index == goal_index:
+                return index
+            if ((cells[index - 1] and not cells[index - 1 - direction]) or
+                    (cells[index + 1] and not cells[index + 1 - direction])):
+                return index
+            # Every cell of a vertical run can turn into a row holding a jump point
+            if (self.jump_horizontal(index, 1, goal_index) is not None or
+                    self.jump_horizontal(index, -1, goal_index) is not None):
+                return index
+        
+    def bfs(self, start, goal, visualize_callback=None, events=None):
+        """Breadth-First Search algorithm (unweighted: terrain costs are ignored)
+
+        With self.bfs_engine set to "wavefront", the search runs as a bitset wavefront
+        (see bfs_wavefront) unless a visualize_callback or events need every expansion.
+        
+        Args:
+            start: Tuple (row, col) of start position
+            goal: Tuple (row, col) of goal position
+            visualize_callback: Function to call for visualization during search
+            events: Optional SearchEvents receiving batched expansion events
+            
+        Returns:
+            came_from: SearchTree of parent links, with .stats (path() gives the packed Path)
+        """
+        started_ns = time.perf_counter_ns()
+        cells = self.cells
+        offsets = self.offsets
+        start_index = self.index_of(start)
+        goal_index = self.index_of(goal)
+        record = self.start_events(events)
+        stats = SearchStats("bfs", pushes=1, max_frontier=1)
+        if self.disconnected(start_index, goal_index):
+            return self.finish_search(self.empty_parents(), start_index, goal_index, stats, started_ns, events)
+        if self.bfs_engine not in ("loop", "wavefront"):
+            raise ValueError(f"Unknown bfs_engine: {self.bfs_engine}")
+        if self.bfs_engine == "wavefront" and visualize_callback is None and events is None:
+            return self.bfs_wavefront(start_index, goal_index, started_ns)
+
+        queue = deque([start_index])
+        parents = self.new_parents()
+        parents[start_index] = start_index
         
         while queue:
             current = queue.popleft()
+            stats.expansions += 1
             
             if visualize_callback:
-                visualize_callback(current, current == goal)
+                visualize_callback(self.to_position(current), current == goal_index)
+            if record:
+                record(current)
                 
-            if current == goal:
+            if current == goal_index:
                 break
                 
-            for dy, dx in self.directions:
-                neighbor = (current[0] + dy, current[1] + dx)
+            for offset in offsets:
+                neighbor = current + offset
                 
-                if (self.is_valid_position(neighbor) and neighbor not in came_from):
-                    came_from[neighbor] = current
+                if cells[neighbor] and parents[neighbor] == UNREACHED:
+                    parents[neighbor] = current
                     queue.append(neighbor)
+                    stats.pushes += 1
+
+            if len(queue) > stats.max_frontier:
+                stats.max_frontier = len(queue)
                     
-        return came_from
-        
-    def dijkstra(self, start, goal, visualize_callback=None):
+        return self.finish_search(parents, start_index, goal_index, stats, started_ns, events)
+
+    def bfs_wavefront(self, start_index, goal_index, started_ns):
+        """
+        bfs as one layer sweep from the start, stopping at the goal (see wavefront_bfs.py)
+
+        The tree reads parents off the step counts in place (LayerParents). Paths have
+        the same length as the loop's, though ties between equally short paths may be
+        broken differently. stats.expansions and stats.pushes are the number of cells
+        reached; max_frontier is not tracked.
+        """
+        import wavefront_bfs  # wavefront_bfs imports this module
+
+        stats = SearchStats("bfs")
+        distance = wavefront_bfs.layer_wavefront(self.cells, self.stride, start_index, goal_index, stats)
+        stats.pushes = stats.expansions
+        parents = wavefront_bfs.LayerParents(distance, self.offsets)
+        return self.finish_search(parents, start_index, goal_index, stats, started_ns, None)
+
+    def dijkstra(self, start, goal, visualize_callback=None, events=None):
         """Dijkstra's algorithm
+
+        Entering a cell costs its terrain cost (1 for plain open cells).
         
         Args:
             start: Tuple (row, col) of start position
             goal: Tuple (row, col) of goal position
             visualize_callback: Function to call for visualization during search
+            events: Optional SearchEvents receiving batched expansion events
             
         Returns:
-            came_from: Dictionary containing the path connections
+            came_from: SearchTree of parent links, with .stats (path() gives the packed Path)
         """
-        priority_queue = [(0, start)]
-        came_from = {}
-        cost_so_far = {start: 0}
+        started_ns = time.perf_counter_ns()
+        cells = self.cells
+        moves = self.moves
+        corner_cutting = self.corner_cutting
+        start_index = self.index_of(start)
+        goal_index = self.index_of(goal)
+        record = self.start_events(events)
+        stats = SearchStats("dijkstra", pushes=1, max_frontier=1)
+        if self.disconnected(start_index, goal_index):
+            return self.finish_search(self.empty_parents(), start_index, goal_index, stats, started_ns, events)
+
+        frontier = self.make_frontier(self.max_cost + 1)
+        frontier.push(start_index, 0)
+        parents = self.new_parents()
+        cost_so_far = {start_index: 0}
         
-        while priority_queue:
-            current_cost, current = heapq.heappop(priority_queue)
+        while frontier:
+            current_cost, current = frontier.pop()
+            if current_cost > cost_so_far[current]:
+                stats.stale_pops += 1
+                continue
+            stats.expansions += 1
             
             if visualize_callback:
-                visualize_callback(current, current == goal)
+                visualize_callback(self.to_position(current), current == goal_index)
+            if record:
+                record(current)
                 
-            if current == goal:
+            if current == goal_index:
                 break
                 
-            for dy, dx in self.directions:
-                neighbor = (current[0] + dy, current[1] + dx)
+            for offset, multiplier, side_a, side_b in moves:
+                neighbor = current + offset
+                step_cost = cells[neighbor]
                 
-                if self.is_valid_position(neighbor):
-                    new_cost = cost_so_far[current] + 1
-                    
+                if step_cost:
+                    if side_a and not self.diagonal_allowed(cells[current + side_a], cells[current + side_b], corner_cutting):
+                        continue
+                    new_cost = current_cost + step_cost * multiplier
                     if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
                         cost_so_far[neighbor] = new_cost
-                        heapq.heappush(priority_queue, (new_cost, neighbor))
-                        came_from[neighbor] = current
-                        
-        return came_from
+                        frontier.push(neighbor, new_cost)
+                        parents[neighbor] = current
+                        stats.pushes += 1
+
+            if len(frontier) > stats.max_frontier:
+                stats.max_frontier = len(frontier)
+
+        stats.path_cost = cost_so_far[goal_index] if self.goal_reached(parents, start_index, goal_index) else None
+        return self.finish_search(parents, start_index, goal_index, stats, started_ns, events)
         
-    def dfs(self, start, goal, visualize_callback=None):
-        """Depth-First Search algorithm
+    def dfs(self, start, goal, visualize_callback=None, events=None):
+        """Depth-First Search algorithm (unweighted: terrain costs are ignored)
         
         Args:
             start: Tuple (row, col) of start position
             goal: Tuple (row, col) of goal position
             visualize_callback: Function to call for visualization during search
+            events: Optional SearchEvents receiving batched expansion events
             
         Returns:
-            came_from: Dictionary containing the path connections
+            came_from: SearchTree of parent links, with .stats (path() gives the packed Path)
         """
-        stack = [start]
-        came_from = {}
-        visited = set()
+        started_ns = time.perf_counter_ns()
+        cells = self.cells
+        offsets = self.offsets
+        start_index = self.index_of(start)
+        goal_index = self.index_of(goal)
+        record = self.start_events(events)
+        stats = SearchStats("dfs", pushes=1, max_frontier=1)
+        if self.disconnected(start_index, goal_index):
+            return self.finish_search(self.empty_parents(), start_index, goal_index, stats, started_ns, events)
+
+        stack = [start_index]
+        parents = self.new_parents()
+        visited = bytearray(len(cells))
         
         while stack:
             current = stack.pop()
             
             if visualize_callback:
-                visualize_callback(current, current == goal)
+                visualize_callback(self.to_position(current), current == goal_index)
+            if record:
+                record(current)
                 
-            if current == goal:
+            if current == goal_index:
+                stats.expansions += 1
                 break
                 
-            if current in visited:
+            if visited[current]:
+                stats.stale_pops += 1
                 continue
-            visited.add(current)
+            visited[current] = 1
+            stats.expansions += 1
             
-            for dy, dx in self.directions:
-                neighbor = (current[0] + dy, current[1] + dx)
+            for offset in offsets:
+                neighbor = current + offset
                 
-                if (self.is_valid_position(neighbor) and neighbor not in visited):
-                    came_from[neighbor] = current
+                if cells[neighbor] and not visited[neighbor]:
+                    parents[neighbor] = current
                     stack.append(neighbor)
+                    stats.pushes += 1
+
+            if len(stack) > stats.max_frontier:
+                stats.max_frontier = len(stack)
                     
-        return came_from
\ No newline at end of file
+        return self.finish_search(parents, start_index, goal_index, stats, started_ns, events)
+
+    def bidirectional_bfs(self, start, goal, visualize_callback=None, events=None):
+        """Bidirectional Breadth-First Search (unweighted: terrain costs are ignored)
+
+        Whole BFS layers are expanded alternately from start and goal, always growing
+        the smaller side, until a cell is reached by both. The path has the same length
+        as bfs's. The returned tree holds the forward search plus the path to the goal.
+        
+        Args:
+            start: Tuple (row, col) of start position
+            goal: Tuple (row, col) of goal position
+            visualize_callback: Function to call for visualization during search
+            events: Optional SearchEvents receiving batched expansion events
+            
+        Returns:
+            came_from: SearchTree of parent links, with .stats (path() gives the packed Path)
+        """
+        started_ns = time.perf_counter_ns()
+        cells = self.cells
+        offsets = self.offsets
+        start_index = self.index_of(start)
+        goal_index = self.index_of(goal)
+        record = self.start_events(events)
+        stats = SearchStats("bidirectional_bfs", pushes=2, max_frontier=2)
+        # The backward search needs a goal cell to start from
+        if goal_index is None or self.disconnected(start_index, goal_index):
+            return self.finish_search(self.empty_parents(), start_index, goal_index, stats, started_ns, events)
+
+        # The backward tree stores, for every cell, the next cell towards the goal
+        parents = (self.new_parents(), self.new_parents())
+        parents[0][start_index] = start_index
+        parents[1][goal_index] = goal_index
+        layers = [[start_index], [goal_index]]
+        meet = start_index if start_index == goal_index else None
+
+        while meet is None and layers[0] and layers[1]:
+            side = 0 if len(layers[0]) <= len(layers[1]) else 1
+            own = parents[side]
+            other = parents[1 - side]
+            next_layer = []
+
+            for current in layers[side]:
+                stats.expansions += 1
+                if visualize_callback:
+                    visualize_callback(self.to_position(current), current == goal_index)
+                if record:
+                    record(current)
+
+                for offset in offsets:
+                    neighbor = current + offset
+                    if cells[neighbor] and own[neighbor] == UNREACHED:
+                        own[neighbor] = current
+                        next_layer.append(neighbor)
+                        stats.pushes += 1
+                        # Every meeting found in the first meeting layer gives the same length
+                        if other[neighbor] != UNREACHED:
+                            meet = neighbor
+                            break
+                if meet is not None:
+                    break
+
+            layers[side] = next_layer
+            if len(layers[0]) + len(layers[1]) > stats.max_frontier:
+                stats.max_frontier = len(layers[0]) + len(layers[1])
+
+        if meet is not None:
+            self.join_trees(parents[0], parents[1], meet, goal_index)
+
+        return self.finish_search(parents[0], start_index, goal_index, stats, started_ns, events)
+
+    def bidirectional_dijkstra(self, start, goal, visualize_callback=None, events=None):
+        """Bidirectional Dijkstra's algorithm
+
+        Entering a cell costs its terrain cost (1 for plain open cells). Searches from
+        both ends (see bidirectional_search); the path cost equals dijkstra's.
+        
+        Args:
+            start: Tuple (row, col) of start position
+            goal: Tuple (row, col) of goal position
+            visualize_callback: Function to call for visualization during search
+            events: Optional SearchEvents receiving batched expansion events
+            
+        Returns:
+            came_from: SearchTree of parent links, with .stats (path() gives the packed Path)
+        """
+        return self.bidirectional_search("bidirectional_dijkstra", start, goal, None, visualize_callback, events)
+
+    def bidirectional_a_star(self, start, goal, visualize_callback=None, events=None):
+        """Bidirectional A*
+
+        Entering a cell costs its terrain cost (1 for plain open cells). Both searches
+        use the average of the distance estimates to goal and to start (Manhattan or
+        octile; landmarks are not used), which keeps the two directions consistent
+        with each other. The path cost equals a_star's.
+        
+        Args:
+            start: Tuple (row, col) of start position
+            goal: Tuple (row, col) of goal position
+            visualize_callback: Function to call for visualization during search
+            events: Optional SearchEvents receiving batched expansion events
+            
+        Returns:
+            came_from: SearchTree of parent links, with .stats (path() gives the packed Path)
+        """
+        to_goal = self.make_heuristic(self.index_of(goal), use_landmarks=False)
+        to_start = self.make_heuristic(self.index_of(start), use_landmarks=False)
+
+        def potential(index):
+            return (to_goal(index) - to_start(index)) / 2
+
+        return self.bidirectional_search("bidirectional_a_star", start, goal, potential, visualize_callback, events)
+
+    def bidirectional_search(self, algorithm, start, goal, potential, visualize_callback, events):
+        """
+        Shared search loop of bidirectional_dijkstra and bidirectional_a_star
+
+        The forward search orders cells by g + potential and the backward search by
+        g - potential (potential None means 0, i.e. plain Dijkstra). Each step expands
+        the side with the smaller frontier. Whenever a cell gets a better distance and
+        is also reached from the other side, the path through it becomes a candidate.
+        The search stops once the two lowest queued priorities add up to at least the
+        best candidate's cost. With a potential averaged from consistent estimates,
+        no path cheaper than that candidate can be found after this point.
+        """
+        started_ns = time.perf_counter_ns()
+        cells = self.cells
+        moves = self.moves
+        corner_cutting = self.corner_cutting
+        start_index = self.index_of(start)
+        goal_index = self.index_of(goal)
+        record = self.start_events(events)
+        stats = SearchStats(algorithm, pushes=2, max_frontier=2)
+        # The backward search needs a goal cell to start from
+        if goal_index is None or self.disconnected(start_index, goal_index):
+            return self.finish_search(self.empty_parents(), start_index, goal_index, stats, started_ns, events)
+
+        if potential is None:
+            frontiers = (self.make_frontier(self.max_cost + 1), self.make_frontier(self.max_cost + 1))
+            frontiers[0].push(start_index, 0)
+            frontiers[1].push(goal_index, 0)
+        else:
+            # Averaged potentials are not integers
+            frontiers = (HeapQueue(), HeapQueue())
+            frontiers[0].push(start_index, potential(start_index))
+            frontiers[1].push(goal_index, -potential(goal_index))
+
+        # The backward tree stores, for every cell, the next cell towards the goal
+        parents = (self.new_parents(), self.new_parents())
+        g_score = ({start_index: 0}, {goal_index: 0})
+        best_cost = 0 if start_index == goal_index else math.inf
+        meet = start_index if start_index == goal_index else None
+
+        while frontiers[0] and frontiers[1]:
+            if frontiers[0].peek_priority() + frontiers[1].peek_priority() >= best_cost:
+                break
+
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            sign = 1 if side == 0 else -1
+            frontier = frontiers[side]
+            own_g = g_score[side]
+            other_g = g_score[1 - side]
+            own_parents = parents[side]
+
+            priority, current = frontier.pop()
+            current_g = own_g[current]
+            if priority > (current_g if potential is None else current_g + sign * potential(current)):
+                stats.stale_pops += 1
+                continue
+            stats.expansions += 1
+
+            if visualize_callback:
+                visualize_callback(self.to_position(current), current == goal_index)
+            if record:
+                record(current)
+
+            for offset, multiplier, side_a, side_b in moves:
+                neighbor = current + offset
+                if not cells[neighbor]:
+                    continue
+                if side_a and not self.diagonal_allowed(cells[current + side_a], cells[current + side_b], corner_cutting):
+                    continue
+                # Going backwards, the forward step runs from neighbor into current
+                step_cost = cells[neighbor] if side == 0 else cells[current]
+                temp_g_score = current_g + step_cost * multiplier
+
+                if neighbor not in own_g or temp_g_score < own_g[neighbor]:
+                    own_g[neighbor] = temp_g_score
+                    own_parents[neighbor] = current
+                    frontier.push(neighbor, temp_g_score if potential is None else temp_g_score + sign * potential(neighbor))
+                    stats.pushes += 1
+
+                    if neighbor in other_g and temp_g_score + other_g[neighbor] < best_cost:
+                        best_cost = temp_g_score + other_g[neighbor]
+                        meet = neighbor
+
+            if len(frontiers[0]) + len(frontiers[1]) > stats.max_frontier:
+                stats.max_frontier = len(frontiers[0]) + len(frontiers[1])
+
+        if meet is not None:
+            stats.path_cost = best_cost
+            self.join_trees(parents[0], parents[1], meet, goal_index)
+
+        return self.finish_search(parents[0], start_index, goal_index, stats, started_ns, events)
+
+    def join_trees(self, forward, backward, meet, goal_index):
+        """Extends the forward parent array along the backward tree's path from meet to the goal"""
+        current = meet
+        while current != goal_index:
+            following = backward[current]
+            forward[following] = current
+            current = following
+
+    def start_events(self, events):
+        """Prepares an optional SearchEvents for a new search; returns its record function (or None)"""
+        if events is None:
+            return None
+        events.start(self)
+        return events.record
+
+    def finish_search(self, parents, start_index, goal_index, stats, started_ns, events):
+        """Flushes pending events and wraps a parent array (see new_parents) into the returned SearchTree"""
+        if events is not None:
+            events.flush()
+        stats.elapsed_ns = time.perf_counter_ns() - started_ns
+        return SearchTree(parents, self.stride, start_index, goal_index, stats)
+
+    def search(self, algorithm, start, goal, visualize_callback=None, events=None):
+        """
+        Runs the named search method (one of SEARCHES), answering repeated queries from self.result_cache
+
+        The key is (grid version, algorithm, start, goal, options), where options are
+        the settings that can change the result: movement model, queue type, tie
+        breaking, bfs engine, epsilon and whether landmarks are attached. A hit returns the
+        same SearchTree as the first call, stats included; it must not be modified.
+        Calls with a visualize_callback or events always search, since those need
+        every expansion.
+        """
+        if algorithm not in SEARCHES:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        method = getattr(self, algorithm)
+        cache = self.result_cache
+        if cache is None or visualize_callback is not None or events is not None:
+            return method(start, goal, visualize_callback, events)
+
+        options = (self.connectivity, self.corner_cutting, self.queue_type, self.tie_break,
+                   self.bfs_engine, self.epsilon, self.landmarks is not None)
+        key = (self.version, algorithm, start, goal, options)
+        tree = cache.get(key)
+        if tree is None:
+            tree = method(start, goal)
+            # Trees of searches that never started share one parent array (see empty_parents)
+            size = 0 if tree.parents is self.unreached_parents else sys.getsizeof(tree.parents)
+            cache.put(key, tree, size)
+        return tree
+
+    def solve_many(self, pairs, algorithm="a_star"):
+        """
+        Solves many (start, goal) queries against the current grid in a single call
+
+        The per-cell buffers are allocated once and reused by every query. For "bfs"
+        and "dijkstra", queries sharing a start are answered by one sweep that stops
+        once every one of their goals has been settled. "dijkstra" and "a_star" honour
+        terrain costs and the movement model (see set_movement), as the single-query
+        searches do; "bfs" and "dfs" treat every open cell alike and step 4-connected.
+
+        Args:
+            pairs: Sequence of (start, goal) tuples, each a (row, col) position
+            algorithm: One of "a_star", "bfs", "dijkstra" or "dfs"
+
+        Returns:
+            paths: List aligned with pairs; each entry is the list of (row, col)
+                   positions from start to goal inclusive, or None if unreachable
+        """
+        if algorithm not in ("a_star", "bfs", "dijkstra", "dfs"):
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+
+        self.ensure_buffers()
+        paths = [None] * len(pairs)
+
+        if algorithm in ("bfs", "dijkstra"):
+            sweep = self.bfs_sweep if algorithm == "bfs" else self.dijkstra_sweep
+
+            queries_by_start = {}
+            for k, (start, goal) in enumerate(pairs):
+                if self.is_solvable(start, goal):
+                    queries_by_start.setdefault(start, []).append(k)
+
+            for start, queries in queries_by_start.items():
+                start_index = self.to_index(start)
+                generation = sweep(start_index, {self.to_index(pairs[k][1]) for k in queries})
+                for k in queries:
+                    paths[k] = self.trace_path(start_index, self.to_index(pairs[k][1]), generation)
+
+        elif algorithm == "a_star":
+            for k, (start, goal) in enumerate(pairs):
+                if self.is_solvable(start, goal):
+                    start_index = self.to_index(start)
+                    goal_index = self.to_index(goal)
+                    generation = self.a_star_sweep(start_index, goal_index)
+                    paths[k] = self.trace_path(start_index, goal_index, generation)
+
+        else:
+            for k, (start, goal) in enumerate(pairs):
+                if self.is_solvable(start, goal):
+                    path = self.dfs(start, goal).path()
+                    if path is not None:
+                        paths[k] = path.positions()
+
+        return paths
+
+    def is_solvable(self, start, goal):
+        """Whether a solve_many query needs a search: both ends open and not known to be disconnected"""
+        return (self.is_valid_position(start) and self.is_valid_position(goal) and
+                not self.disconnected(self.to_index(start), self.to_index(goal)))
+
+    def trace_path(self, start_index, goal_index, generation):
+        """Walks the parent buffer back from goal to start, returning (row, col) positions"""
+        if self.stamp[goal_index] != generation:
+            return None
+
+        parent = self.parent
+        stride = self.stride
+        path = []
+        current = goal_index
+        while current != start_index:
+            path.append((current // stride - 1, current % stride - 1))
+            current = parent[current]
+        path.append((start_index // stride - 1, start_index % stride - 1))
+        path.reverse()
+        return path
+
+    def bfs_sweep(self, start_index, goal_indices):
+        """Buffer-based BFS from start_index until every goal index is reached; returns the generation"""
+        cells = self.cells
+        offsets = self.offsets
+        stamp = self.stamp
+        parent = self.parent
+        generation = self.next_generation()
+
+        remaining = set(goal_indices)
+        remaining.discard(start_index)
+        stamp[start_index] = generation
+        queue = deque([start_index])
+
+        while queue and remaining:
+            current = queue.popleft()
+            for offset in offsets:
+                neighbor = current + offset
+                if cells[neighbor] and stamp[neighbor] != generation:
+                    stamp[neighbor] = generation
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+                    remaining.discard(neighbor)
+
+        return generation
+
+    def dijkstra_sweep(self, start_index, goal_indices):
+        """Buffer-based Dijkstra from start_index until every goal index is settled; returns the generation"""
+        cells = self.cells
+        moves = self.moves
+        corner_cutting = self.corner_cutting
+        diagonal_allowed = self.diagonal_allowed
+        stamp = self.stamp
+        parent = self.parent
+        distance = self.distance
+        generation = self.next_generation()
+
+        remaining = set(goal_indices)
+        stamp[start_index] = generation
+        distance[start_index] = 0
+        priority_queue = [(0, start_index)]
+
+        while priority_queue and remaining:
+            current_cost, current = heapq.heappop(priority_queue)
+            if current_cost > distance[current]:
+                continue  # stale entry
+            remaining.discard(current)
+
+            for offset, multiplier, side_a, side_b in moves:
+                neighbor = current + offset
+                step_cost = cells[neighbor]
+                if not step_cost:
+                    continue
+                if side_a and not diagonal_allowed(cells[current + side_a], cells[current + side_b], corner_cutting):
+                    continue
+                new_cost = current_cost + step_cost * multiplier
+                if stamp[neighbor] != generation or new_cost < distance[neighbor]:
+                    stamp[neighbor] = generation
+                    distance[neighbor] = new_cost
+                    parent[neighbor] = current
+                    heapq.heappush(priority_queue, (new_cost, neighbor))
+
+        return generation
+
+    def a_star_sweep(self, start_index, goal_index):
+        """
+        Buffer-based A* from start_index to goal_index; returns the generation
+
+        Uses the same frontier and tie-breaking as a_star, so both return the same path.
+        """
+        cells = self.cells
+        moves = self.moves
+        corner_cutting = self.corner_cutting
+        diagonal_allowed = self.diagonal_allowed
+        stamp = self.stamp
+        parent = self.parent
+        g_score = self.distance
+        generation = self.next_generation()
+        heuristic = self.make_heuristic(goal_index)
+
+        stamp[start_index] = generation
+        g_score[start_index] = 0
+        frontier = self.make_frontier(self.max_cost + 2)
+        frontier.push(start_index, heuristic(start_index))
+        lazy = not frontier.decrease_key
+        tie_sign = self.tie_sign()
+
+        while frontier:
+            priority, current = frontier.pop()
+            current_g = g_score[current]
+            if lazy and priority > current_g + heuristic(current):
+                continue  # stale entry
+            if current == goal_index:
+                break
+
+            for offset, multiplier, side_a, side_b in moves:
+                neighbor = current + offset
+                step_cost = cells[neighbor]
+                if not step_cost:
+                    continue
+                if side_a and not diagonal_allowed(cells[current + side_a], cells[current + side_b], corner_cutting):
+                    continue
+                new_g = current_g + step_cost * multiplier
+                if stamp[neighbor] != generation or new_g < g_score[neighbor]:
+                    stamp[neighbor] = generation
+                    g_score[neighbor] = new_g
+                    parent[neighbor] = current
+                    frontier.push(neighbor, new_g + heuristic(neighbor), tie_sign * new_g)
+
+        return generation
@@ -0,0 +1,289 @@
+'''
+Path planning as a local network service.
+
+The service listens on a Unix socket or a localhost TCP port and speaks
+newline-delimited JSON: every request is one JSON object on one line, and
+every reply is one line carrying the request's "id". A connection may send
+many requests without waiting; replies come back as searches finish, so they
+can arrive out of order.
+
+    {"id": 1, "op": "plan", "algorithm": "a_star", "start": [0, 0], "goal": [9, 9]}
+    -> {"id": 1, "coalesced": false, "map": 1, "path": [[0, 0], ...], "length": 18, "cost": 18, "expanded": 97}
+
+    {"id": 2, "op": "load_map", "path": "warehouse.grid"}
+    -> {"id": 2, "map": 2, "name": "warehouse.grid", "height": 512, "width": 512}
+
+    {"id": 3, "op": "status"}
+    -> {"id": 3, "map": 2, ..., "requests": 3, "dispatched": 1, "coalesced": 0, "in_flight": 0}
+
+"path" is null when the goal cannot be reached, and "bound" (see
+SearchStats.suboptimality) is null except for weighted_a_star. Failed requests
+get {"id": ..., "error": "..."} instead.
+
+Searches run on a thread pool, so the event loop keeps accepting, reading and
+answering requests while they run. The searches are pure Python and take
+turns on the GIL: the pool keeps the service responsive, while spreading a
+large batch over several cores is ParallelPlanner's job. Two things keep the
+pool from doing the same work twice:
+- Requests identical to one already being searched (same map, algorithm,
+  start and goal) wait for that search instead of starting another.
+- Each map's PathfindingAlgorithms keeps its result cache, so repeated
+  queries are answered without searching.
+
+A map is loaded once, on the pool, into a LoadedMap, which is never modified
+afterwards. load_map replaces the service's current map with one assignment.
+Requests that arrived before the swap finish on the map they started with;
+later ones use the new map.
+
+Usage:
+    python -m planning_service warehouse.grid --socket /tmp/planner.sock
+    python -m planning_service warehouse.map --port 8765
+'''
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from connectivity import ComponentIndex
+from map_files import load_planner
+from pathfinding import SEARCHES
+
+# Longest accepted request line, in bytes
+LINE_LIMIT = 1 << 20
+
+
+def prepare(pathfinding):
+    """Attaches a ComponentIndex, so searches between disconnected cells return without expanding anything"""
+    if pathfinding.components is None:
+        pathfinding.use_components(ComponentIndex(pathfinding))
+    return pathfinding
+
+
+def open_planner(path):
+    """Loads a map file into a prepared planner (run on the pool: large maps take a while)"""
+    return prepare(load_planner(path))
+
+
+class LoadedMap:
+    """A prepared planner; generation numbers the maps a service has installed"""
+    def __init__(self, pathfinding, generation, name):
+        self.pathfinding = pathfinding
+        self.generation = generation
+        self.name = name
+        self.height = pathfinding.grid_height
+        self.width = pathfinding.grid_width
+
+    def position(self, value, field):
+        """Checks that a request's [row, col] lies on this map and returns it as a tuple"""
+        if (not isinstance(value, list) or len(value) != 2
+                or not all(isinstance(v, int) and not isinstance(v, bool) for v in value)):
+            raise ValueError(f"{field} must be [row, col]")
+        row, col = value
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            raise ValueError(f"{field} {value} is outside the {self.height}x{self.width} map")
+        return (row, col)
+
+
+def solve(loaded, algorithm, start, goal):
+    """Runs one search on a pool thread and returns the reply's fields, already encoded as a JSON object"""
+    tree = loaded.pathfinding.search(algorithm, start, goal)
+    path = tree.path()
+    return json.dumps({
+        "map": loaded.generation,
+        "path": None if path is None else path.positions(),
+        "length": None if path is None else path.length,
+        "cost": None if path is None else path.cost,
+        "expanded": tree.stats.expansions,
+        "bound": tree.stats.suboptimality,
+    }, separators=(",", ":"))
+
+
+class PlanningService:
+    """
+    Answers newline-delimited JSON planning requests from any number of connections.
+
+    Usage:
+        service = PlanningService(load_planner("warehouse.grid"), "warehouse.grid")
+        server = await service.serve_unix("/tmp/planner.sock")
+        await server.serve_forever()
+    """
+    def __init__(self, pathfinding=None, name=None, workers=2):
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="planner")
+        self.map = None
+        self.generation = 0
+        # (map generation, algorithm, start, goal) -> future of the search answering it
+        self.in_flight = {}
+        self.requests = 0
+        self.dispatched = 0
+        self.coalesced = 0
+        self.operations = {"plan": self.plan, "load_map": self.load_map, "status": self.status}
+        if pathfinding is not None:
+            self.install(pathfinding, name)
+
+    def install(self, pathfinding, name=None):
+        """Makes pathfinding the map answering new requests (call from the event loop's thread)"""
+        self.generation += 1
+        self.map = LoadedMap(prepare(pathfinding), self.generation, name)
+        return self.map
+
+    def close(self):
+        """Waits for running searches, then stops the worker threads"""
+        self.executor.shutdown()
+
+    # --- Operations ---
+
+    async def plan(self, request):
+        loaded = self.map
+        if loaded is None:
+            raise ValueError("no map loaded")
+        algorithm = request.get("algorithm", "a_star")
+        if algorithm not in SEARCHES:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        start = loaded.position(request.get("start"), "start")
+        goal = loaded.position(request.get("goal"), "goal")
+
+        key = (loaded.generation, algorithm, start, goal)
+        future = self.in_flight.get(key)
+        coalesced = future is not None
+        if coalesced:
+            self.coalesced += 1
+        else:
+            self.dispatched += 1
+            future = asyncio.get_running_loop().run_in_executor(self.executor, solve, loaded, algorithm, start, goal)
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        # A client hanging up must not cancel a search other requests are waiting for
+        fields = await asyncio.shield(future)
+        return '"coalesced":' + ("true," if coalesced else "false,") + fields[1:]
+
+    async def load_map(self, request):
+        path = request.get("path")
+        if not isinstance(path, str):
+            raise ValueError("path must be a map file name")
+        pathfinding = await asyncio.get_running_loop().run_in_executor(self.executor, open_planner, path)
+        loaded = self.install(pathfinding, path)
+        return self.encode({"map": loaded.generation, "name": loaded.name, "height": loaded.height, "width": loaded.width})[1:]
+
+    async def status(self, request):
+        loaded = self.map
+        cache = None if loaded is None else loaded.pathfinding.result_cache
+        return self.encode({
+            "map": None if loaded is None else loaded.generation,
+            "name": None if loaded is None else loaded.name,
+            "height": None if loaded is None else loaded.height,
+            "width": None if loaded is None else loaded.width,
+            "requests": self.requests,
+            "dispatched": self.dispatched,
+            "coalesced": self.coalesced,
+            "in_flight": len(self.in_flight),
+            "cache_hits": None if cache is None else cache.hits,
+        })[1:]
+
+    # --- Connections ---
+
+    @staticmethod
+    def encode(reply):
+        return json.dumps(reply, separators=(",", ":"))
+
+    async def answer(self, line):
+        """The reply line for one request line"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("a request must be a JSON object")
+            request_id = request.get("id")
+            operation = self.operations.get(request.get("op", "plan"))
+            if operation is None:
+                raise ValueError(f"Unknown op: {request.get('op')}")
+            self.requests += 1
+            fields = await operation(request)
+            return '{"id":' + self.encode(request_id) + "," + fields + "\n"
+        except Exception as error:
+            # Bad requests, unreadable map files and failed searches are all reported to the client
+            return self.encode({"id": request_id, "error": str(error)}) + "\n"
+
+    async def respond(self, line, writer, write_lock):
+        reply = await self.answer(line)
+        async with write_lock:
+            writer.write(reply.encode())
+            await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        """Answers one connection's requests concurrently until it closes"""
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(self.encode({"id": None, "error": "request line too long"}).encode() + b"\n")
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self.respond(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve_unix(self, path):
+        """Starts listening on a Unix socket at path (replacing a stale socket file); returns the asyncio Server"""
+        if os.path.exists(path):
+            os.unlink(path)
+        return await asyncio.start_unix_server(self.handle_connection, path, limit=LINE_LIMIT)
+
+    async def serve_tcp(self, port, host="127.0.0.1"):
+        """Starts listening on a localhost TCP port; returns the asyncio Server"""
+        return await asyncio.start_server(self.handle_connection, host, port, limit=LINE_LIMIT)
+
+
+async def serve(arguments):
+    pathfinding = await asyncio.get_running_loop().run_in_executor(None, open_planner, arguments.map)
+    service = PlanningService(pathfinding, arguments.map, arguments.workers)
+    if arguments.socket:
+        server = await service.serve_unix(arguments.socket)
+        address = arguments.socket
+    else:
+        server = await service.serve_tcp(arguments.port)
+        address = f"127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    print(f"Serving {arguments.map} ({service.map.height}x{service.map.width}) on {address}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m planning_service",
+        description="Serve path planning requests as newline-delimited JSON over a local socket.",
+    )
+    parser.add_argument("map", help="map file to load at startup (.map, .pgm, .png or .grid)")
+    parser.add_argument("--socket", help="listen on this Unix socket path")
+    parser.add_argument("--port", type=int, default=8765,
+                        help="listen on this localhost TCP port when --socket is not given (default: 8765, 0 picks a free port)")
+    parser.add_argument("--workers", type=int, default=2, help="search threads (default: 2)")
+    arguments = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(arguments))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+'''
+ComponentIndex against BFS reachability on seeded benchmark maps, as cells are
+blocked and opened.
+
+Run with: python -m unittest discover tests
+'''
+import random
+import unittest
+
+from connectivity import ComponentIndex
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import maze_map, random_map, rooms_map
+
+SIZE = 40
+
+
+class ComponentIndexTest(unittest.TestCase):
+    def maps(self):
+        yield "random", random_map(SIZE, SIZE, density=0.35, seed=5)
+        yield "maze", maze_map(SIZE, SIZE, seed=5)
+        yield "rooms", rooms_map(SIZE, SIZE, room_size=10, seed=5)
+
+    def assert_matches_bfs(self, pathfinding, components, rng, grid, **context):
+        cells = [(i, j) for i in range(SIZE) for j in range(SIZE) if grid[i][j] != "X"]
+        for _ in range(10):
+            start, goal = rng.sample(cells, 2)
+            with self.subTest(start=start, goal=goal, **context):
+                reachable = pathfinding.bfs(start, goal).path() is not None
+                self.assertEqual(components.connected(start, goal), reachable)
+
+    def test_connected_matches_bfs_after_edits(self):
+        for name, grid in self.maps():
+            pathfinding = PathfindingAlgorithms(grid, SIZE, SIZE)
+            components = ComponentIndex(pathfinding)
+            rng = random.Random(1)
+            self.assert_matches_bfs(pathfinding, components, rng, grid, map=name, step=0)
+            for step in range(1, 31):
+                # Alternate between blocking open cells (splits) and opening blocked ones (merges)
+                target = "O" if step % 2 else "X"
+                candidates = [(i, j) for i in range(SIZE) for j in range(SIZE) if grid[i][j] == target]
+                changed = rng.sample(candidates, 5)
+                for i, j in changed:
+                    grid[i][j] = "X" if target == "O" else "O"
+                pathfinding.update_cells(changed)
+                self.assert_matches_bfs(pathfinding, components, rng, grid, map=name, step=step)
+            components.close()
+
+    def test_off_grid_positions_are_not_connected(self):
+        grid = random_map(SIZE, SIZE, density=0.0, seed=5)
+        components = ComponentIndex(PathfindingAlgorithms(grid, SIZE, SIZE))
+        # (-1, SIZE + 3) would wrap onto the cell (0, 1) of the flat array
+        for start, goal in (((0, 0), (-1, SIZE + 3)), ((-1, SIZE + 3), (0, 0)), ((0, 0), (SIZE, 0))):
+            with self.subTest(start=start, goal=goal):
+                self.assertFalse(components.connected(start, goal))
+        self.assertTrue(components.connected((0, 0), (0, 1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+'''
+Flow field distances against Dijkstra on seeded benchmark maps.
+
+Run with: python -m unittest discover tests
+'''
+import random
+import unittest
+
+from flow_field import FlowField, FlowFieldCache
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import maze_map, open_map, random_map, terrain_map
+
+SIZE = 64
+
+
+class FlowFieldTest(unittest.TestCase):
+    def maps(self):
+        # Open and random maps grow waves wide enough for bitset ticks; the maze stays scalar
+        yield "open", open_map(SIZE, SIZE)
+        yield "random", random_map(SIZE, SIZE, density=0.25, seed=7)
+        yield "maze", maze_map(SIZE - 1, SIZE - 1, seed=7)
+        yield "terrain", terrain_map(SIZE, SIZE, seed=7)
+
+    def test_distances_match_dijkstra(self):
+        for name, grid in self.maps():
+            height, width = len(grid), len(grid[0])
+            pathfinding = PathfindingAlgorithms(grid, height, width)
+            cells = [(i, j) for i in range(height) for j in range(width) if grid[i][j] != "X"]
+            rng = random.Random(1)
+            for goal in rng.sample(cells, 3):
+                field = FlowField(pathfinding, goal)
+                for start in rng.sample(cells, 25):
+                    with self.subTest(map=name, start=start, goal=goal):
+                        expected = pathfinding.dijkstra(start, goal).stats.path_cost
+                        self.assertEqual(field.distance_to_goal(start), expected)
+                        path = field.path(start)
+                        if expected is None:
+                            self.assertIsNone(path)
+                            continue
+                        positions = path.positions()
+                        self.assertEqual((positions[0], positions[-1]), (start, goal))
+                        self.assertEqual(path.cost, expected)
+                        self.assertEqual(sum(pathfinding.cells[pathfinding.to_index(p)] for p in positions[1:]), expected)
+
+    def test_cache_is_cleared_by_cell_edits(self):
+        grid = random_map(SIZE, SIZE, density=0.2, seed=7)
+        pathfinding = PathfindingAlgorithms(grid, SIZE, SIZE)
+        fields = FlowFieldCache(pathfinding)
+        goal = (SIZE - 1, SIZE - 1)
+        rng = random.Random(2)
+        for step in range(5):
+            changed = [cell for cell in rng.sample([(i, j) for i in range(SIZE) for j in range(SIZE)], 40) if cell != goal]
+            for i, j in changed:
+                grid[i][j] = "O" if grid[i][j] == "X" else "X"
+            pathfinding.update_cells(changed)
+            for start in ((0, 0), (SIZE // 2, 3), (5, SIZE - 2)):
+                with self.subTest(step=step, start=start):
+                    expected = pathfinding.dijkstra(start, goal).stats.path_cost if grid[start[0]][start[1]] != "X" else None
+                    self.assertEqual(fields.field(goal).distance_to_goal(start), expected)
+        fields.close()
+
+    def test_off_grid_positions(self):
+        pathfinding = PathfindingAlgorithms(open_map(SIZE, SIZE), SIZE, SIZE)
+        # (-1, SIZE + 3) would wrap onto the cell (0, 1) of the flat array
+        field = FlowField(pathfinding, (0, 0))
+        for position in ((-1, SIZE + 3), (SIZE, 0), (0, -1)):
+            with self.subTest(position=position):
+                self.assertIsNone(field.distance_to_goal(position))
+                self.assertIsNone(field.next_step(position))
+                self.assertIsNone(field.path(position))
+        field = FlowField(pathfinding, (-1, SIZE + 3))
+        self.assertIsNone(field.distance_to_goal((0, 1)))
+        self.assertIsNone(field.path((0, 0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
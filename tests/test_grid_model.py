@@ -0,0 +1,114 @@
+'''
+GridModel bookkeeping and change log.
+
+Run with: python -m unittest discover tests
+'''
+import random
+import unittest
+
+from grid_model import GridModel
+from benchmarks.maps import random_map
+
+SIZE = 20
+
+
+def scan(grid):
+    """Start, goal, obstacle count and path cells found by a full scan"""
+    cells = [(i, j, value) for i, row in enumerate(grid) for j, value in enumerate(row)]
+    start = next(((i, j) for i, j, value in cells if value == "S"), None)
+    goal = next(((i, j) for i, j, value in cells if value == "G"), None)
+    obstacles = sum(value == "X" for _, _, value in cells)
+    path = {(i, j) for i, j, value in cells if value == "P"}
+    return start, goal, obstacles, path
+
+
+class GridModelTest(unittest.TestCase):
+    def setUp(self):
+        self.grid = random_map(SIZE, SIZE, density=0.2, seed=9)
+        self.model = GridModel(self.grid, SIZE, SIZE)
+
+    def assert_tracked(self):
+        model = self.model
+        self.assertEqual((model.start, model.goal, model.obstacle_count, model.path_cells), scan(self.grid))
+
+    def test_tracking_matches_full_scan(self):
+        rng = random.Random(1)
+        self.assert_tracked()
+        for step in range(300):
+            row, col = rng.randrange(SIZE), rng.randrange(SIZE)
+            action = rng.choice(("cell", "cell", "start", "goal", "path", "clear"))
+            if action == "cell":
+                self.model.set_cell(row, col, rng.choice(("O", "X", "3", "P")))
+            elif action == "start":
+                self.model.set_start(rng.choice(((row, col), None)))
+            elif action == "goal":
+                self.model.set_goal(rng.choice(((row, col), None)))
+            elif action == "path":
+                self.model.mark_path([(row, k) for k in range(SIZE)])
+            else:
+                self.model.clear_path()
+            with self.subTest(step=step, action=action):
+                self.assert_tracked()
+
+    def test_single_start_and_goal(self):
+        self.model.set_start((0, 0))
+        self.model.set_start((1, 1))
+        self.model.set_goal((2, 2))
+        self.model.set_cell(3, 3, "G")
+        self.assertEqual(sum(row.count("S") for row in self.grid), 1)
+        self.assertEqual(sum(row.count("G") for row in self.grid), 1)
+        self.assertEqual((self.model.start, self.model.goal), ((1, 1), (3, 3)))
+        self.assertEqual(self.grid[0][0], "O")
+
+    def test_changes(self):
+        model = self.model
+        everything = model.subscribe()
+        costs = model.subscribe(costs_only=True)
+        self.grid[0][1] = self.grid[0][2] = self.grid[0][3] = self.grid[0][4] = "O"
+        self.grid[5][5] = "X"
+        model.replace(self.grid, SIZE, SIZE)
+        self.assertIsNone(model.changes(everything))
+        self.assertIsNone(model.changes(costs))
+
+        model.set_cell(0, 1, "X")
+        model.set_start((0, 2))
+        model.set_cell(0, 1, "O")
+        model.set_cell(5, 5, "X")  # unchanged: not logged
+        model.set_cell(0, 3, "4")
+        model.mark_path([(0, 4)])
+        # Each cell once, in the order first changed
+        self.assertEqual(model.changes(everything), [(0, 1), (0, 2), (0, 3), (0, 4)])
+        # "S" and "P" cost the same as "O"
+        self.assertEqual(model.changes(costs), [(0, 1), (0, 3)])
+        self.assertEqual(model.changes(everything), [])
+
+        late = model.subscribe()
+        model.clear_path()
+        self.assertEqual(model.changes(late), [(0, 4)])
+        self.assertEqual(model.changes(costs), [])
+
+    def test_log_is_trimmed(self):
+        model = self.model
+        self.assertEqual(model.log, [])
+        # Nothing is logged without subscribers
+        model.set_cell(0, 1, "X")
+        self.assertEqual(model.log, [])
+
+        fast = model.subscribe()
+        slow = model.subscribe()
+        for col in range(SIZE):
+            model.set_cell(1, col, "X" if model.grid[1][col] != "X" else "O")
+        model.changes(fast)
+        # The slow reader still needs every entry
+        self.assertEqual(len(model.log), SIZE)
+        model.set_cell(2, 0, "X" if model.grid[2][0] != "X" else "O")
+        self.assertEqual(len(model.changes(slow)), SIZE + 1)
+        # Only the entry the fast reader has not seen is kept
+        self.assertEqual(len(model.log), 1)
+        model.unsubscribe(fast)
+        self.assertEqual(model.log, [])
+        self.assertEqual(model.changes(slow), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+'''
+HPA* against Dijkstra on seeded benchmark maps, before and after cell edits.
+
+Run with: python -m unittest discover tests
+'''
+import random
+import unittest
+
+from hierarchical import HierarchicalPlanner
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import random_map, rooms_map, terrain_map
+
+SIZE = 48
+CLUSTER_SIZE = 8
+# HPA* only crosses cluster borders at transitions. Its paths may be somewhat longer than
+# optimal, and a short hop over a border can detour along it to the nearest transition.
+MAX_COST_RATIO = 1.25
+BORDER_DETOUR = 2 * CLUSTER_SIZE
+
+
+class HierarchicalPlannerTest(unittest.TestCase):
+    def maps(self):
+        yield "random", random_map(SIZE, SIZE, density=0.2, seed=4)
+        yield "rooms", rooms_map(SIZE, SIZE, room_size=12, seed=4)
+        yield "terrain", terrain_map(SIZE, SIZE, seed=4)
+
+    def assert_bounded(self, pathfinding, planner, start, goal):
+        path = planner.plan(start, goal)
+        optimal = pathfinding.dijkstra(start, goal).stats.path_cost
+        if optimal is None:
+            self.assertIsNone(path)
+            return
+        self.assertIsNotNone(path)
+        positions = path.positions()
+        self.assertEqual((positions[0], positions[-1]), (start, goal))
+        for (i, j), (k, l) in zip(positions, positions[1:]):
+            self.assertEqual(abs(i - k) + abs(j - l), 1)
+            self.assertTrue(pathfinding.is_valid_position((k, l)))
+        self.assertGreaterEqual(path.cost, optimal - 1e-9)
+        self.assertLessEqual(path.cost, optimal * MAX_COST_RATIO + BORDER_DETOUR)
+
+    def test_reachability_and_cost_match_dijkstra(self):
+        for name, grid in self.maps():
+            pathfinding = PathfindingAlgorithms(grid, SIZE, SIZE)
+            planner = HierarchicalPlanner(pathfinding, cluster_size=CLUSTER_SIZE)
+            cells = [(i, j) for i in range(SIZE) for j in range(SIZE) if grid[i][j] != "X"]
+            rng = random.Random(1)
+            for _ in range(30):
+                start, goal = rng.sample(cells, 2)
+                with self.subTest(map=name, start=start, goal=goal):
+                    self.assert_bounded(pathfinding, planner, start, goal)
+            planner.close()
+
+    def test_after_update_cells(self):
+        for name, grid in self.maps():
+            pathfinding = PathfindingAlgorithms(grid, SIZE, SIZE)
+            planner = HierarchicalPlanner(pathfinding, cluster_size=CLUSTER_SIZE)
+            rng = random.Random(2)
+            for step in range(15):
+                changed = rng.sample([(i, j) for i in range(SIZE) for j in range(SIZE)], 20)
+                for i, j in changed:
+                    grid[i][j] = "O" if grid[i][j] == "X" else "X"
+                pathfinding.update_cells(changed)
+                cells = [(i, j) for i in range(SIZE) for j in range(SIZE) if grid[i][j] != "X"]
+                for _ in range(4):
+                    start, goal = rng.sample(cells, 2)
+                    with self.subTest(map=name, step=step, start=start, goal=goal):
+                        self.assert_bounded(pathfinding, planner, start, goal)
+            planner.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+'''
+D* Lite against BFS on seeded benchmark maps, before and after cell edits.
+
+Run with: python -m unittest discover tests
+'''
+import random
+import unittest
+
+from incremental import DStarLite
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import maze_map, random_map
+
+SIZE = 30
+
+
+def bfs_length(pathfinding, start, goal):
+    """Number of moves on the BFS path from start to goal, or None if goal is unreachable"""
+    came_from = pathfinding.bfs(start, goal)
+    if goal not in came_from:
+        return None
+    length = 0
+    while came_from[goal] is not None:
+        goal = came_from[goal]
+        length += 1
+    return length
+
+
+def open_cells(grid):
+    return [(i, j) for i, row in enumerate(grid) for j, cell in enumerate(row) if cell != "X"]
+
+
+class DStarLiteTest(unittest.TestCase):
+    def maps(self):
+        yield "random", random_map(SIZE, SIZE, density=0.2, seed=3)
+        yield "maze", maze_map(SIZE, SIZE, seed=3)
+
+    def assert_matches_bfs(self, pathfinding, planner, start, goal):
+        path = planner.plan()
+        expected = bfs_length(pathfinding, start, goal)
+        if expected is None:
+            self.assertIsNone(path)
+            return
+        self.assertIsNotNone(path)
+        self.assertEqual(len(path) - 1, expected)
+        self.assertEqual((path[0], path[-1]), (start, goal))
+        for (i, j), (k, l) in zip(path, path[1:]):
+            self.assertEqual(abs(i - k) + abs(j - l), 1)
+            self.assertTrue(pathfinding.is_valid_position((k, l)))
+
+    def test_path_length_matches_bfs(self):
+        for name, grid in self.maps():
+            pathfinding = PathfindingAlgorithms(grid, SIZE, SIZE)
+            rng = random.Random(1)
+            cells = open_cells(grid)
+            for _ in range(10):
+                start, goal = rng.sample(cells, 2)
+                with self.subTest(map=name, start=start, goal=goal):
+                    planner = DStarLite(pathfinding, start, goal)
+                    self.assert_matches_bfs(pathfinding, planner, start, goal)
+                    planner.close()
+
+    def test_replan_after_update_cells(self):
+        for name, grid in self.maps():
+            pathfinding = PathfindingAlgorithms(grid, SIZE, SIZE)
+            rng = random.Random(3)
+            start, goal = rng.sample(open_cells(grid), 2)
+            planner = DStarLite(pathfinding, start, goal)
+            planner.plan()
+            for step in range(15):
+                changed = [
+                    cell for cell in rng.sample([(i, j) for i in range(SIZE) for j in range(SIZE)], 8)
+                    if cell not in (start, goal)
+                ]
+                for i, j in changed:
+                    grid[i][j] = "O" if grid[i][j] == "X" else "X"
+                pathfinding.update_cells(changed)
+                with self.subTest(map=name, step=step):
+                    self.assert_matches_bfs(pathfinding, planner, start, goal)
+            planner.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
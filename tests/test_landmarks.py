@@ -0,0 +1,52 @@
+'''
+Landmark (ALT) cache files that cannot be loaded are rebuilt.
+
+Run with: python -m unittest discover tests
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import landmarks
+from landmarks import preprocess
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import random_map
+
+SIZE = 30
+
+
+class LandmarkCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.pathfinding = PathfindingAlgorithms(random_map(SIZE, SIZE, density=0.2, seed=1), SIZE, SIZE)
+        index = preprocess(self.pathfinding, self.cache_dir, count=4)
+        index.close()
+        self.path = os.path.join(self.cache_dir, f"{landmarks.grid_hash(self.pathfinding)}-4.alt")
+        with open(self.path, "rb") as file:
+            self.contents = file.read()
+
+    def assert_rebuilt(self, contents):
+        with open(self.path, "wb") as file:
+            file.write(contents)
+        index = preprocess(self.pathfinding, self.cache_dir, count=4)
+        index.close()
+        with open(self.path, "rb") as file:
+            self.assertEqual(file.read(), self.contents)
+
+    def test_empty_file(self):
+        self.assert_rebuilt(b"")
+
+    def test_truncated_header(self):
+        self.assert_rebuilt(self.contents[:10])
+
+    def test_truncated_table(self):
+        self.assert_rebuilt(self.contents[:len(self.contents) // 2])
+
+    def test_garbage(self):
+        self.assert_rebuilt(b"\xff" * len(self.contents))
+
+
+if __name__ == "__main__":
+    unittest.main()
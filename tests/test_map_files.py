@@ -0,0 +1,49 @@
+'''
+Occupancy image readers.
+
+Run with: python -m unittest discover tests
+'''
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from map_files import cells_to_grid, read_pgm
+
+
+class ReadPgmTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def read(self, header, pixels):
+        path = os.path.join(self.directory, "map.pgm")
+        with open(path, "wb") as file:
+            file.write(header + pixels)
+        cells, height, width = read_pgm(path)
+        return ["".join(row) for row in cells_to_grid(cells, height, width)]
+
+    def test_threshold_is_relative_to_maxval(self):
+        # Each row holds samples just below and just above half brightness, then the extremes
+        cases = {
+            1: ([0, 1], "XO"),
+            255: ([0, 127, 128, 255], "XXOO"),
+            1023: ([0, 511, 515, 1023], "XXOO"),
+        }
+        for maxval, (samples, expected) in cases.items():
+            fmt = ">%dH" if maxval > 255 else "%dB"
+            binary = struct.pack(fmt % len(samples), *samples)
+            text = b" ".join(b"%d" % sample for sample in samples)
+            for magic, pixels in ((b"P5", binary), (b"P2", text)):
+                with self.subTest(maxval=maxval, magic=magic):
+                    header = b"%s\n# comment\n%d 1\n%d\n" % (magic, len(samples), maxval)
+                    self.assertEqual(self.read(header, pixels), [expected])
+
+    def test_truncated_pixels(self):
+        with self.assertRaises(ValueError):
+            self.read(b"P5\n4 2\n1023\n", struct.pack(">5H", 0, 1, 2, 3, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
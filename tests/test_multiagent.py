@@ -0,0 +1,99 @@
+'''
+Cooperative A* and CBS on seeded benchmark maps: valid, conflict-free paths
+no shorter than each agent's BFS distance.
+
+Run with: python -m unittest discover tests
+'''
+import random
+import unittest
+
+from multiagent import MultiAgentPlanner
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import random_map, rooms_map
+
+SIZE = 16
+AGENTS = 6
+
+
+class MultiAgentPlannerTest(unittest.TestCase):
+    def scenarios(self):
+        for name, grid in (("random", random_map(SIZE, SIZE, density=0.15, seed=6)),
+                           ("rooms", rooms_map(SIZE, SIZE, room_size=6, seed=6))):
+            pathfinding = PathfindingAlgorithms(grid, SIZE, SIZE)
+            cells = [(i, j) for i in range(SIZE) for j in range(SIZE) if grid[i][j] != "X"]
+            rng = random.Random(1)
+            for round_number in range(4):
+                starts = rng.sample(cells, AGENTS)
+                goals = rng.sample(cells, AGENTS)
+                # Only agents that can reach their goal alone; CBS has no solution otherwise
+                agents = [
+                    (start, goal) for start, goal in zip(starts, goals)
+                    if pathfinding.bfs(start, goal).path() is not None
+                ]
+                yield name, round_number, pathfinding, agents
+
+    def assert_valid(self, pathfinding, agents, paths):
+        routes = [path.positions() for path in paths]
+        for (start, goal), route in zip(agents, routes):
+            self.assertEqual((route[0], route[-1]), (start, goal))
+            for (i, j), (k, l) in zip(route, route[1:]):
+                self.assertLessEqual(abs(i - k) + abs(j - l), 1)
+                self.assertTrue(pathfinding.is_valid_position((k, l)))
+            self.assertGreaterEqual(len(route) - 1, pathfinding.bfs(start, goal).path().length)
+
+        # Agents stay at their goal after arriving
+        horizon = max(len(route) for route in routes)
+        at = [lambda step, route=route: route[min(step, len(route) - 1)] for route in routes]
+        for step in range(horizon):
+            positions = [position(step) for position in at]
+            self.assertEqual(len(set(positions)), len(positions), f"vertex conflict at step {step}")
+            if step:
+                moves = {(position(step - 1), position(step)) for position in at}
+                for before, after in moves:
+                    if before != after:
+                        self.assertNotIn((after, before), moves, f"edge conflict at step {step}")
+
+    def test_cooperative_paths_are_conflict_free(self):
+        for name, round_number, pathfinding, agents in self.scenarios():
+            with self.subTest(map=name, round=round_number):
+                paths = MultiAgentPlanner(pathfinding).cooperative(agents)
+                planned = [(agent, path) for agent, path in zip(agents, paths) if path is not None]
+                self.assertTrue(planned)
+                self.assert_valid(pathfinding, *zip(*planned))
+
+    def test_cbs_paths_are_conflict_free(self):
+        for name, round_number, pathfinding, agents in self.scenarios():
+            with self.subTest(map=name, round=round_number):
+                planner = MultiAgentPlanner(pathfinding)
+                paths = planner.cbs(agents)
+                self.assertNotIn(None, paths)
+                self.assert_valid(pathfinding, agents, paths)
+                # CBS is optimal, so it never does worse than cooperative A*
+                cooperative = planner.cooperative(agents)
+                if None not in cooperative:
+                    self.assertLessEqual(sum(path.length for path in paths),
+                                         sum(path.length for path in cooperative))
+
+    def test_single_agent_matches_bfs(self):
+        for name, round_number, pathfinding, agents in self.scenarios():
+            planner = MultiAgentPlanner(pathfinding)
+            for start, goal in agents:
+                with self.subTest(map=name, start=start, goal=goal):
+                    expected = pathfinding.bfs(start, goal).path().length
+                    self.assertEqual(planner.cbs([(start, goal)])[0].length, expected)
+
+    def test_off_grid_endpoint_has_no_path(self):
+        pathfinding = PathfindingAlgorithms(random_map(SIZE, SIZE, density=0.0), SIZE, SIZE)
+        planner = MultiAgentPlanner(pathfinding)
+        # (-1, SIZE + 3) would wrap onto the cell (0, 1) of the flat array
+        agents = [((0, 0), (-1, SIZE + 3)), ((5, 5), (6, 6))]
+        for plan in (planner.cooperative, planner.cbs):
+            with self.subTest(planner=plan.__name__):
+                paths = plan(agents)
+                self.assertIsNone(paths[0])
+        self.assertIsNotNone(planner.cooperative(agents)[1])
+        self.assertEqual(planner.cooperative([((-1, SIZE + 3), (0, 0))]), [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+'''
+Searches with an endpoint outside the grid.
+
+Run with: python -m unittest discover tests
+'''
+import unittest
+
+from anytime import ARAStar
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import random_map
+
+SIZE = 40
+UNIDIRECTIONAL = ("a_star", "weighted_a_star", "dijkstra", "bfs", "dfs", "jump_point_search", "theta_star")
+BIDIRECTIONAL = ("bidirectional_bfs", "bidirectional_dijkstra", "bidirectional_a_star")
+
+
+class OutOfGridGoalTest(unittest.TestCase):
+    def setUp(self):
+        self.pathfinding = PathfindingAlgorithms(random_map(SIZE, SIZE, density=0.2, seed=1), SIZE, SIZE)
+
+    def test_goal_outside_grid_has_no_path(self):
+        # (-5, -5) used to wrap onto the cell (-6, SIZE - 3) of the flat array
+        for algorithm in UNIDIRECTIONAL:
+            for goal in ((-5, -5), (SIZE, 0), (0, SIZE + 3)):
+                with self.subTest(algorithm=algorithm, goal=goal):
+                    tree = getattr(self.pathfinding, algorithm)((0, 0), goal)
+                    self.assertIsNone(tree.path())
+                    self.assertIsNone(tree.stats.path_cost)
+
+    def test_goal_outside_grid_sweeps_reachable_cells(self):
+        # benchmarks.flat_grid relies on this to time a full sweep
+        expanded = self.pathfinding.bfs((0, 0), (-5, -5)).stats.expansions
+        reachable = len(self.pathfinding.bfs((0, 0), (SIZE - 1, SIZE - 1)))
+        self.assertGreater(expanded, 1)
+        self.assertLessEqual(expanded, reachable + 1)
+
+    def test_wavefront_bfs_goal_outside_grid(self):
+        self.pathfinding.bfs_engine = "wavefront"
+        self.assertIsNone(self.pathfinding.bfs((0, 0), (-5, -5)).path())
+
+    def test_bidirectional_rejects_endpoints_outside_grid(self):
+        # The backward search used to start from the wrapped cell and return a path ending at (-6, SIZE - 3)
+        for algorithm in BIDIRECTIONAL:
+            for start, goal in (((0, 0), (-5, -5)), ((-5, -5), (0, 0)), ((0, 0), (SIZE, SIZE))):
+                with self.subTest(algorithm=algorithm, start=start, goal=goal):
+                    tree = getattr(self.pathfinding, algorithm)(start, goal)
+                    self.assertIsNone(tree.path())
+                    self.assertEqual(tree.stats.expansions, 0)
+
+    def test_start_outside_grid_searches_nothing(self):
+        for algorithm in UNIDIRECTIONAL:
+            with self.subTest(algorithm=algorithm):
+                tree = getattr(self.pathfinding, algorithm)((-1, 0), (3, 3))
+                self.assertIsNone(tree.path())
+                self.assertEqual(tree.stats.expansions, 0)
+
+    def test_ara_star_endpoint_outside_grid(self):
+        for start, goal in (((0, 0), (-5, -5)), ((-1, 0), (3, 3))):
+            with self.subTest(start=start, goal=goal):
+                planner = ARAStar(self.pathfinding, start, goal)
+                self.assertIsNone(planner.run())
+                self.assertEqual(planner.stats.expansions, 0)
+                planner.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+'''
+PlanningService request handling, run in-process on an asyncio loop.
+
+Run with: python -m unittest discover tests
+'''
+import asyncio
+import json
+import unittest
+
+from pathfinding import PathfindingAlgorithms
+from planning_service import PlanningService
+from benchmarks.maps import random_map
+
+SIZE = 64
+
+
+def plan_request(request_id, start=(0, 0), goal=(SIZE - 1, SIZE - 1), algorithm="a_star"):
+    return json.dumps({"id": request_id, "op": "plan", "algorithm": algorithm, "start": start, "goal": goal})
+
+
+class PlanningServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.pathfinding = PathfindingAlgorithms(random_map(SIZE, SIZE, density=0.2, seed=10), SIZE, SIZE)
+        self.service = PlanningService(self.pathfinding, "random", workers=2)
+        self.addCleanup(self.service.close)
+
+    def answer(self, *lines):
+        async def answer_all():
+            return await asyncio.gather(*(self.service.answer(line) for line in lines))
+        return [json.loads(reply) for reply in asyncio.run(answer_all())]
+
+    def test_identical_requests_are_coalesced(self):
+        replies = self.answer(*(plan_request(k) for k in range(5)))
+        self.assertEqual([reply["id"] for reply in replies], list(range(5)))
+        self.assertEqual([reply["coalesced"] for reply in replies], [False, True, True, True, True])
+        expected = self.pathfinding.a_star((0, 0), (SIZE - 1, SIZE - 1)).path()
+        for reply in replies:
+            self.assertEqual(reply["path"], [list(position) for position in expected.positions()])
+            self.assertEqual(reply["length"], expected.length)
+
+        status, = self.answer(json.dumps({"id": "s", "op": "status"}))
+        self.assertEqual((status["requests"], status["dispatched"], status["coalesced"]), (6, 1, 4))
+        self.assertEqual(status["in_flight"], 0)
+
+    def test_different_requests_are_not_coalesced(self):
+        replies = self.answer(
+            plan_request(1),
+            plan_request(2, algorithm="dijkstra"),
+            plan_request(3, goal=(SIZE - 1, 0)),
+            plan_request(4),
+        )
+        self.assertEqual([reply["coalesced"] for reply in replies], [False, False, False, True])
+        self.assertEqual((self.service.dispatched, self.service.coalesced), (3, 1))
+
+    def test_finished_searches_are_not_coalesced(self):
+        first, = self.answer(plan_request(1))
+        second, = self.answer(plan_request(2))
+        self.assertFalse(first["coalesced"])
+        self.assertFalse(second["coalesced"])
+        self.assertEqual(first["path"], second["path"])
+        self.assertEqual(self.service.dispatched, 2)
+
+    def test_errors(self):
+        replies = self.answer(
+            plan_request(1, goal=(SIZE, 0)),
+            plan_request(2, algorithm="teleport"),
+            json.dumps({"id": 3, "op": "fly"}),
+            "not json",
+        )
+        self.assertEqual([reply["id"] for reply in replies], [1, 2, 3, None])
+        for reply in replies:
+            self.assertIn("error", reply)
+        self.assertEqual(self.service.dispatched, 0)
+
+    def test_pipelined_connection(self):
+        async def exchange():
+            server = await self.service.serve_tcp(0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write("".join(plan_request(k) + "\n" for k in range(3)).encode())
+                await writer.drain()
+                replies = [json.loads(await reader.readline()) for _ in range(3)]
+                writer.close()
+                await writer.wait_closed()
+            return replies
+
+        replies = asyncio.run(exchange())
+        self.assertEqual(sorted(reply["id"] for reply in replies), [0, 1, 2])
+        self.assertEqual(sorted(reply["coalesced"] for reply in replies), [False, True, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
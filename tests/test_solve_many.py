@@ -0,0 +1,64 @@
+'''
+solve_many against the single-query searches.
+
+Run with: python -m unittest discover tests
+'''
+import random
+import unittest
+
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import terrain_map
+
+SIZE = 40
+
+
+class SolveManyMovementTest(unittest.TestCase):
+    def setUp(self):
+        self.grid = terrain_map(SIZE, SIZE, seed=2)
+        self.pathfinding = PathfindingAlgorithms(self.grid, SIZE, SIZE)
+        cells = [(i, j) for i in range(SIZE) for j in range(SIZE) if self.grid[i][j] != "X"]
+        rng = random.Random(0)
+        self.pairs = [(rng.choice(cells), rng.choice(cells)) for _ in range(30)]
+
+    def path_cost(self, path):
+        cost = 0
+        for previous, position in zip(path, path[1:]):
+            step_cost = self.pathfinding.cells[self.pathfinding.to_index(position)]
+            cost += step_cost * (2 ** 0.5 if position[0] != previous[0] and position[1] != previous[1] else 1)
+        return cost
+
+    def test_costs_match_a_star_for_each_movement_model(self):
+        for connectivity, corner_cutting in ((4, False), (8, False), (8, True)):
+            self.pathfinding.set_movement(connectivity, corner_cutting)
+            for algorithm in ("a_star", "dijkstra"):
+                paths = self.pathfinding.solve_many(self.pairs, algorithm)
+                for (start, goal), path in zip(self.pairs, paths):
+                    with self.subTest(connectivity=connectivity, corner_cutting=corner_cutting,
+                                      algorithm=algorithm, start=start, goal=goal):
+                        expected = self.pathfinding.a_star(start, goal).stats.path_cost
+                        if expected is None:
+                            self.assertIsNone(path)
+                        else:
+                            self.assertAlmostEqual(self.path_cost(path), expected)
+
+    def test_a_star_paths_match_a_star(self):
+        # Both break ties among equal f the same way, so even among equally short paths they agree
+        for connectivity in (4, 8):
+            self.pathfinding.set_movement(connectivity)
+            for queue_type in ("bucket", "indexed", "heap"):
+                for tie_break in ("larger_g", "smaller_g", "none"):
+                    self.pathfinding.queue_type = queue_type
+                    self.pathfinding.tie_break = tie_break
+                    paths = self.pathfinding.solve_many(self.pairs, "a_star")
+                    for (start, goal), path in zip(self.pairs, paths):
+                        with self.subTest(connectivity=connectivity, queue_type=queue_type,
+                                          tie_break=tie_break, start=start, goal=goal):
+                            expected = self.pathfinding.a_star(start, goal).path()
+                            self.assertEqual(path, None if expected is None else expected.positions())
+
+    def test_goal_outside_grid_has_no_path(self):
+        self.assertEqual(self.pathfinding.solve_many([((0, 0), (-5, -5))], "a_star"), [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+'''
+The wavefront bfs engine against the loop engine on seeded benchmark maps.
+
+Run with: python -m unittest discover tests
+'''
+import random
+import unittest
+
+from pathfinding import PathfindingAlgorithms
+from benchmarks.maps import maze_map, open_map, random_map, rooms_map
+
+SIZE = 64
+
+
+class WavefrontBfsTest(unittest.TestCase):
+    def maps(self):
+        yield "open", open_map(SIZE, SIZE)
+        yield "random", random_map(SIZE, SIZE, density=0.3, seed=8)
+        yield "maze", maze_map(SIZE - 1, SIZE - 1, seed=8)
+        yield "rooms", rooms_map(SIZE, SIZE, seed=8)
+
+    def test_path_length_matches_loop_bfs(self):
+        for name, grid in self.maps():
+            height, width = len(grid), len(grid[0])
+            pathfinding = PathfindingAlgorithms(grid, height, width)
+            cells = [(i, j) for i in range(height) for j in range(width) if grid[i][j] != "X"]
+            rng = random.Random(1)
+            for _ in range(20):
+                start, goal = rng.sample(cells, 2)
+                with self.subTest(map=name, start=start, goal=goal):
+                    pathfinding.bfs_engine = "loop"
+                    expected = pathfinding.bfs(start, goal).path()
+                    pathfinding.bfs_engine = "wavefront"
+                    path = pathfinding.bfs(start, goal).path()
+                    if expected is None:
+                        self.assertIsNone(path)
+                        continue
+                    self.assertEqual(path.length, expected.length)
+                    positions = path.positions()
+                    self.assertEqual((positions[0], positions[-1]), (start, goal))
+                    for (i, j), (k, l) in zip(positions, positions[1:]):
+                        self.assertEqual(abs(i - k) + abs(j - l), 1)
+                        self.assertTrue(pathfinding.is_valid_position((k, l)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,355 @@
+'''
+Breadth-first search one layer at a time, with the frontier as bitsets.
+
+A BFS layer is every cell one step further from the start than the last
+layer. Instead of popping cells one by one, a wide layer is expanded at once:
+the next layer is the current one shifted by every neighbour offset, masked
+with the cells not reached yet.
+
+The grid is cut into TILE x TILE blocks and each block's cells are one
+Python int (bit r * TILE + c for the cell at row r, column c of the block). A
+layer only touches the blocks it passes through, so its cost grows with the
+layer's length, not with the grid. Shifts within a block are masked at its
+edges, and the bits leaving an edge are moved into the neighbouring block.
+Narrow layers (corridors, mazes, the first steps) run as a plain loop over a
+list of cells, which is cheaper there; the sweep switches modes as the
+layers grow and shrink.
+
+Step counts are kept per block as bit-planes, as in flow_field.wavefront:
+plane k holds the cells whose count has bit k set, and only the planes of
+the bits that change between two layers are updated. They are merged into
+one flat array at the end.
+
+Movement is 4-connected, like bfs. PathfindingAlgorithms.bfs runs this sweep
+when its bfs_engine is "wavefront".
+
+Usage:
+    distance = layer_wavefront(pathfinding.cells, pathfinding.stride, start_index)
+    tree = SearchTree(LayerParents(distance, pathfinding.offsets), ...)
+'''
+import sys
+from array import array
+
+from flow_field import from_bits, to_bits
+from pathfinding import UNREACHED
+
+# Side of the square blocks the bitsets are cut into
+TILE = 64
+# Layer length (cells) above which bitset layers win, and cells per active block
+# below which the loop wins again (apart, so the sweep does not flip back and forth)
+BITSET_ABOVE = 256
+SCALAR_PER_TILE = 6
+
+# 1 where a byte is zero (a blocked cell), 0 elsewhere, and the reverse
+_IS_ZERO = bytes([1]) + bytes(255)
+_IS_OPEN = bytes(1) + bytes([1]) * 255
+# bytes.translate table from ASCII binary digits to 0xFF (set) and 0 (clear)
+_DIGIT_TO_MASK = bytes(0xFF if value == 0x31 else 0 for value in range(256))
+
+
+class Tiling:
+    """Block layout of a flat cell array, and conversions between the two"""
+    def __init__(self, size, stride, tile=TILE):
+        self.size = size
+        self.stride = stride
+        self.tile = tile
+        self.rows = size // stride
+        self.tiles_x = -(-stride // tile)
+        self.tiles_y = -(-self.rows // tile)
+        self.count = self.tiles_x * self.tiles_y
+        area = tile * tile
+        first_col = sum(1 << (row * tile) for row in range(tile))
+        self.first_col = first_col
+        self.last_col = first_col << (tile - 1)
+        self.inner_left = (1 << area) - 1 ^ first_col
+        self.inner_right = (1 << area) - 1 ^ self.last_col
+        self.first_row = (1 << tile) - 1
+        self.last_row_shift = tile * (tile - 1)
+
+    def locate(self, index):
+        """(block, bit) of a flat index"""
+        row, col = divmod(index, self.stride)
+        tile = self.tile
+        block = row // tile * self.tiles_x + col // tile
+        return block, row % tile * tile + col % tile
+
+    def spans(self):
+        """(block, [(flat start, bit start, length) per row]) for every block"""
+        stride = self.stride
+        tile = self.tile
+        for block in range(self.count):
+            block_y, block_x = divmod(block, self.tiles_x)
+            left = block_x * tile
+            length = min(tile, stride - left)
+            rows = range(block_y * tile, min(block_y * tile + tile, self.rows))
+            yield block, [(row * stride + left, (row - block_y * tile) * tile, length) for row in rows]
+
+    def to_blocks(self, flags):
+        """One int per block with the bits of the non-zero flags"""
+        tile = self.tile
+        area = tile * tile
+        blocks = []
+        for _, spans in self.spans():
+            data = bytearray(area)
+            for start, bit, length in spans:
+                data[bit:bit + length] = flags[start:start + length]
+            blocks.append(to_bits(data))
+        return blocks
+
+    def from_blocks(self, blocks):
+        """Flags (one byte per cell) with the bits set in the per-block ints"""
+        area = self.tile * self.tile
+        flags = bytearray(self.size)
+        for block, spans in self.spans():
+            if not blocks[block]:
+                continue
+            data = from_bits(blocks[block], area)
+            for start, bit, length in spans:
+                flags[start:start + length] = data[bit:bit + length]
+        return flags
+
+
+def layer_wavefront(cells, stride, start_index, stop_index=None, stats=None):
+    """
+    Steps from start_index to every cell of a flat cell array, ignoring terrain costs
+
+    Args:
+        stride: row length of the flat array (4-connected moves are +-1 and +-stride)
+        stop_index: stop once this cell is reached; cells not reached by then read -1
+        stats: optional SearchStats; expansions is set to the number of cells reached
+
+    Returns an array("i") with each cell's number of steps from start_index (-1 if
+    unreachable or blocked).
+    """
+    size = len(cells)
+    tiling = Tiling(size, stride)
+    offsets = (-stride, 1, stride, -1)
+    stop_block, stop_bit = tiling.locate(stop_index) if stop_index is not None else (-1, 0)
+    stop_bit = 1 << stop_bit
+
+    # Loop state: 1 for open cells not reached yet, and the steps of the cells the loop reached
+    unreached = bytearray(bytes(cells).translate(_IS_OPEN))
+    scalar_distance = array("i", bytes(4 * size))
+    # Bitset state, per block: cells not reached yet, cells reached by bitset layers,
+    # distance planes, and the step count the planes were last brought up to
+    unvisited = None
+    done = [0] * tiling.count
+    planes = [None] * tiling.count
+    synced = [0] * tiling.count
+
+    layer = []
+    if cells[start_index]:
+        unreached[start_index] = 0
+        if start_index != stop_index:
+            layer.append(start_index)
+    waves = {}
+    depth = 0
+    while layer or waves:
+        depth += 1
+        if layer:
+            if len(layer) > BITSET_ABOVE:
+                # Long layer: continue with bitsets
+                unvisited = tiling.to_blocks(unreached)
+                for index in layer:
+                    block, bit = tiling.locate(index)
+                    waves[block] = waves.get(block, 0) | 1 << bit
+                layer = []
+                depth -= 1
+                continue
+
+            next_layer = []
+            for index in layer:
+                for offset in offsets:
+                    neighbor = index + offset
+                    if unreached[neighbor]:
+                        unreached[neighbor] = 0
+                        scalar_distance[neighbor] = depth
+                        next_layer.append(neighbor)
+                        if neighbor == stop_index:
+                            next_layer = []
+                            break
+                else:
+                    continue
+                break
+            layer = next_layer
+            continue
+
+        waves, stopped = expand(tiling, waves, unvisited, done, planes, synced, depth, stop_block, stop_bit)
+        if stopped:
+            break
+        cells_in_waves = sum(wave.bit_count() for wave in waves.values())
+        if cells_in_waves < SCALAR_PER_TILE * len(waves):
+            # Short layer: continue with the loop
+            unreached = tiling.from_blocks(unvisited)
+            tile = tiling.tile
+            tiles_x = tiling.tiles_x
+            for block, wave in waves.items():
+                block_y, block_x = divmod(block, tiles_x)
+                base = block_y * tile * stride + block_x * tile
+                while wave:
+                    low = wave & -wave
+                    row, col = divmod(low.bit_length() - 1, tile)
+                    layer.append(base + row * stride + col)
+                    wave ^= low
+            waves = {}
+            unvisited = None
+
+    if unvisited is not None:
+        unreached = tiling.from_blocks(unvisited)
+    distance = merge(tiling, planes, synced, done, scalar_distance)
+    unreached_bits = to_bits(unreached) | to_bits(bytes(cells).translate(_IS_ZERO))
+    if stats is not None:
+        stats.expansions = size - unreached_bits.bit_count()
+    # Cells never reached (blocked, border, or unreachable) read -1: all four bytes 0xFF
+    mask = int.from_bytes(from_bits(unreached_bits, size, _DIGIT_TO_MASK), "little")
+    merged = bytearray(distance.tobytes())
+    for byte in range(4):
+        merged[byte::4] = (int.from_bytes(merged[byte::4], "little") | mask).to_bytes(size, "little")
+    distance = array("i")
+    distance.frombytes(bytes(merged))
+    return distance
+
+
+def expand(tiling, waves, unvisited, done, planes, synced, depth, stop_block, stop_bit):
+    """
+    One bitset layer: returns (the next layer's {block: bits}, whether the stop cell was reached)
+
+    Updates unvisited, and the block's distance planes (see the module docstring).
+    """
+    tiles_x = tiling.tiles_x
+    inner_left = tiling.inner_left
+    inner_right = tiling.inner_right
+    first_col = tiling.first_col
+    last_col = tiling.last_col
+    first_row = tiling.first_row
+    shift = tiling.tile
+    last_row_shift = tiling.last_row_shift
+    column_shift = shift - 1
+
+    incoming = {}
+    for block, wave in waves.items():
+        spread = (wave & inner_left) >> 1 | (wave & inner_right) << 1 | wave >> shift | wave << shift
+        incoming[block] = incoming.get(block, 0) | spread
+        # Bits leaving an edge enter the next block on that side. The grid's border cells
+        # are blocked, so the outermost blocks never send bits off the grid.
+        edge = wave & first_col
+        if edge:
+            incoming[block - 1] = incoming.get(block - 1, 0) | edge << column_shift
+        edge = wave & last_col
+        if edge:
+            incoming[block + 1] = incoming.get(block + 1, 0) | edge >> column_shift
+        edge = wave & first_row
+        if edge:
+            incoming[block - tiles_x] = incoming.get(block - tiles_x, 0) | edge << last_row_shift
+        edge = wave >> last_row_shift
+        if edge:
+            incoming[block + tiles_x] = incoming.get(block + tiles_x, 0) | edge
+
+    next_waves = {}
+    stopped = False
+    for block, bits in incoming.items():
+        bits &= unvisited[block]
+        if not bits:
+            continue
+        unvisited[block] ^= bits
+        next_waves[block] = bits
+        block_done = done[block]
+        if block_done:
+            # Toggle the planes of the bits that changed since the block's last layer
+            block_planes = planes[block]
+            changed = synced[block] ^ depth
+            while len(block_planes) < changed.bit_length():
+                block_planes.append(0)
+            bit = 0
+            while changed:
+                if changed & 1:
+                    block_planes[bit] ^= block_done
+                changed >>= 1
+                bit += 1
+        else:
+            planes[block] = []
+        synced[block] = depth
+        done[block] = block_done | bits
+        if block == stop_block and bits & stop_bit:
+            stopped = True
+    return next_waves, stopped
+
+
+def merge(tiling, planes, synced, done, scalar_distance):
+    """scalar_distance with the step counts of the cells reached by bitset layers filled in"""
+    size = tiling.size
+    area = tiling.tile * tiling.tile
+    distance = array("i", bytes(4 * size))
+    for block, spans in tiling.spans():
+        block_planes = planes[block]
+        if block_planes is None:
+            continue
+        # Close the block's last plane intervals by syncing to 0
+        changed = synced[block]
+        while len(block_planes) < changed.bit_length():
+            block_planes.append(0)
+        bit = 0
+        while changed:
+            if changed & 1:
+                block_planes[bit] ^= done[block]
+            changed >>= 1
+            bit += 1
+
+        # 8-bit lanes of the planes, one lane per byte of the int32 values
+        merged = bytearray(4 * area)
+        for byte in range((len(block_planes) + 7) // 8):
+            lane = 0
+            for bit, plane in enumerate(block_planes[8 * byte:8 * byte + 8]):
+                if plane:
+                    lane |= int.from_bytes(from_bits(plane, area), "little") << bit
+            merged[byte::4] = lane.to_bytes(area, "little")
+        values = array("i")
+        values.frombytes(bytes(merged))
+        if sys.byteorder == "big":
+            values.byteswap()
+        for start, bit, length in spans:
+            distance[start:start + length] = values[bit:bit + length]
+
+    # Each cell is non-zero in at most one of the two
+    combined = int.from_bytes(distance.tobytes(), sys.byteorder) | int.from_bytes(scalar_distance.tobytes(), sys.byteorder)
+    distance = array("i")
+    distance.frombytes(combined.to_bytes(4 * size, sys.byteorder))
+    return distance
+
+
+class LayerParents:
+    """
+    Read-only parent array over a layer_wavefront result, in the layout SearchTree expects
+
+    parents[index] is the first neighbour (in offsets order) one step closer to the
+    start, the start's own index, or UNREACHED. Parents are looked up on access, so
+    wrapping a sweep costs nothing per cell.
+    """
+    def __init__(self, distance, offsets):
+        self.distance = distance
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.distance)
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + sys.getsizeof(self.distance)
+
+    def __getitem__(self, index):
+        distance = self.distance
+        steps = distance[index]
+        if steps <= 0:
+            return index if steps == 0 else UNREACHED
+        for offset in self.offsets:
+            if distance[index + offset] == steps - 1:
+                return index + offset
+        return UNREACHED
+
+    def __iter__(self):
+        for index in range(len(self.distance)):
+            yield self[index]
+
+    def count(self, value):
+        if value == UNREACHED:
+            return self.distance.count(-1)
+        return sum(1 for parent in self if parent == value)